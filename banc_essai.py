@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai de correction.py sur des dépôts d'étudiants synthétiques
+
+generer: crée N dépôts à partir du gabarit (les fichiers de ce dossier),
+dans un mélange de cas: travaux valides, erreurs de syntaxe, marqueurs
+absents, test qui boucle sans fin et test à sortie volumineuse. Chaque
+dépôt a un contenu distinct: ni le cache ni le regroupement des doublons
+ne réduisent le travail mesuré.
+
+mesurer: corrige le dossier en entier (--batch, sans cache) une ou
+plusieurs fois et rapporte le débit (dépôts par seconde), les centiles
+p50/p95/p99 de la durée par dépôt et, par phase, le total et les centiles
+par dépôt. Le résultat peut être enregistré en JSON et comparé à une
+mesure de référence pour rendre les régressions visibles.
+
+Usage:
+    python3 banc_essai.py generer ../banc --nombre 200
+    python3 banc_essai.py generer ../banc --nombre 500 --melange valide=70,syntaxe=10,sans_marqueurs=20
+    python3 banc_essai.py mesurer ../banc --repetitions 3 --json banc.json
+    python3 banc_essai.py mesurer ../banc --reference banc.json -- --statique --jobs 8
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Dossier du gabarit et fichiers copiés dans chaque dépôt
+GABARIT = Path(__file__).resolve().parent
+FICHIERS_GABARIT = [
+    "test_bmp280.py",
+    "test_neoslider.py",
+    "requirements.txt",
+    "grading_engine.py",
+    "tests",
+]
+
+# Part de chaque cas dans un dossier généré, en %
+MELANGE = {
+    "valide": 55,
+    "syntaxe": 10,
+    "sans_marqueurs": 20,
+    "boucle": 5,
+    "sortie": 10,
+}
+
+# Lignes affichées par le test d'un dépôt à sortie volumineuse
+LIGNES_SORTIE = 200_000
+
+# Centiles rapportés
+CENTILES = (50, 95, 99)
+
+# Écart (en %) au-delà duquel une mesure est signalée comme régression
+SEUIL_REGRESSION = 10
+
+SCRIPT_VALIDE = '''\
+# /// script
+# requires-python = ">=3.9"
+# dependencies = ["adafruit-circuitpython-bmp280", "adafruit-blinka"]
+# ///
+"""Lecture du capteur BMP280 ({nom})."""
+
+import board
+import adafruit_bmp280
+
+
+def main():
+    """Affiche la température, la pression et l'altitude."""
+    try:
+        # Initialiser le bus I2C et le capteur
+        i2c = board.I2C()
+        sensor = adafruit_bmp280.Adafruit_BMP280_I2C(i2c, address=0x77)
+        print(f"Température: {{sensor.temperature:.1f}} °C")
+        print(f"Pression: {{sensor.pressure:.1f}} hPa")
+        print(f"Altitude: {{sensor.altitude:.1f}} m")
+    except Exception as e:
+        print(f"Erreur de lecture du capteur: {{e}}")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+SCRIPT_SYNTAXE = '''\
+"""Lecture du capteur BMP280 ({nom})."""
+import board
+import adafruit_bmp280
+
+def main(:
+    i2c = board.I2C()
+'''
+
+TEST_BOUCLE = '''\
+def test_boucle_sans_fin():
+    while True:
+        pass
+'''
+
+TEST_SORTIE = f'''\
+def test_sortie_volumineuse():
+    for i in range({LIGNES_SORTIE}):
+        print("mesure", i, "x" * 80)
+    assert False
+'''
+
+
+def lire_melange(texte):
+    """
+    Lit un mélange de cas "cas=part,cas=part".
+
+    Args:
+        texte: Mélange en ligne de commande
+
+    Returns:
+        dict: Part de chaque cas
+    """
+    melange = {}
+    for element in texte.split(","):
+        cas, _, part = element.partition("=")
+        if cas not in MELANGE:
+            raise argparse.ArgumentTypeError(f"cas inconnu: {cas} (cas: {', '.join(MELANGE)})")
+        melange[cas] = float(part or 1)
+    return melange
+
+
+def repartir(nombre, melange):
+    """
+    Répartit N dépôts entre les cas, au prorata des parts.
+
+    Args:
+        nombre: Nombre de dépôts
+        melange: Part de chaque cas
+
+    Returns:
+        list: Cas de chaque dépôt (longueur nombre)
+    """
+    total = sum(melange.values())
+    exacts = {cas: nombre * part / total for cas, part in melange.items()}
+    comptes = {cas: int(exact) for cas, exact in exacts.items()}
+    # Plus grands restes: les dépôts restants vont aux cas les plus lésés
+    for cas in sorted(exacts, key=lambda c: comptes[c] - exacts[c])[:nombre - sum(comptes.values())]:
+        comptes[cas] += 1
+    return [cas for cas, compte in comptes.items() for _ in range(compte)]
+
+
+def generer_depot(repo_dir, cas, nom):
+    """
+    Crée un dépôt synthétique à partir du gabarit.
+
+    Args:
+        repo_dir: Dossier du dépôt (remplacé s'il existe)
+        cas: Cas du dépôt (voir MELANGE)
+        nom: Nom de l'étudiant, écrit dans les fichiers pour les distinguer
+    """
+    if repo_dir.exists():
+        shutil.rmtree(repo_dir)
+    repo_dir.mkdir(parents=True)
+    for nom_fichier in FICHIERS_GABARIT:
+        source = GABARIT / nom_fichier
+        if source.is_dir():
+            shutil.copytree(source, repo_dir / nom_fichier,
+                            ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+        else:
+            shutil.copy2(source, repo_dir / nom_fichier)
+
+    gabarit = SCRIPT_SYNTAXE if cas == "syntaxe" else SCRIPT_VALIDE
+    (repo_dir / "test_bmp280.py").write_text(gabarit.format(nom=nom), encoding="utf-8")
+
+    if cas != "sans_marqueurs":
+        marqueurs = repo_dir / ".test_markers"
+        marqueurs.mkdir()
+        (marqueurs / "all_tests_passed.txt").write_text(f"{nom}\n", encoding="utf-8")
+        (marqueurs / "test_summary.txt").write_text(f"BMP280 détecté sur I2C ({nom})\n", encoding="utf-8")
+
+    if cas == "boucle":
+        (repo_dir / "tests" / "test_zz_boucle.py").write_text(TEST_BOUCLE, encoding="utf-8")
+    elif cas == "sortie":
+        (repo_dir / "tests" / "test_zz_sortie.py").write_text(TEST_SORTIE, encoding="utf-8")
+
+
+def generer(dossier, nombre, melange=None, graine=413):
+    """
+    Crée un dossier de N dépôts synthétiques.
+
+    Args:
+        dossier: Dossier du lot (créé au besoin)
+        nombre: Nombre de dépôts
+        melange: Part de chaque cas (défaut: MELANGE)
+        graine: Graine du mélange des cas entre les dépôts
+
+    Returns:
+        dict: Nombre de dépôts par cas
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+    cas_depots = repartir(nombre, melange or MELANGE)
+    random.Random(graine).shuffle(cas_depots)
+
+    comptes = {}
+    largeur = len(str(nombre))
+    for i, cas in enumerate(cas_depots, start=1):
+        nom = f"etudiant-{i:0{largeur}d}-{cas}"
+        generer_depot(dossier / nom, cas, nom)
+        comptes[cas] = comptes.get(cas, 0) + 1
+    return comptes
+
+
+def centile(valeurs, p):
+    """Centile p (rang le plus proche) d'une liste de valeurs, 0 si vide."""
+    if not valeurs:
+        return 0.0
+    ordonnees = sorted(valeurs)
+    rang = max(1, -(-len(ordonnees) * p // 100))
+    return ordonnees[int(rang) - 1]
+
+
+def centiles(valeurs):
+    """Centiles CENTILES d'une liste de valeurs, par nom ("p50", ...)."""
+    return {f"p{p}": round(centile(valeurs, p), 3) for p in CENTILES}
+
+
+def executer(dossier, options=()):
+    """
+    Corrige le dossier une fois avec correction.py et mesure l'exécution.
+
+    Les durées, le fichier de reprise et les temps sont écrits dans un
+    dossier temporaire: une exécution ne profite pas de la précédente.
+
+    Args:
+        dossier: Dossier des dépôts synthétiques
+        options: Options supplémentaires de correction.py
+
+    Returns:
+        dict: "duree", "depots", "debit", "latence" (centiles par dépôt)
+        et "phases" (total et centiles par dépôt de chaque phase)
+    """
+    with tempfile.TemporaryDirectory(prefix="banc-essai-") as temporaire:
+        temps = Path(temporaire) / "temps.json"
+        commande = [
+            sys.executable, str(GABARIT / "correction.py"), ".",
+            "--batch", str(dossier), "--no-cache", "--quiet",
+            "--temps", str(temps),
+            "--durees", str(Path(temporaire) / "durees.json"),
+            "--checkpoint", str(Path(temporaire) / "checkpoint.jsonl"),
+            *options,
+        ]
+        debut = time.perf_counter()
+        subprocess.run(commande, cwd=GABARIT, stdout=subprocess.DEVNULL, check=True)
+        duree = time.perf_counter() - debut
+        resume = json.loads(temps.read_text(encoding="utf-8"))
+
+    depots = resume["depots"]
+    par_phase = {}
+    for depot in depots.values():
+        for phase, mesure in depot["phases"].items():
+            par_phase.setdefault(phase, []).append(mesure["mur"])
+    return {
+        "duree": round(duree, 3),
+        "depots": len(depots),
+        "debit": round(len(depots) / duree, 3) if duree else 0.0,
+        "latence": centiles([depot["duree"] for depot in depots.values()]),
+        "phases": {
+            phase: {"total": round(sum(valeurs), 3), **centiles(valeurs)}
+            for phase, valeurs in par_phase.items()
+        },
+    }
+
+
+def mesurer(dossier, repetitions=1, options=()):
+    """
+    Corrige le dossier plusieurs fois et retient l'exécution médiane.
+
+    Args:
+        dossier: Dossier des dépôts synthétiques
+        repetitions: Nombre d'exécutions
+        options: Options supplémentaires de correction.py
+
+    Returns:
+        dict: "options", "executions" (voir executer) et "mediane"
+        (l'exécution de durée médiane)
+    """
+    executions = []
+    for n in range(1, repetitions + 1):
+        print(f"⏱️ Exécution {n}/{repetitions}...", file=sys.stderr, flush=True)
+        executions.append(executer(dossier, options))
+    mediane = sorted(executions, key=lambda e: e["duree"])[(len(executions) - 1) // 2]
+    return {"options": list(options), "executions": executions, "mediane": mediane}
+
+
+def ecart(valeur, reference, plus_haut_meilleur=False):
+    """
+    Écart relatif à la référence, en %, et indicateur de régression.
+
+    Returns:
+        str: Écart signé, suivi de ⚠️ au-delà de SEUIL_REGRESSION
+    """
+    if not reference:
+        return ""
+    pourcentage = 100.0 * (valeur - reference) / reference
+    pire = -pourcentage if plus_haut_meilleur else pourcentage
+    return f"{pourcentage:+6.1f}%" + (" ⚠️" if pire > SEUIL_REGRESSION else "")
+
+
+def afficher_mesure(mesure, reference=None):
+    """
+    Affiche le résultat d'un banc d'essai.
+
+    Args:
+        mesure: Résultat de mesurer()
+        reference: Résultat d'une mesure précédente à comparer (optionnel)
+    """
+    mediane = mesure["mediane"]
+    ref = reference["mediane"] if reference else None
+
+    print(f"\n{'='*70}")
+    print(f"📏 BANC D'ESSAI — {mediane['depots']} dépôts, {len(mesure['executions'])} exécution(s)")
+    if mesure["options"]:
+        print(f"Options: {' '.join(mesure['options'])}")
+    print('='*70)
+
+    entetes = "".join(f"{f'p{p}':>9}" for p in CENTILES)
+    print(f"{'Exécution':<12}{'Durée':>9}{'Dépôts/s':>10}{entetes}")
+    for n, execution in enumerate(mesure["executions"], start=1):
+        marque = " *" if execution is mediane else ""
+        print(f"#{n:<11}{execution['duree']:>8.2f}s{execution['debit']:>10.2f}"
+              + "".join(f"{execution['latence'][f'p{p}']:>8.2f}s" for p in CENTILES) + marque)
+
+    if ref:
+        print(f"\nComparaison à la référence ({ref['depots']} dépôts):")
+        print(f"  Débit:  {mediane['debit']:.2f} dépôts/s vs {ref['debit']:.2f}  "
+              f"{ecart(mediane['debit'], ref['debit'], plus_haut_meilleur=True)}")
+        for p in CENTILES:
+            cle = f"p{p}"
+            print(f"  {cle:<6}  {mediane['latence'][cle]:.2f}s vs {ref['latence'][cle]:.2f}s  "
+                  f"{ecart(mediane['latence'][cle], ref['latence'][cle])}")
+
+    print(f"\n{'Phase':<20}{'Total':>10}{entetes}" + ("   Écart p95" if ref else ""))
+    for phase, valeurs in sorted(mediane["phases"].items(), key=lambda e: -e[1]["total"]):
+        ligne = f"{phase:<20}{valeurs['total']:>9.2f}s" + "".join(
+            f"{valeurs[f'p{p}']:>8.3f}s" for p in CENTILES)
+        if ref and phase in ref["phases"] and ref["phases"][phase]["p95"]:
+            ligne += f"   {ecart(valeurs['p95'], ref['phases'][phase]['p95'])}"
+        print(ligne)
+
+
+def main():
+    """
+    Génère des dépôts synthétiques ou mesure correction.py sur ces dépôts.
+    """
+    parser = argparse.ArgumentParser(description="Banc d'essai de la correction F1")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    generation = commandes.add_parser("generer", help="Créer des dépôts synthétiques")
+    generation.add_argument("dossier", help="Dossier du lot de dépôts")
+    generation.add_argument("--nombre", type=int, default=100, help="Nombre de dépôts (défaut: 100)")
+    generation.add_argument("--melange", type=lire_melange,
+                            help="Part de chaque cas, ex.: valide=55,syntaxe=10,sans_marqueurs=20,"
+                                 "boucle=5,sortie=10 (défaut)")
+    generation.add_argument("--graine", type=int, default=413, help="Graine de la répartition des cas")
+
+    mesure = commandes.add_parser("mesurer", help="Mesurer la correction d'un lot de dépôts",
+                                  usage="%(prog)s dossier [options] [-- options de correction.py]")
+    mesure.add_argument("dossier", help="Dossier du lot de dépôts")
+    mesure.add_argument("--repetitions", type=int, default=1, help="Nombre d'exécutions (défaut: 1)")
+    mesure.add_argument("--json", help="Fichier JSON où enregistrer la mesure")
+    mesure.add_argument("--reference", help="Mesure JSON précédente à comparer")
+    # Les options de correction.py suivent -- (ex.: -- --statique --jobs 8)
+    arguments = sys.argv[1:]
+    options = []
+    if "--" in arguments:
+        separateur = arguments.index("--")
+        arguments, options = arguments[:separateur], arguments[separateur + 1:]
+    args = parser.parse_args(arguments)
+
+    if args.commande == "generer":
+        comptes = generer(args.dossier, args.nombre, args.melange, args.graine)
+        print(f"✅ {args.nombre} dépôts créés dans {args.dossier}: "
+              + ", ".join(f"{cas} {n}" for cas, n in sorted(comptes.items())))
+
+    elif args.commande == "mesurer":
+        reference = None
+        if args.reference:
+            with open(args.reference, encoding="utf-8") as f:
+                reference = json.load(f)
+        resultat = mesurer(Path(args.dossier).resolve(), max(1, args.repetitions), options)
+        afficher_mesure(resultat, reference)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(resultat, f, ensure_ascii=False, indent=2)
+            print(f"\n✅ Mesure enregistrée dans: {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
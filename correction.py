@@ -14,15 +14,59 @@ Usage:
 
 Exemple:
     python3 correction.py ../etudiants/du-pierre-julien-f1
+    python3 correction.py . --batch ../etudiants --jobs 8
+    python3 correction.py . --batch ../etudiants --no-cache
+    python3 correction.py . --batch ../etudiants --jsonl resultats.jsonl
+    python3 correction.py . --batch ../etudiants --resume
+    python3 correction.py . --batch ../etudiants --export resultats.csv
+    python3 correction.py . --batch ../etudiants --statique
+    python3 correction.py . --batch ../etudiants --prechauffe
+    python3 correction.py . --batch ../etudiants --temps temps.json
+    python3 correction.py . --batch ../etudiants --async --jobs 64
+    python3 correction.py . --batch ../etudiants --durees durees.json
+    python3 correction.py . --batch ../miroirs --ref main
+    python3 correction.py . --batch ../etudiants --historique historique.db
+    python3 correction.py . --batch ../etudiants --no-dedup
+    python3 correction.py . --batch ../etudiants --similarite
+    python3 correction.py . --batch ../etudiants --stats --stats-json classe.json
+    python3 correction.py . --batch ../etudiants --quiet --html classe.html --markdown rapports/
+    python3 correction.py . --batch ../etudiants --sortie-max 40
+    python3 correction.py . --batch ../etudiants --watch --jsonl resultats.jsonl
+    python3 correction.py . --batch ../etudiants --file-travaux /partage/file.db --jobs 4
+    python3 correction.py . --travailleur /partage/file.db
 """
 
+import os
+import io
 import sys
+import asyncio
+import time
+import select
+import signal
+import socket
+import hashlib
+import contextlib
+import contextvars
+import collections
+import functools
 import subprocess
+import tempfile
 import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 import argparse
 
+from grading_engine import grade_repo
+from plugin_resultats import CollecteurResultats, lire_resultats
+from depot_git import ErreurGit, SourceGit, commit_copie_travail, est_depot_nu
+from historique import Historique
+from similarite import SEUIL_SIMILARITE, indexer_depots
+from grille import GrilleCompilee
+from rapports import GabaritsRapport, RapportHTML, RapportsMarkdown
+from surveillance import SurveillanceLot
+from file_travaux import ATTENTE_TRAVAILLEURS, FileTravaux
+
 
 # Configuration de l'évaluation
 CONFIG = {
@@ -35,164 +79,905 @@ CONFIG = {
             "ponderation": 50,
             "critere": "Exécution — Environnement & Déploiement",
             "description": "Préparer l'environnement de développement et déployer l'application",
-            "critères_performance": ["2.1", "2.2", "2.3", "2.4", "2.6"]
+            "critères_performance": ["2.1", "2.2", "2.3", "2.4", "2.6"],
+            # Un critère rapporte ses points si l'un de ses tests est réussi
+            "criteres": [
+                {"points": 50, "tests": ["test_requirements_present"]},
+                {"points": 50, "tests": ["test_import_board", "test_import_si7021"]},
+            ]
         },
         "IND-00SX-D": {
             "ponderation": 50,
             "critere": "Conception — Programmation",
             "description": "Programmer la logique applicative pour l'acquisition de données",
-            "critères_performance": ["4.1", "4.3"]
+            "critères_performance": ["4.1", "4.3"],
+            "criteres": [
+                {"points": 20, "tests": ["test_script_exists"]},
+                {"points": 20, "tests": ["test_script_has_required_imports"]},
+                {"points": 20, "tests": ["test_script_creates_sensor"]},
+                {"points": 20, "tests": ["test_script_executes"]},
+                {"points": 20, "tests": ["test_script_output_format"]},
+            ]
         }
     }
 }
 
+# Rétroaction par indicateur et par niveau
+RETROACTIONS = {
+    "IND-00SX-E": {
+        100: "🎉 Excellent ! L'environnement est parfaitement configuré. Les dépendances sont correctement installées.",
+        85: "✅ Très bon ! L'environnement est bien configuré. Tout fonctionne correctement.",
+        60: "👍 L'environnement de base est en place. Quelques améliorations mineures possibles.",
+        35: "⚠️ L'environnement est partiellement configuré. Vérifiez requirements.txt.",
+        0: "❌ L'environnement n'est pas configuré. Ajoutez les dépendances dans requirements.txt."
+    },
+    "IND-00SX-D": {
+        100: "🎉 Parfait ! Le script est fonctionnel, bien structuré et produit le résultat attendu.",
+        85: "✅ Très bon travail ! Le script fonctionne correctement et affiche les données.",
+        60: "👍 Le script fonctionne et affiche les données essentielles.",
+        35: "⚠️ Le script existe mais a des problèmes. Vérifiez la structure et le format.",
+        0: "❌ Le script n'est pas fonctionnel. Créez capteur.py avec la structure requise."
+    }
+}
+
+# Fichiers et dossiers du dépôt qui déterminent le résultat de la correction
+FICHIERS_CORRIGES = [
+    "test_bmp280.py",
+    "test_neoslider.py",
+    "requirements.txt",
+    ".test_markers",
+    "tests",
+    # Importé par les tests du dépôt (tests/): la copie de l'étudiant compte
+    "grading_engine.py",
+]
+
+# Délai de chaque phase d'un test (setup, call, teardown), en secondes;
+# le délai de 60 s reste la limite de toute l'exécution d'un dépôt
+DELAI_TEST = 10
+VARIABLE_DELAI = "CORRECTION_DELAI_TEST"
+
+# Sortie de pytest: lue ligne par ligne, seules les premières et dernières
+# lignes (SORTIE_MAX_LIGNES au total, chacune tronquée à SORTIE_LARGEUR_MAX
+# octets) sont conservées pour le rapport
+SORTIE_MAX_LIGNES = 200
+SORTIE_LARGEUR_MAX = 500
+VARIABLE_SORTIE = "CORRECTION_SORTIE_MAX"
+
+# Cache des corrections (mode batch)
+CACHE_DOSSIER = Path.home() / ".cache" / "correction-f1"
+CACHE_AGE_MAX_JOURS = 30
+CACHE_TAILLE_MAX_MO = 200
+
+# Modules du correcteur dont dépend le résultat d'une correction (tests,
+# notes, rapport): en modifier un invalide tout le cache
+MODULES_CORRECTEUR = [
+    "correction.py",
+    "grading_engine.py",
+    "grille.py",
+    "plugin_resultats.py",
+    "plugin_delai.py",
+    "rapports.py",
+    "depot_git.py",
+]
+
+
+@functools.cache
+def empreinte_correcteur():
+    """Empreinte SHA-256 des modules du correcteur (MODULES_CORRECTEUR)."""
+    h = hashlib.sha256()
+    for nom in MODULES_CORRECTEUR:
+        h.update(f"{nom}\0".encode())
+        h.update(Path(__file__).with_name(nom).read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def calculer_empreinte(repo_path, source=None, moteur=None):
+    """
+    Calcule l'empreinte SHA-256 des fichiers corrigés d'un dépôt.
+
+    L'empreinte inclut aussi celle des modules du correcteur (voir
+    MODULES_CORRECTEUR): modifier la grille, les vérifications ou les
+    plugins pytest invalide donc tout le cache.
+    Avec un moteur, elle inclut aussi son nom et, s'il exécute pytest, le
+    délai par test: une correction n'est reprise que du même moteur.
+
+    Args:
+        repo_path: Chemin vers le dépôt de l'étudiant
+        source: SourceGit d'un dépôt nu; les identifiants des objets git
+            remplacent alors la lecture des fichiers (optionnel)
+        moteur: Moteur d'exécution des tests (voir MOTEURS, optionnel)
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    h = hashlib.sha256()
+    h.update(empreinte_correcteur().encode())
+    if moteur is not None:
+        h.update(f"moteur:{moteur}\0".encode())
+        if moteur != "statique":
+            h.update(f"delai:{delai_test()}\0".encode())
+
+    if source is not None:
+        for chemin, identifiant in source.identifiants():
+            h.update(f"git:{chemin}\0{identifiant}\0".encode())
+        return h.hexdigest()
+
+    for nom in FICHIERS_CORRIGES:
+        chemin = repo_path / nom
+        if chemin.is_dir():
+            # Les dossiers comptent aussi: un dossier vide n'équivaut pas à
+            # un dossier absent (ex.: .test_markers/ vide)
+            entrees = sorted(
+                [chemin] + [f for f in chemin.rglob("*") if "__pycache__" not in f.parts]
+            )
+        elif chemin.is_file():
+            entrees = [chemin]
+        else:
+            entrees = []
+
+        for entree in entrees:
+            h.update(entree.relative_to(repo_path).as_posix().encode())
+            if entree.is_dir():
+                h.update(b"/\0")
+                continue
+            h.update(b"\0")
+            h.update(entree.read_bytes())
+            h.update(b"\0")
+
+    return h.hexdigest()
+
+
+def lire_cache(cache_dir, empreinte):
+    """
+    Lit une correction précédente dans le cache.
+
+    Args:
+        cache_dir: Dossier du cache
+        empreinte: Empreinte des fichiers corrigés
+
+    Returns:
+        dict: {"resultats": ..., "notes": ...} ou None si absent
+    """
+    chemin = cache_dir / f"{empreinte}.json"
+    try:
+        with open(chemin) as f:
+            entree = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Rafraîchir la date d'accès pour l'éviction
+    try:
+        os.utime(chemin)
+    except OSError:
+        pass
+    return entree
+
+
+def ecrire_cache(cache_dir, empreinte, resultats_tests, notes):
+    """
+    Enregistre une correction dans le cache (écriture atomique).
+
+    Args:
+        cache_dir: Dossier du cache
+        empreinte: Empreinte des fichiers corrigés
+        resultats_tests: Résultats des tests pytest
+        notes: Notes calculées
+    """
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        chemin = cache_dir / f"{empreinte}.json"
+        temporaire = cache_dir / f"{empreinte}.{os.getpid()}.tmp"
+        with open(temporaire, "w") as f:
+            json.dump({"resultats": resultats_tests, "notes": notes}, f)
+        os.replace(temporaire, chemin)
+    except OSError as e:
+        print(f"⚠️ Impossible d'écrire dans le cache: {e}")
+
+
+def cle_depot(repo_dir, ref="HEAD"):
+    """
+    Clé du cache de la dernière correction statique d'un dépôt.
+
+    Contrairement à l'empreinte, la clé ne dépend que du dépôt: elle
+    retrouve la correction précédente même quand les fichiers ont changé,
+    pour ne refaire que les vérifications touchées (voir grade_repo).
+
+    Args:
+        repo_dir: Chemin vers le dépôt de l'étudiant
+        ref: Référence corrigée dans un dépôt nu
+
+    Returns:
+        str: Clé utilisable à la place d'une empreinte (lire_cache, ecrire_cache)
+    """
+    chemin = f"{Path(repo_dir).resolve()}\0{ref}"
+    return "depot-" + hashlib.sha256(chemin.encode()).hexdigest()
+
+
+def fichier_lot(cache_dir, batch_path, nom):
+    """
+    Chemin d'un fichier propre à un dossier batch, rangé dans le dossier du
+    cache plutôt que dans le dossier corrigé (sous-dossier lots/, créé au
+    besoin, que le nettoyage du cache ne touche pas).
+
+    Args:
+        cache_dir: Dossier du cache
+        batch_path: Dossier contenant les dépôts
+        nom: Nom du fichier (ex.: "checkpoint.jsonl")
+
+    Returns:
+        Path: Chemin du fichier
+    """
+    cle = hashlib.sha256(str(Path(batch_path).resolve()).encode()).hexdigest()[:16]
+    dossier = Path(cache_dir) / "lots" / cle
+    dossier.mkdir(parents=True, exist_ok=True)
+    return dossier / nom
+
+
+def nettoyer_cache(cache_dir, age_max_jours=CACHE_AGE_MAX_JOURS, taille_max_mo=CACHE_TAILLE_MAX_MO):
+    """
+    Supprime les entrées du cache trop vieilles, puis les moins récemment
+    utilisées jusqu'à respecter la taille maximale.
+
+    Args:
+        cache_dir: Dossier du cache
+        age_max_jours: Âge maximal d'une entrée (jours)
+        taille_max_mo: Taille maximale du cache (Mo)
 
-def executer_tests(repo_path):
+    Returns:
+        int: Nombre d'entrées supprimées
+    """
+    if not cache_dir.exists():
+        return 0
+
+    limite = time.time() - age_max_jours * 86400
+    entrees = []
+    supprimees = 0
+
+    for chemin in cache_dir.glob("*.json"):
+        try:
+            stat = chemin.stat()
+        except OSError:
+            continue
+        if stat.st_mtime < limite:
+            chemin.unlink(missing_ok=True)
+            supprimees += 1
+        else:
+            entrees.append((stat.st_mtime, stat.st_size, chemin))
+
+    # Éviction LRU: les plus anciennes d'abord
+    taille = sum(e[1] for e in entrees)
+    for _, taille_entree, chemin in sorted(entrees):
+        if taille <= taille_max_mo * 1024 * 1024:
+            break
+        chemin.unlink(missing_ok=True)
+        taille -= taille_entree
+        supprimees += 1
+
+    return supprimees
+
+
+# Le temps CPU mesuré inclut-il les processus enfants terminés? Non en
+# mode asynchrone: les enfants de tous les dépôts se terminent dans le même
+# processus, et chacun est compté à part (voir executer_tests_async)
+CPU_ENFANTS = contextvars.ContextVar("cpu_enfants", default=True)
+
+
+def temps_cpu():
+    """
+    Retourne le temps CPU consommé par ce processus et ses enfants terminés
+    (sans les enfants si CPU_ENFANTS est faux).
+
+    Returns:
+        float: Temps CPU en secondes (utilisateur + système)
+    """
+    t = os.times()
+    if not CPU_ENFANTS.get():
+        return t.user + t.system
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def ajouter_temps(temps, phase, mur, cpu):
+    """Ajoute une durée mur et CPU à temps[phase]."""
+    mesure = temps.setdefault(phase, {"mur": 0.0, "cpu": 0.0})
+    mesure["mur"] += mur
+    mesure["cpu"] += cpu
+
+
+@contextlib.contextmanager
+def mesurer(temps, phase):
+    """
+    Mesure le temps mur et CPU d'un bloc et l'ajoute à temps[phase].
+
+    Le temps CPU inclut les processus enfants (sous-processus pytest).
+
+    Args:
+        temps: Dictionnaire des temps par phase (None = pas de mesure)
+        phase: Nom de la phase
+    """
+    if temps is None:
+        yield
+        return
+
+    debut_mur = time.perf_counter()
+    debut_cpu = temps_cpu()
+    try:
+        yield
+    finally:
+        ajouter_temps(temps, phase, time.perf_counter() - debut_mur, temps_cpu() - debut_cpu)
+
+
+def executer_tests(repo_path, temps=None, timeout=60):
     """
     Exécute les tests pytest sur le dépôt de l'étudiant.
 
+    Les résultats arrivent par le plugin plugin_resultats, dans un fichier
+    temporaire hors du dépôt: rien n'est écrit dans le dépôt corrigé. La
+    sortie de pytest est lue au fil de l'exécution par un AnalyseurSortie,
+    sans jamais être accumulée en entier.
+
     Args:
         repo_path: Chemin vers le dépôt de l'étudiant
+        temps: Dictionnaire des temps par phase à compléter (optionnel)
+        timeout: Délai maximal en secondes
 
     Returns:
         dict: Résultats des tests avec détails
     """
     print(f"🔍 Exécution des tests sur: {repo_path}")
 
-    # Construire la commande pytest
-    cmd = [
+    with tempfile.TemporaryDirectory(prefix="correction-f1-") as dossier_temp:
+        fichier_resultats = Path(dossier_temp) / "resultats.jsonl"
+        cmd = commande_pytest(repo_path, fichier_resultats)
+        analyseur = AnalyseurSortie()
+
+        try:
+            with mesurer(temps, "executer_tests"):
+                processus = subprocess.Popen(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    cwd=str(repo_path),
+                    env=environnement_pytest()
+                )
+                with processus:
+                    limite = time.monotonic() + timeout
+                    try:
+                        while True:
+                            restant = limite - time.monotonic()
+                            if restant <= 0:
+                                raise subprocess.TimeoutExpired(cmd, timeout)
+                            pret, _, _ = select.select([processus.stdout], [], [], restant)
+                            if pret:
+                                bloc = os.read(processus.stdout.fileno(), 65536)
+                                if not bloc:
+                                    break
+                                analyseur.alimenter(bloc)
+                        returncode = processus.wait(max(limite - time.monotonic(), 0))
+                    finally:
+                        if processus.returncode is None:
+                            processus.kill()
+
+            with mesurer(temps, "parse"):
+                # Lire les résultats du plugin si disponibles
+                resultats = lire_resultats(fichier_resultats)
+                if resultats is not None:
+                    return resultats
+
+                # Sinon, les résultats lus dans la sortie
+                resultats = analyseur.resultat(returncode)
+                resultats["extrait_sortie"] = analyseur.extrait()
+                return resultats
+
+        except subprocess.TimeoutExpired:
+            resultats = resultats_partiels(fichier_resultats)
+            resultats["extrait_sortie"] = analyseur.extrait()
+            return resultats
+        except FileNotFoundError:
+            return {"erreur": "pytest non installé ou tests introuvables"}
+        except Exception as e:
+            return {"erreur": f"Erreur lors des tests: {str(e)}"}
+
+
+def resultats_partiels(fichier_resultats):
+    """
+    Récupère les tests terminés avant l'arrêt d'une exécution trop longue.
+
+    Le plugin écrit chaque test dès qu'il est terminé: ces tests sont notés
+    normalement, les autres comptent comme non réussis. "erreur" est tout
+    de même présent pour que le résultat ne soit pas mis en cache.
+
+    Args:
+        fichier_resultats: Fichier JSONL écrit par le plugin
+
+    Returns:
+        dict: Résultats partiels, ou erreur de timeout si aucun test n'a
+        été reçu
+    """
+    resultats = lire_resultats(fichier_resultats)
+    if resultats is None:
+        return {"erreur": "Timeout - Les tests prennent trop de temps"}
+    resultats["erreur"] = (f"Timeout - résultats partiels: {len(resultats['tests'])} "
+                           f"test(s) terminé(s) avant l'arrêt")
+    return resultats
+
+
+def delai_test():
+    """Délai par phase de test: CORRECTION_DELAI_TEST ou DELAI_TEST."""
+    try:
+        return float(os.environ.get(VARIABLE_DELAI, DELAI_TEST))
+    except ValueError:
+        return float(DELAI_TEST)
+
+
+def sortie_max():
+    """Lignes de sortie conservées: CORRECTION_SORTIE_MAX ou SORTIE_MAX_LIGNES."""
+    try:
+        return max(int(os.environ.get(VARIABLE_SORTIE, SORTIE_MAX_LIGNES)), 0)
+    except ValueError:
+        return SORTIE_MAX_LIGNES
+
+
+async def attendre_processus(pid, intervalle=0.05):
+    """
+    Attend la fin d'un sous-processus depuis la boucle asyncio, sans fil.
+
+    Le descripteur os.pidfd_open() du sous-processus devient lisible à sa
+    fin (Linux); ailleurs, le sous-processus est consulté à intervalle
+    régulier. Il est ensuite récolté par os.wait4.
+
+    Args:
+        pid: Identifiant du sous-processus
+        intervalle: Pause entre deux consultations sans pidfd, en secondes
+
+    Returns:
+        tuple: (statut, ressources) de os.wait4
+    """
+    boucle = asyncio.get_running_loop()
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        pidfd = None
+
+    if pidfd is None:
+        while True:
+            fini, statut, usage = os.wait4(pid, os.WNOHANG)
+            if fini:
+                return statut, usage
+            await asyncio.sleep(intervalle)
+
+    try:
+        termine = boucle.create_future()
+        boucle.add_reader(pidfd, lambda: termine.done() or termine.set_result(None))
+        try:
+            await termine
+        finally:
+            boucle.remove_reader(pidfd)
+    finally:
+        os.close(pidfd)
+    _, statut, usage = os.wait4(pid, os.WNOHANG)
+    return statut, usage
+
+
+async def executer_tests_async(repo_path, temps=None, timeout=60):
+    """
+    Exécute les tests pytest dans un sous-processus supervisé par asyncio.
+
+    La sortie est lue en continu pendant l'exécution par un AnalyseurSortie;
+    au-delà du délai, ou si la tâche est annulée (Ctrl-C), le sous-processus
+    est tué.
+
+    Le sous-processus est attendu dans la boucle (voir attendre_processus)
+    puis récolté par os.wait4, qui rapporte le temps CPU de ce seul
+    sous-processus: les compteurs des enfants de os.times() cumulent ceux
+    de tous les dépôts en cours.
+
+    Args:
+        repo_path: Chemin vers le dépôt de l'étudiant
+        temps: Dictionnaire des temps par phase à compléter (optionnel)
+        timeout: Délai maximal en secondes
+
+    Returns:
+        dict: Résultats des tests avec détails
+    """
+    boucle = asyncio.get_running_loop()
+    with tempfile.TemporaryDirectory(prefix="correction-f1-") as dossier_temp:
+        fichier_resultats = Path(dossier_temp) / "resultats.jsonl"
+        cmd = commande_pytest(repo_path, fichier_resultats)
+        analyseur = AnalyseurSortie()
+
+        try:
+            debut_mur = time.perf_counter()
+            processus = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=str(repo_path),
+                env=environnement_pytest()
+            )
+            lecteur = asyncio.StreamReader()
+            transport = None
+            attente = asyncio.ensure_future(attendre_processus(processus.pid))
+
+            async def lire_sortie():
+                while bloc := await lecteur.read(65536):
+                    analyseur.alimenter(bloc)
+                return await asyncio.shield(attente)
+
+            expire = False
+            try:
+                transport, _ = await boucle.connect_read_pipe(
+                    lambda: asyncio.StreamReaderProtocol(lecteur), processus.stdout)
+                try:
+                    await asyncio.wait_for(lire_sortie(), timeout)
+                except asyncio.TimeoutError:
+                    expire = True
+            finally:
+                if not attente.done():
+                    # Pas processus.kill(): son poll() attendrait le sous-processus à la place de os.wait4
+                    os.kill(processus.pid, signal.SIGKILL)
+                statut, usage = await asyncio.shield(attente)
+                # Le sous-processus est attendu: Popen ne doit plus le faire
+                processus.returncode = os.waitstatus_to_exitcode(statut)
+                if transport is not None:
+                    transport.close()
+                else:
+                    processus.stdout.close()
+                if temps is not None:
+                    ajouter_temps(temps, "executer_tests", time.perf_counter() - debut_mur,
+                                  usage.ru_utime + usage.ru_stime)
+
+            if expire:
+                resultats = resultats_partiels(fichier_resultats)
+                resultats["extrait_sortie"] = analyseur.extrait()
+                return resultats
+            returncode = processus.returncode
+
+            with mesurer(temps, "parse"):
+                resultats = lire_resultats(fichier_resultats)
+                if resultats is not None:
+                    return resultats
+                resultats = analyseur.resultat(returncode)
+                resultats["extrait_sortie"] = analyseur.extrait()
+                return resultats
+
+        except FileNotFoundError:
+            return {"erreur": "pytest non installé ou tests introuvables"}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return {"erreur": f"Erreur lors des tests: {str(e)}"}
+
+
+def commande_pytest(repo_path, fichier_resultats):
+    """
+    Construit la commande pytest d'un dépôt.
+
+    Args:
+        repo_path: Chemin vers le dépôt de l'étudiant
+        fichier_resultats: Fichier JSONL où le plugin écrit les résultats
+
+    Returns:
+        list: Commande et arguments
+    """
+    return [
         sys.executable, "-m", "pytest",
         str(repo_path / "tests"),
         "-v",
         "--tb=short",
-        "--json-report",
-        f"--json-report-file={repo_path}/test_results.json"
+        "-p", "no:cacheprovider",
+        "-p", "plugin_resultats",
+        f"--resultats-fichier={fichier_resultats}",
+        "-p", "plugin_delai",
+        f"--delai-test={delai_test()}"
     ]
 
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60,
-            cwd=str(repo_path)
-        )
 
-        # Lire les résultats JSON si disponibles
-        test_results_path = repo_path / "test_results.json"
-        if test_results_path.exists():
-            with open(test_results_path) as f:
-                return json.load(f)
+def environnement_pytest():
+    """
+    Prépare l'environnement du sous-processus pytest.
 
-        # Sinon, parser depuis stdout
-        return parser_sortie_pytest(result.stdout, result.returncode)
+    Le plugin est importé depuis le dossier du correcteur, jamais depuis le
+    dépôt de l'étudiant (PYTHONSAFEPATH), et aucun bytecode n'est écrit
+    dans le dépôt (PYTHONDONTWRITEBYTECODE).
 
-    except subprocess.TimeoutExpired:
-        return {"erreur": "Timeout - Les tests prennent trop de temps"}
-    except FileNotFoundError:
-        return {"erreur": "pytest non installé ou tests introuvables"}
-    except Exception as e:
-        return {"erreur": f"Erreur lors des tests: {str(e)}"}
+    Returns:
+        dict: Variables d'environnement
+    """
+    env = dict(os.environ)
+    dossier_correcteur = str(Path(__file__).resolve().parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [dossier_correcteur, env.get("PYTHONPATH")]))
+    env["PYTHONSAFEPATH"] = "1"
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env.setdefault(VARIABLE_DELAI, str(DELAI_TEST))
+    return env
 
 
-def parser_sortie_pytest(stdout, returncode):
+def prechauffer_pytest():
+    """
+    Importe pytest et ses modules internes dans le processus courant.
+
+    Appelé une fois par processus de correction: chaque dépôt est ensuite
+    corrigé dans un enfant créé par fork(), qui hérite de pytest déjà importé.
+    """
+    import pytest
+    import _pytest.config
+    import _pytest.main
+    import _pytest.python
+    import _pytest.runner
+    import _pytest.terminal
+    import _pytest.skipping
+    import _pytest.fixtures
+
+
+def _isoler_modules(repo_path):
+    """
+    Retire de sys.modules les modules du correcteur que les tests du dépôt
+    importent (grading_engine, tests), pour que l'enfant utilise ceux du dépôt.
     """
-    Parse la sortie texte de pytest si le rapport JSON n'est pas disponible.
+    dossier_correcteur = Path(__file__).resolve().parent
+    for nom, module in list(sys.modules.items()):
+        fichier = getattr(module, "__file__", None)
+        if nom in ("__main__", __name__) or not fichier:
+            continue
+        if Path(fichier).resolve().parent in (dossier_correcteur, dossier_correcteur / "tests"):
+            del sys.modules[nom]
+    sys.path.insert(0, str(repo_path))
+
+
+def executer_tests_chaud(repo_path, temps=None, timeout=60):
+    """
+    Exécute les tests pytest dans un enfant forké d'un processus préchauffé.
+
+    L'enfant hérite de pytest déjà importé (voir prechauffer_pytest()): seule
+    la collecte et l'exécution des tests restent à payer. Chaque dépôt a son
+    propre enfant, donc ses propres modules importés.
 
     Args:
-        stdout: Sortie standard de pytest
-        returncode: Code de retour de pytest
+        repo_path: Chemin vers le dépôt de l'étudiant
+        temps: Dictionnaire des temps par phase à compléter (optionnel)
+        timeout: Délai maximal en secondes
 
     Returns:
-        dict: Résultats parsés
+        dict: Résultats des tests avec détails
+    """
+    if not hasattr(os, "fork"):
+        return executer_tests(repo_path, temps)
+
+    print(f"🔍 Exécution des tests sur: {repo_path}")
+    import pytest
+    from plugin_delai import LimiteDuree
+
+    with tempfile.TemporaryDirectory(prefix="correction-f1-") as dossier_temp:
+        fichier_resultats = Path(dossier_temp) / "resultats.jsonl"
+        lecture, ecriture = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            # Processus enfant: exécuter pytest; les résultats vont au fichier
+            # du collecteur, le tube n'indique au parent que la fin
+            code = 1
+            try:
+                os.close(lecture)
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, 1)
+                os.dup2(devnull, 2)
+                sys.stdout = sys.stderr = open(os.devnull, "w")
+                os.chdir(repo_path)
+                _isoler_modules(repo_path)
+
+                plugins = [CollecteurResultats(fichier_resultats)]
+                if delai_test() > 0:
+                    plugins.append(LimiteDuree(delai_test()))
+                pytest.main([str(repo_path / "tests"), "-q", "--tb=line", "-p", "no:cacheprovider"],
+                            plugins=plugins)
+                code = 0
+            finally:
+                os._exit(code)
+
+        # Processus parent: attendre la fin de l'enfant avec délai maximal
+        os.close(ecriture)
+        limite = time.monotonic() + timeout
+        with mesurer(temps, "executer_tests"):
+            try:
+                while True:
+                    restant = limite - time.monotonic()
+                    if restant <= 0:
+                        os.kill(pid, signal.SIGKILL)
+                        return resultats_partiels(fichier_resultats)
+                    pret, _, _ = select.select([lecture], [], [], restant)
+                    if pret and not os.read(lecture, 65536):
+                        break
+            finally:
+                os.close(lecture)
+                os.waitpid(pid, 0)
+
+        with mesurer(temps, "parse"):
+            resultats = lire_resultats(fichier_resultats)
+            if resultats is None:
+                return {"erreur": "Erreur lors des tests: rapport pytest illisible"}
+            return resultats
+
+
+def executer_statique(repo_path, temps=None, source=None, precedent=None):
+    """
+    Évalue les jalons en processus avec le moteur statique (grading_engine).
+
+    Args:
+        repo_path: Chemin vers le dépôt de l'étudiant
+        temps: Dictionnaire des temps par phase à compléter (optionnel)
+        source: SourceGit d'un dépôt nu (défaut: copie de travail)
+        precedent: Résultats de la correction précédente du dépôt; seules
+            les vérifications dont un fichier lu a changé sont refaites
+            (optionnel)
+
+    Returns:
+        dict: Résultats des tests avec détails
+    """
+    with mesurer(temps, "executer_tests"):
+        return grade_repo(repo_path, source, precedent)
+
+
+# Moteurs d'exécution des tests, choisis en ligne de commande
+MOTEURS = {
+    "pytest": executer_tests,
+    "statique": executer_statique,
+    "chaud": executer_tests_chaud,
+}
+
+
+class AnalyseurSortie:
     """
-    result = {
-        "summary": {
+    Analyse la sortie de pytest au fil de l'eau, à mémoire bornée.
+
+    La sortie arrive par blocs d'octets; chaque ligne complète est analysée
+    dès qu'elle est reçue puis oubliée. Seuls restent les tests trouvés, les
+    premières et dernières lignes (l'extrait du rapport) et la ligne en
+    cours, tronquée à SORTIE_LARGEUR_MAX octets: un test qui affiche sans
+    fin n'occupe pas plus de mémoire qu'un test silencieux.
+
+    Args:
+        max_lignes: Lignes conservées pour l'extrait, moitié au début et
+            moitié à la fin (défaut: sortie_max())
+    """
+
+    def __init__(self, max_lignes=None):
+        if max_lignes is None:
+            max_lignes = sortie_max()
+        self.max_tete = max_lignes - max_lignes // 2
+        self.tete = []
+        self.queue = collections.deque(maxlen=max_lignes // 2)
+        self.fragment = bytearray()
+        self.nb_lignes = 0
+        self.summary = {
             "total": 0,
             "passed": 0,
             "failed": 0,
             "skipped": 0
-        },
-        "tests": []
-    }
+        }
+        self.tests = []
+
+    def alimenter(self, bloc):
+        """
+        Ajoute un bloc de sortie et analyse les lignes qu'il termine.
+
+        Args:
+            bloc: Octets lus de la sortie de pytest
+        """
+        debut = 0
+        while (fin := bloc.find(b"\n", debut)) >= 0:
+            self._prolonger(bloc[debut:fin])
+            self.ligne(self.fragment.decode(errors="replace"))
+            self.fragment.clear()
+            debut = fin + 1
+        self._prolonger(bloc[debut:])
+
+    def _prolonger(self, octets):
+        place = SORTIE_LARGEUR_MAX - len(self.fragment)
+        if place > 0:
+            self.fragment += octets[:place]
+
+    def ligne(self, line):
+        """
+        Analyse une ligne de sortie et la retient pour l'extrait au besoin.
+
+        Args:
+            line: Ligne de sortie, sans fin de ligne
+        """
+        self.nb_lignes += 1
+        if len(self.tete) < self.max_tete:
+            self.tete.append(line)
+        else:
+            self.queue.append(line)
 
-    # Parsing simple de la sortie
-    for line in stdout.split('\n'):
         line = line.strip()
         if '::' in line and ('PASSED' in line or 'FAILED' in line):
             parts = line.split()
             test_name = parts[0].split('::')[-1]
             status = parts[1] if len(parts) > 1 else "UNKNOWN"
 
-            result["summary"]["total"] += 1
+            self.summary["total"] += 1
             if status == "PASSED":
-                result["summary"]["passed"] += 1
+                self.summary["passed"] += 1
             elif status == "FAILED":
-                result["summary"]["failed"] += 1
+                self.summary["failed"] += 1
             else:
-                result["summary"]["skipped"] += 1
+                self.summary["skipped"] += 1
 
-            result["tests"].append({
+            self.tests.append({
                 "name": test_name,
                 "outcome": status.lower()
             })
 
-    result["summary"]["duration"] = 0
-    return result
+    def terminer(self):
+        """Analyse la dernière ligne si la sortie ne finit pas par une fin de ligne."""
+        if self.fragment:
+            self.ligne(self.fragment.decode(errors="replace"))
+            self.fragment.clear()
+
+    def resultat(self, returncode):
+        """
+        Résultats des tests trouvés dans la sortie.
+
+        Args:
+            returncode: Code de retour de pytest
+
+        Returns:
+            dict: Résultats parsés
+        """
+        self.terminer()
+        return {"summary": dict(self.summary, duration=0), "tests": list(self.tests)}
+
+    def extrait(self):
+        """
+        Premières et dernières lignes de la sortie, pour le rapport.
+
+        Returns:
+            str: Extrait, avec le nombre de lignes omises au milieu
+        """
+        self.terminer()
+        lignes = list(self.tete)
+        omises = self.nb_lignes - len(self.tete) - len(self.queue)
+        if omises:
+            lignes.append(f"[... {omises} ligne(s) omise(s) ...]")
+        lignes.extend(self.queue)
+        return "\n".join(lignes)
+
+
+def parser_sortie_pytest(stdout, returncode):
+    """
+    Parse la sortie texte de pytest si le plugin n'a produit aucun résultat.
+
+    Args:
+        stdout: Sortie standard de pytest
+        returncode: Code de retour de pytest
+
+    Returns:
+        dict: Résultats parsés
+    """
+    analyseur = AnalyseurSortie(0)
+    for line in stdout.split('\n'):
+        analyseur.ligne(line)
+    return analyseur.resultat(returncode)
 
 
 def calculer_notes(resultats_tests):
     """
     Calcule les notes selon les grilles permanentes.
 
+    La grille déclarée dans CONFIG est compilée une fois (GRILLE): le score
+    d'un indicateur est la somme des points des critères dont un test est
+    dans le masque des tests réussis.
+
     Args:
         resultats_tests: Résultats des tests pytest
 
     Returns:
         dict: Notes par indicateur et note finale
     """
-    notes = {
-        "IND-00SX-E": {"score": 0, "niveau": 0, "retroaction": ""},
-        "IND-00SX-D": {"score": 0, "niveau": 0, "retroaction": ""},
-        "finale": 0
-    }
-
-    # Extraire les résultats des tests
     tests = resultats_tests.get("tests", [])
     test_status = {t["name"]: t["outcome"] for t in tests}
-
-    # Évaluer IND-00SX-E (Environnement)
-    score_e = 0
-    if test_status.get("test_requirements_present") == "passed":
-        score_e += 50
-    if test_status.get("test_import_board") == "passed" or test_status.get("test_import_si7021") == "passed":
-        score_e += 50
-
-    notes["IND-00SX-E"]["score"] = score_e
-    notes["IND-00SX-E"]["niveau"] = determiner_niveau(score_e)
-    notes["IND-00SX-E"]["retroaction"] = generer_retroaction("IND-00SX-E", score_e)
-
-    # Évaluer IND-00SX-D (Programmation)
-    score_d = 0
-    if test_status.get("test_script_exists") == "passed":
-        score_d += 20
-    if test_status.get("test_script_has_required_imports") == "passed":
-        score_d += 20
-    if test_status.get("test_script_creates_sensor") == "passed":
-        score_d += 20
-    if test_status.get("test_script_executes") == "passed":
-        score_d += 20
-    if test_status.get("test_script_output_format") == "passed":
-        score_d += 20
-
-    notes["IND-00SX-D"]["score"] = score_d
-    notes["IND-00SX-D"]["niveau"] = determiner_niveau(score_d)
-    notes["IND-00SX-D"]["retroaction"] = generer_retroaction("IND-00SX-D", score_d)
-
-    # Note finale (pondérée)
-    notes["finale"] = (score_e * 0.5) + (score_d * 0.5)
-
-    return notes
+    return GRILLE.noter(GRILLE.masque(test_status))
 
 
 def determiner_niveau(score):
@@ -228,172 +1013,1318 @@ def generer_retroaction(indicateur, score):
     Returns:
         str: Message de rétroaction
     """
-    messages = {
-        "IND-00SX-E": {
-            100: "🎉 Excellent ! L'environnement est parfaitement configuré. Les dépendances sont correctement installées.",
-            85: "✅ Très bon ! L'environnement est bien configuré. Tout fonctionne correctement.",
-            60: "👍 L'environnement de base est en place. Quelques améliorations mineures possibles.",
-            35: "⚠️ L'environnement est partiellement configuré. Vérifiez requirements.txt.",
-            0: "❌ L'environnement n'est pas configuré. Ajoutez les dépendances dans requirements.txt."
-        },
-        "IND-00SX-D": {
-            100: "🎉 Parfait ! Le script est fonctionnel, bien structuré et produit le résultat attendu.",
-            85: "✅ Très bon travail ! Le script fonctionne correctement et affiche les données.",
-            60: "👍 Le script fonctionne et affiche les données essentielles.",
-            35: "⚠️ Le script existe mais a des problèmes. Vérifiez la structure et le format.",
-            0: "❌ Le script n'est pas fonctionnel. Créez capteur.py avec la structure requise."
-        }
-    }
-
     niveau = determiner_niveau(score)
-    return messages.get(indicateur, {}).get(niveau, "Rétroaction non disponible")
+    return RETROACTIONS.get(indicateur, {}).get(niveau, "Rétroaction non disponible")
+
+
+# Grille de CONFIG compilée en masques de critères (voir grille.py)
+GRILLE = GrilleCompilee(CONFIG["indicateurs"], determiner_niveau, generer_retroaction)
+
+# Gabarits des rapports texte, Markdown et HTML (voir rapports.py)
+GABARITS = GabaritsRapport(CONFIG)
 
 
 def afficher_rapport(etudiant, resultats_tests, notes):
     """
     Affiche un rapport détaillé de la correction.
 
+    Le rapport est rendu d'un bloc à partir des gabarits précompilés
+    (GABARITS) puis écrit en une seule fois. L'extrait de la sortie de
+    pytest n'y figure que si le plugin n'a rien produit ou si le dépôt a
+    dépassé son délai.
+
     Args:
         etudiant: Nom de l'étudiant (ou ID)
         resultats_tests: Résultats bruts des tests
         notes: Notes calculées
     """
-    print("\n" + "="*70)
-    print(f"📊 RAPPORT DE CORRECTION — {CONFIG['titre']}")
-    print("="*70)
-    print(f"Étudiant: {etudiant}")
-    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print(f"Cours: {CONFIG['cours']}")
-    print(f"Type: {CONFIG['type']}")
+    sys.stdout.write(GABARITS.texte(etudiant, resultats_tests.get("summary", {}), notes,
+                                    resultats_tests.get("extrait_sortie")))
 
-    # Résumé des tests
-    print("\n" + "-"*70)
-    print("RÉSUMÉ DES TESTS")
-    print("-"*70)
 
-    summary = resultats_tests.get("summary", {})
-    total = summary.get("total", 0)
-    passed = summary.get("passed", 0)
-    failed = summary.get("failed", 0)
+def issues_tests(resultat):
+    """
+    Retourne l'issue de chaque test d'un résultat d'étudiant.
 
-    print(f"Tests exécutés: {total}")
-    print(f"✅ Réussis: {passed}")
-    print(f"❌ Échoués: {failed}")
+    Accepte aussi bien un résultat complet (rapport pytest dans "resultats")
+    qu'un enregistrement compact (voir resumer_resultat()).
 
-    # Détail par indicateur
-    print("\n" + "-"*70)
-    print("ÉVALUATION PAR INDICATEUR")
-    print("-"*70)
+    Args:
+        resultat: Résultat d'un étudiant
 
-    for indicateur, config in CONFIG["indicateurs"].items():
-        note = notes[indicateur]
-        print(f"\n{indicateur} — {config['critere']}")
-        print(f"  Critères de performance: {', '.join(config['critères_performance'])}")
-        print(f"  Score: {note['score']:.0f}%")
-        print(f"  Niveau: {note['niveau']}%")
-        print(f"  Rétroaction: {note['retroaction']}")
+    Returns:
+        dict: Issue ("passed", "failed", ...) par nom de test
+    """
+    if "tests" in resultat:
+        return resultat["tests"]
+    return {t["name"]: t["outcome"] for t in resultat.get("resultats", {}).get("tests", [])}
 
-    # Note finale
-    print("\n" + "-"*70)
-    print("NOTE FINALE")
-    print("-"*70)
-    print(f"📈 Score global: {notes['finale']:.1f}%")
-
-    # Message formatif
-    print("\n" + "="*70)
-    print("💡 RAPPEL IMPORTANT")
-    print("="*70)
-    print("Cette évaluation est FORMATIVE et NON NOTÉE.")
-    print("Son but est de vous donner une rétroaction pour vous améliorer.")
-    print("\nSi vous avez des échecs:")
-    print("1. Lisez attentivement la rétroaction ci-dessus")
-    print("2. Consultez le guide de dépannage")
-    print("3. Corrigez votre code")
-    print("4. Pussez et relancez les tests")
-    print("\nN'hésitez pas à demander de l'aide à l'enseignant!")
-    print("="*70 + "\n")
 
+def lignes_export(etudiants_resultats):
+    """
+    Prépare les lignes d'export: une ligne d'en-têtes puis une par étudiant.
 
-def exporter_excel(etudiants_resultats, chemin_sortie):
+    Les colonnes par test sont l'union des tests rencontrés, dans l'ordre
+    de première apparition.
+
+    Args:
+        etudiants_resultats: Liste des résultats par étudiant
+
+    Yields:
+        list: En-têtes, puis valeurs de chaque étudiant
     """
-    Exporte les résultats vers un fichier Excel.
+    noms_tests = {}
+    for result in etudiants_resultats:
+        for nom in issues_tests(result):
+            noms_tests.setdefault(nom, None)
+
+    yield (["Étudiant", "IND-00SX-E (%)", "IND-00SX-D (%)", "Note finale (%)",
+            "Rétroaction IND-00SX-E", "Rétroaction IND-00SX-D"] + list(noms_tests))
+
+    for result in etudiants_resultats:
+        issues = issues_tests(result)
+        yield ([
+            result["etudiant"],
+            result["notes"]["IND-00SX-E"]["score"],
+            result["notes"]["IND-00SX-D"]["score"],
+            result["notes"]["finale"],
+            result["notes"]["IND-00SX-E"]["retroaction"],
+            result["notes"]["IND-00SX-D"]["retroaction"],
+        ] + [issues.get(nom, "") for nom in noms_tests])
+
+
+def exporter_resultats(etudiants_resultats, chemin_sortie, format_sortie=None):
+    """
+    Exporte les résultats en une seule passe, sans garder le classeur en mémoire.
 
     Args:
         etudiants_resultats: Liste des résultats par étudiant
         chemin_sortie: Chemin du fichier de sortie
+        format_sortie: "xlsx", "csv" ou "parquet" (défaut: selon l'extension)
 
     Returns:
         bool: True si succès, False sinon
     """
+    if format_sortie is None:
+        format_sortie = Path(chemin_sortie).suffix.lstrip(".").lower() or "xlsx"
+
     try:
-        import openpyxl
-
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Résultats F1"
-
-        # En-têtes
-        headers = ["Étudiant", "IND-00SX-E (%)", "IND-00SX-D (%)", "Note finale (%)", "Rétroaction"]
-        ws.append(headers)
-
-        # Données
-        for result in etudiants_resultats:
-            ws.append([
-                result["etudiant"],
-                result["notes"]["IND-00SX-E"]["score"],
-                result["notes"]["IND-00SX-D"]["score"],
-                result["notes"]["finale"],
-                result["notes"]["IND-00SX-E"]["retroaction"][:50] + "..."
-            ])
-
-        wb.save(chemin_sortie)
+        lignes = lignes_export(etudiants_resultats)
+
+        if format_sortie == "csv":
+            import csv
+
+            # utf-8-sig: accents lisibles à l'ouverture dans Excel
+            with open(chemin_sortie, "w", newline="", encoding="utf-8-sig") as f:
+                csv.writer(f).writerows(lignes)
+
+        elif format_sortie == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            headers = next(lignes)
+            schema = pa.schema(
+                [(headers[0], pa.string())]
+                + [(h, pa.float64()) for h in headers[1:4]]
+                + [(h, pa.string()) for h in headers[4:]]
+            )
+            with pq.ParquetWriter(chemin_sortie, schema) as writer:
+                lot = []
+                for ligne in lignes:
+                    lot.append(ligne)
+                    if len(lot) >= 1000:
+                        writer.write_table(pa.Table.from_pylist(
+                            [dict(zip(headers, l)) for l in lot], schema=schema))
+                        lot = []
+                if lot:
+                    writer.write_table(pa.Table.from_pylist(
+                        [dict(zip(headers, l)) for l in lot], schema=schema))
+
+        elif format_sortie == "xlsx":
+            import openpyxl
+
+            # Mode write-only: les lignes sont écrites en flux
+            wb = openpyxl.Workbook(write_only=True)
+            ws = wb.create_sheet("Résultats F1")
+            for ligne in lignes:
+                ws.append(ligne)
+            wb.save(chemin_sortie)
+
+        else:
+            print(f"❌ Format d'export inconnu: {format_sortie} (xlsx, csv ou parquet)")
+            return False
+
         print(f"✅ Résultats exportés vers: {chemin_sortie}")
         return True
 
-    except ImportError:
-        print("⚠️ openpyxl non installé. Installation: pip install openpyxl")
+    except ImportError as e:
+        module = "pyarrow" if format_sortie == "parquet" else "openpyxl"
+        print(f"⚠️ {e.name or module} non installé. Installation: pip install {module}")
         return False
     except Exception as e:
-        print(f"❌ Erreur lors de l'export Excel: {e}")
+        print(f"❌ Erreur lors de l'export {format_sortie}: {e}")
         return False
 
 
+def exporter_excel(etudiants_resultats, chemin_sortie):
+    """
+    Exporte les résultats vers un fichier Excel.
+
+    Args:
+        etudiants_resultats: Liste des résultats par étudiant
+        chemin_sortie: Chemin du fichier de sortie
+
+    Returns:
+        bool: True si succès, False sinon
+    """
+    return exporter_resultats(etudiants_resultats, chemin_sortie, "xlsx")
+
+
+def afficher_entete(repo_dir):
+    """Affiche l'en-tête du traitement d'un dépôt."""
+    print(f"\n{'='*70}")
+    print(f"Traitement de: {repo_dir.name}")
+    print('='*70)
+
+
+class CorrectionDepot:
+    """
+    État de la correction d'un dépôt: sortie capturée, temps par phase et
+    entrée du cache.
+
+    Partagé par la correction synchrone (corriger_depot) et asynchrone
+    (corriger_depot_async): seules les étapes hors de l'exécution des tests
+    sont ici.
+
+    Un dépôt git nu est lu à la référence ref, directement dans les objets
+    git (voir depot_git), et toujours évalué par le moteur statique.
+
+    Args:
+        repo_dir: Chemin vers le dépôt de l'étudiant
+        cache_dir: Dossier du cache des corrections (None = pas de cache)
+        ref: Référence corrigée dans un dépôt nu
+        moteur: Moteur d'exécution des tests (voir MOTEURS)
+    """
+
+    def __init__(self, repo_dir, cache_dir=None, ref="HEAD", moteur="pytest"):
+        self.repo_dir = repo_dir
+        self.cache_dir = cache_dir
+        self.ref = ref
+        self.nu = est_depot_nu(repo_dir)
+        # Moteur qui évalue réellement le dépôt
+        self.moteur = "statique" if self.nu else moteur
+        self.debut = time.monotonic()
+        self.temps = {}
+        self.tampon = io.StringIO()
+        self.empreinte = None
+        self.entree = None
+        self.source = None
+        self.erreur_git = None
+
+    def capturer(self):
+        """Redirige stdout vers le tampon du rapport de ce dépôt."""
+        return contextlib.redirect_stdout(self.tampon)
+
+    def commencer(self):
+        """
+        Affiche l'en-tête et consulte le cache.
+
+        Returns:
+            bool: True si les tests doivent être exécutés (pas en cache)
+        """
+        with self.capturer():
+            afficher_entete(self.repo_dir)
+
+            if self.nu:
+                with mesurer(self.temps, "lire_git"):
+                    try:
+                        self.source = SourceGit(self.repo_dir, self.ref)
+                    except ErreurGit as e:
+                        self.erreur_git = str(e)
+                if self.erreur_git is not None:
+                    return True
+
+            if self.cache_dir is not None:
+                with mesurer(self.temps, "cache"):
+                    self.empreinte = calculer_empreinte(self.repo_dir, self.source, self.moteur)
+                    self.entree = lire_cache(self.cache_dir, self.empreinte)
+
+            if self.entree is not None:
+                print("♻️ Dépôt inchangé depuis la dernière correction (cache)")
+        return self.entree is None
+
+    def executer(self):
+        """
+        Exécute les tests du dépôt avec son moteur.
+
+        Returns:
+            dict: Résultats des tests avec détails
+        """
+        with self.capturer():
+            if self.erreur_git is not None:
+                return {"erreur": f"Dépôt git illisible: {self.erreur_git}"}
+            if self.source is not None:
+                print(f"🔍 Lecture des objets git ({self.ref}) de: {self.repo_dir}")
+            elif self.moteur != "statique":
+                return MOTEURS[self.moteur](self.repo_dir, self.temps)
+            return executer_statique(self.repo_dir, self.temps, self.source, self.precedent())
+
+    def precedent(self):
+        """
+        Résultats de la dernière correction statique du dépôt (cache).
+
+        Returns:
+            dict: Résultats, ou None sans cache ou sans correction précédente
+        """
+        if self.cache_dir is None:
+            return None
+        with mesurer(self.temps, "cache"):
+            entree = lire_cache(self.cache_dir, cle_depot(self.repo_dir, self.ref))
+        return entree["resultats"] if entree else None
+
+    def terminer(self, resultats_tests=None):
+        """
+        Calcule les notes, met le cache à jour et produit le rapport.
+
+        Args:
+            resultats_tests: Résultats des tests (None si pris du cache)
+
+        Returns:
+            dict: Résultat de l'étudiant avec la sortie du rapport ("sortie")
+        """
+        with self.capturer():
+            if self.entree is not None:
+                resultats_tests = self.entree["resultats"]
+                notes = self.entree["notes"]
+            else:
+                with mesurer(self.temps, "calculer_notes"):
+                    notes = calculer_notes(resultats_tests)
+                # Ne pas mémoriser les erreurs passagères (timeout, etc.)
+                if self.cache_dir is not None and "erreur" not in resultats_tests:
+                    with mesurer(self.temps, "cache"):
+                        ecrire_cache(self.cache_dir, self.empreinte, resultats_tests, notes)
+                        # Moteur statique: base de la prochaine correction partielle
+                        if "inputs" in resultats_tests:
+                            ecrire_cache(self.cache_dir, cle_depot(self.repo_dir, self.ref),
+                                         resultats_tests, notes)
+
+            with mesurer(self.temps, "afficher_rapport"):
+                afficher_rapport(self.repo_dir.name, resultats_tests, notes)
+
+        return {
+            "etudiant": self.repo_dir.name,
+            "commit": self.source.commit if self.source else commit_copie_travail(self.repo_dir),
+            "moteur": self.moteur,
+            "resultats": resultats_tests,
+            "notes": notes,
+            "cache": self.entree is not None,
+            "duree": round(time.monotonic() - self.debut, 3),
+            "temps": arrondir_temps(self.temps),
+            "sortie": self.tampon.getvalue()
+        }
+
+
+def corriger_depot(repo_dir, cache_dir=None, moteur="pytest", ref="HEAD"):
+    """
+    Corrige un dépôt et capture son rapport au lieu de l'afficher.
+
+    La sortie est retenue dans un tampon pour que les rapports de dépôts
+    corrigés en parallèle ne s'entremêlent pas dans le terminal.
+
+    Args:
+        repo_dir: Chemin vers le dépôt de l'étudiant
+        cache_dir: Dossier du cache des corrections (None = pas de cache)
+        moteur: Moteur d'exécution des tests (voir MOTEURS)
+        ref: Référence corrigée dans un dépôt git nu
+
+    Returns:
+        dict: Résultat de l'étudiant avec la sortie du rapport ("sortie")
+    """
+    correction = CorrectionDepot(repo_dir, cache_dir, ref, moteur)
+    resultats_tests = None
+    if correction.commencer():
+        resultats_tests = correction.executer()
+    return correction.terminer(resultats_tests)
+
+
+async def corriger_depot_async(repo_dir, semaphore, cache_dir=None, ref="HEAD"):
+    """
+    Corrige un dépôt dans la boucle asyncio (voir executer_tests_async).
+
+    Le sémaphore borne le nombre de dépôts corrigés (et donc de
+    sous-processus pytest) simultanément.
+
+    Args:
+        repo_dir: Chemin vers le dépôt de l'étudiant
+        semaphore: asyncio.Semaphore partagé par le lot
+        cache_dir: Dossier du cache des corrections (None = pas de cache)
+        ref: Référence corrigée dans un dépôt git nu
+
+    Returns:
+        dict: Résultat de l'étudiant avec la sortie du rapport ("sortie")
+    """
+    async with semaphore:
+        correction = CorrectionDepot(repo_dir, cache_dir, ref)
+        resultats_tests = None
+        if correction.commencer():
+            if correction.nu:
+                # Dépôt nu: moteur statique, sans sous-processus pytest
+                resultats_tests = correction.executer()
+            else:
+                correction.tampon.write(f"🔍 Exécution des tests sur: {repo_dir}\n")
+                resultats_tests = await executer_tests_async(repo_dir, correction.temps)
+        return correction.terminer(resultats_tests)
+
+
+def empreinte_depot(repo_dir, ref="HEAD"):
+    """
+    Calcule l'empreinte des fichiers corrigés d'un dépôt, nu ou non.
+
+    Args:
+        repo_dir: Chemin vers le dépôt de l'étudiant
+        ref: Référence corrigée dans un dépôt git nu
+
+    Returns:
+        str: Empreinte hexadécimale, ou None si le dépôt git est illisible
+    """
+    if not est_depot_nu(repo_dir):
+        return calculer_empreinte(repo_dir)
+    try:
+        return calculer_empreinte(repo_dir, SourceGit(repo_dir, ref))
+    except ErreurGit:
+        return None
+
+
+def regrouper_doublons(a_corriger, ref="HEAD"):
+    """
+    Regroupe les dépôts dont les fichiers corrigés sont identiques.
+
+    Args:
+        a_corriger: Liste de (position, chemin du dépôt)
+        ref: Référence corrigée dans les dépôts git nus
+
+    Returns:
+        list: Groupes de (position, chemin du dépôt), dans l'ordre de leur
+        premier dépôt; le premier dépôt de chaque groupe est corrigé pour
+        tout le groupe
+    """
+    groupes = {}
+    for i, repo_dir in a_corriger:
+        # Un dépôt illisible n'est regroupé avec aucun autre
+        cle = empreinte_depot(repo_dir, ref) or str(repo_dir)
+        groupes.setdefault(cle, []).append((i, repo_dir))
+    return list(groupes.values())
+
+
+def dupliquer_resultat(resultat, original, repo_dir, ref="HEAD"):
+    """
+    Reprend la correction d'un dépôt pour un dépôt identique.
+
+    Les chemins de l'original dans les messages des tests sont remplacés
+    par ceux du dépôt, et le rapport est produit au nom de l'étudiant.
+
+    Args:
+        resultat: Résultat complet de la correction de l'original
+        original: Chemin du dépôt corrigé
+        repo_dir: Chemin du dépôt identique
+        ref: Référence corrigée dans un dépôt git nu
+
+    Returns:
+        dict: Résultat de l'étudiant avec la sortie du rapport ("sortie")
+    """
+    debut = time.monotonic()
+    texte = json.dumps(resultat["resultats"])
+    resultats_tests = json.loads(texte.replace(json.dumps(str(original))[1:-1],
+                                               json.dumps(str(repo_dir))[1:-1]))
+
+    tampon = io.StringIO()
+    with contextlib.redirect_stdout(tampon):
+        afficher_entete(repo_dir)
+        print(f"👥 Soumission identique à {original.name}: résultats repris")
+        afficher_rapport(repo_dir.name, resultats_tests, resultat["notes"])
+
+    commit = None
+    if not est_depot_nu(repo_dir):
+        commit = commit_copie_travail(repo_dir)
+    else:
+        try:
+            commit = SourceGit(repo_dir, ref).commit
+        except ErreurGit:
+            pass
+
+    return {
+        "etudiant": repo_dir.name,
+        "commit": commit,
+        "moteur": resultat.get("moteur"),
+        "resultats": resultats_tests,
+        "notes": resultat["notes"],
+        "cache": resultat["cache"],
+        "doublon_de": original.name,
+        "duree": round(time.monotonic() - debut, 3),
+        "temps": {},
+        "sortie": tampon.getvalue()
+    }
+
+
+def arrondir_temps(temps):
+    """Arrondit les temps par phase à la milliseconde."""
+    return {
+        phase: {cle: round(valeur, 4) for cle, valeur in mesure.items()}
+        for phase, mesure in temps.items()
+    }
+
+
+def resumer_resultat(resultat):
+    """
+    Réduit le résultat d'un étudiant à un enregistrement compact.
+
+    Le rapport pytest complet (sorties, traces) est remplacé par l'issue de
+    chaque test, ce qui suffit pour les notes et les exports.
+
+    Args:
+        resultat: Résultat retourné par corriger_depot()
+
+    Returns:
+        dict: Enregistrement compact sérialisable en JSON
+    """
+    resultats_tests = resultat["resultats"]
+    enregistrement = {
+        "etudiant": resultat["etudiant"],
+        "commit": resultat.get("commit"),
+        "moteur": resultat.get("moteur"),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "summary": resultats_tests.get("summary", {}),
+        "tests": {
+            t["name"]: t["outcome"] for t in resultats_tests.get("tests", [])
+        },
+        "notes": resultat["notes"],
+        "duree": resultat.get("duree", 0),
+        "temps": resultat.get("temps", {}),
+        "cache": resultat.get("cache", False),
+    }
+    if "erreur" in resultats_tests:
+        enregistrement["erreur"] = resultats_tests["erreur"]
+    if "doublon_de" in resultat:
+        enregistrement["doublon_de"] = resultat["doublon_de"]
+    return enregistrement
+
+
+def ecrire_jsonl(fichier, enregistrement):
+    """
+    Ajoute un enregistrement au fichier JSONL et le vide immédiatement sur
+    disque, pour qu'un outil externe puisse suivre le fichier (tail -f).
+
+    Args:
+        fichier: Fichier ouvert en mode ajout
+        enregistrement: Dictionnaire sérialisable en JSON
+    """
+    fichier.write(json.dumps(enregistrement, ensure_ascii=False, separators=(",", ":")) + "\n")
+    fichier.flush()
+
+
+def lister_depots(batch_path):
+    """
+    Liste les dépôts d'étudiants d'un dossier, en ordre alphabétique.
+
+    Args:
+        batch_path: Dossier contenant les dépôts
+
+    Returns:
+        list: Chemins des dépôts (dossiers non cachés)
+    """
+    return sorted(
+        repo_dir for repo_dir in batch_path.iterdir()
+        if repo_dir.is_dir() and not repo_dir.name.startswith('.')
+    )
+
+
+async def corriger_lot_async(a_corriger, jobs, cache_dir, terminer, ref="HEAD"):
+    """
+    Corrige des dépôts depuis une seule boucle asyncio, au plus jobs à la fois.
+
+    La progression est affichée sur stderr à chaque dépôt terminé.
+
+    Args:
+        a_corriger: Liste de (position, chemin du dépôt)
+        jobs: Nombre maximal de sous-processus pytest simultanés
+        cache_dir: Dossier du cache des corrections (None = pas de cache)
+        terminer: Fonction appelée avec (position, résultat) à chaque dépôt
+        ref: Référence corrigée dans les dépôts git nus
+    """
+    semaphore = asyncio.Semaphore(jobs)
+    # Chaque sous-processus pytest est récolté par os.wait4 et compte son
+    # propre temps CPU: les enfants sont exclus des autres mesures
+    CPU_ENFANTS.set(False)
+
+    async def corriger(i, repo_dir):
+        return i, await corriger_depot_async(repo_dir, semaphore, cache_dir, ref)
+
+    taches = [asyncio.create_task(corriger(i, repo_dir)) for i, repo_dir in a_corriger]
+    try:
+        for n, tache in enumerate(asyncio.as_completed(taches), start=1):
+            i, resultat = await tache
+            print(f"[{n}/{len(taches)}] {resultat['etudiant']} ({resultat['duree']:.1f}s)",
+                  file=sys.stderr, flush=True)
+            terminer(i, resultat)
+    finally:
+        for tache in taches:
+            tache.cancel()
+        await asyncio.gather(*taches, return_exceptions=True)
+
+
+def nom_travailleur():
+    """Nom d'un travailleur de la file: poste et processus."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def travailler(chemin_file, cache_dir=None, attente=1.0):
+    """
+    Corrige les travaux d'une file jusqu'à ce qu'il n'en reste plus (--travailleur).
+
+    Le moteur, la référence et les limites de sortie et de délai sont ceux
+    publiés avec le lot, pour que tous les travailleurs corrigent de la
+    même façon. Tant que d'autres travailleurs ont des travaux en cours, le
+    travailleur attend: il reprendra ceux dont le bail expire.
+
+    Args:
+        chemin_file: Fichier SQLite de la file de travaux
+        cache_dir: Dossier du cache des corrections (None = pas de cache)
+        attente: Pause entre deux consultations d'une file sans travail
+            disponible, en secondes
+
+    Returns:
+        int: Nombre de dépôts corrigés par ce travailleur
+    """
+    nom = nom_travailleur()
+    corriges = 0
+    with FileTravaux(chemin_file) as file:
+        parametres = file.parametres()
+        moteur = parametres.get("moteur", "pytest")
+        ref = parametres.get("ref", "HEAD")
+        for variable in (VARIABLE_DELAI, VARIABLE_SORTIE):
+            if variable in parametres:
+                os.environ[variable] = str(parametres[variable])
+        if moteur == "chaud":
+            prechauffer_pytest()
+
+        while True:
+            travail = file.prendre(nom)
+            if travail is None:
+                if not file.restants():
+                    break
+                time.sleep(attente)
+                continue
+
+            id_travail, repo_dir = travail
+            try:
+                resultat = corriger_depot(repo_dir, cache_dir, moteur, ref)
+            except Exception as e:
+                file.liberer(id_travail, nom, f"{type(e).__name__}: {e}")
+                print(f"⚠️ {repo_dir.name}: {e}", file=sys.stderr, flush=True)
+                continue
+            if file.terminer(id_travail, nom, resultat):
+                corriges += 1
+                print(f"[{nom}] {resultat['etudiant']} ({resultat['duree']:.1f}s)",
+                      file=sys.stderr, flush=True)
+    return corriges
+
+
+def distribuer_lot(chemin_file, a_corriger, jobs, cache_dir, moteur="pytest", ref="HEAD", attente=0.5,
+                   attente_max=ATTENTE_TRAVAILLEURS):
+    """
+    Corrige des dépôts par la file de travaux partagée (--file-travaux).
+
+    Les dépôts sont publiés dans la file (ce qui remplace tout lot
+    précédent), puis jobs travailleurs locaux sont lancés; d'autres
+    travailleurs, sur ce poste ou un autre, peuvent s'y joindre à tout
+    moment (--travailleur). Un travail abandonné (voir
+    file_travaux.TENTATIVES_MAX) devient un résultat en erreur.
+
+    La file est surveillée ici aussi: un travail dont le dernier bail a
+    expiré est abandonné même si plus aucun travailleur ne la consulte, et
+    si aucun bail n'est en cours pendant attente_max secondes (aucun
+    travailleur), les travaux restants sont abandonnés.
+
+    Args:
+        chemin_file: Fichier SQLite de la file de travaux
+        a_corriger: Liste de (position, chemin du dépôt)
+        jobs: Nombre de travailleurs locaux (0 = aucun)
+        cache_dir: Dossier du cache des travailleurs locaux
+        moteur: Moteur d'exécution des tests (voir MOTEURS)
+        ref: Référence corrigée dans les dépôts git nus
+        attente: Pause entre deux consultations de la file, en secondes
+        attente_max: Attente sans aucun bail en cours avant d'abandonner
+            les travaux restants, en secondes
+
+    Yields:
+        tuple: (position, résultat), dans l'ordre où les travaux finissent
+    """
+    with FileTravaux(chemin_file) as file:
+        file.publier(a_corriger, {
+            "moteur": moteur,
+            "ref": ref,
+            VARIABLE_DELAI: delai_test(),
+            VARIABLE_SORTIE: sortie_max(),
+        })
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 0 else None
+        try:
+            travailleurs = [executor.submit(travailler, chemin_file, cache_dir) for _ in range(jobs)]
+            dernier = 0
+            activite = time.monotonic()
+            while True:
+                file.expirer()
+                restants = file.restants()
+                for ordre, position, repo_dir, resultat, erreur in file.finis(dernier):
+                    dernier = ordre
+                    if resultat is None:
+                        correction = CorrectionDepot(repo_dir, ref=ref, moteur=moteur)
+                        correction.commencer()
+                        resultat = correction.terminer({"erreur": f"Correction abandonnée: {erreur}"})
+                    yield position, resultat
+                if not restants:
+                    break
+                if file.baux():
+                    activite = time.monotonic()
+                elif time.monotonic() - activite > attente_max:
+                    file.abandonner(f"Aucun travailleur actif depuis {attente_max:g} s")
+                    continue
+                for travailleur in travailleurs:
+                    if travailleur.done() and travailleur.exception() is not None:
+                        raise travailleur.exception()
+                time.sleep(attente)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+
+def lire_checkpoint(chemin):
+    """
+    Lit le fichier de reprise d'une correction batch interrompue.
+
+    Une ligne incomplète (écriture interrompue) est ignorée.
+
+    Args:
+        chemin: Chemin du fichier de reprise (JSONL)
+
+    Returns:
+        dict: Enregistrements compacts par nom d'étudiant
+    """
+    termines = {}
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    enregistrement = json.loads(ligne)
+                except ValueError:
+                    continue
+                termines[enregistrement["etudiant"]] = enregistrement
+    except OSError:
+        pass
+    return termines
+
+
+def corriger_lot(depots, jobs=1, cache_dir=None, jsonl=None, conserver=True,
+                 checkpoint=None, reprendre=False, moteur="pytest", chronologie=None,
+                 asynchrone=False, durees=None, ref="HEAD", historique=None,
+                 doublons=None, rapports=(), silencieux=False, file_travaux=None):
+    """
+    Corrige une liste de dépôts, en parallèle si jobs > 1.
+
+    Les rapports sont affichés au fur et à mesure, dans l'ordre de la liste,
+    et chaque rapport est affiché d'un bloc. Chaque dépôt corrigé est ajouté
+    au fichier JSONL et au fichier de reprise dès qu'il est terminé, sans
+    attendre les autres.
+
+    Args:
+        depots: Liste des chemins de dépôts
+        jobs: Nombre de processus de correction simultanés
+        cache_dir: Dossier du cache des corrections (None = pas de cache)
+        jsonl: Chemin du fichier JSONL de résultats (None = pas de fichier)
+        conserver: Conserver les résultats en mémoire pour l'export
+        checkpoint: Chemin du fichier de reprise (None = pas de reprise)
+        reprendre: Sauter les dépôts déjà terminés dans le fichier de reprise
+        moteur: Moteur d'exécution des tests (voir MOTEURS)
+        chronologie: Dictionnaire à compléter avec la durée et les temps par
+            phase de chaque dépôt corrigé (optionnel)
+        asynchrone: Superviser les sous-processus pytest depuis une boucle
+            asyncio plutôt qu'avec un pool de processus (moteur pytest)
+        durees: Durées de la correction précédente de chaque dépôt; les
+            dépôts les plus longs sont lancés en premier et le dictionnaire
+            est mis à jour avec les nouvelles durées (optionnel)
+        ref: Référence corrigée dans les dépôts git nus
+        historique: Historique où ajouter chaque dépôt, y compris les
+            dépôts repris (optionnel)
+        doublons: Dictionnaire à compléter avec les groupes de dépôts
+            identiques (nom du dépôt corrigé → noms des autres); chaque groupe
+            n'est corrigé qu'une fois (None = corriger chaque dépôt)
+        rapports: Rapports (Markdown, HTML) où ajouter chaque étudiant, dans
+            l'ordre des dépôts
+        silencieux: Ne pas afficher les rapports des étudiants
+        file_travaux: Fichier de la file de travaux partagée; les dépôts y
+            sont publiés et corrigés par jobs travailleurs locaux et par
+            tout travailleur --travailleur (voir distribuer_lot)
+
+    Returns:
+        list: Résultats par étudiant, dans l'ordre de depots (vide si
+        conserver est False)
+    """
+    tous_resultats = []
+    corriger = functools.partial(corriger_depot, cache_dir=cache_dir, moteur=moteur, ref=ref)
+
+    termines = lire_checkpoint(checkpoint) if checkpoint and reprendre else {}
+    sinks = []
+    if jsonl:
+        sinks.append(open(jsonl, "a", encoding="utf-8"))
+    if checkpoint:
+        sinks.append(open(checkpoint, "a" if reprendre else "w", encoding="utf-8"))
+
+    # Résultats terminés en attente d'affichage, par position dans depots
+    en_attente = {}
+    prochain = 0
+    a_corriger = []
+    for i, repo_dir in enumerate(depots):
+        if repo_dir.name in termines:
+            resultat = dict(termines[repo_dir.name])
+            if historique is not None:
+                historique.ajouter(resultat)
+            resultat["sortie"] = f"⏭️ {repo_dir.name}: déjà corrigé (reprise)\n"
+            en_attente[i] = resultat
+        else:
+            a_corriger.append((i, repo_dir))
+
+    # Dépôts identiques à un autre dépôt, par position de ce dernier
+    copies = {}
+    if doublons is not None:
+        groupes = regrouper_doublons(a_corriger, ref)
+        a_corriger = [groupe[0] for groupe in groupes]
+        for (i, repo_dir), *autres in groupes:
+            if autres:
+                copies[i] = autres
+                doublons[repo_dir.name] = [autre.name for _, autre in autres]
+
+    if durees is not None:
+        a_corriger = ordonner_depots(a_corriger, durees)
+
+    def afficher_en_ordre():
+        # Afficher les résultats prêts, dans l'ordre des dépôts
+        nonlocal prochain
+        while prochain in en_attente:
+            resultat = en_attente.pop(prochain)
+            sortie = resultat.pop("sortie")
+            extrait = resultat.pop("extrait_sortie", None)
+            if not silencieux:
+                sys.stdout.write(sortie)
+                sys.stdout.flush()
+            if rapports:
+                summary = resultat.get("summary") or resultat.get("resultats", {}).get("summary", {})
+                issues = issues_tests(resultat)
+                for rapport in rapports:
+                    rapport.ajouter(resultat["etudiant"], summary, resultat["notes"], issues, extrait)
+            if conserver:
+                tous_resultats.append(resultat)
+            prochain += 1
+
+    def terminer(i, resultat):
+        # Les copies sont faites avant que le résultat soit compacté
+        identiques = [(j, dupliquer_resultat(resultat, depots[i], repo_dir, ref))
+                      for j, repo_dir in copies.pop(i, [])]
+        sortie = resultat.pop("sortie")
+        # L'extrait de la sortie de pytest va aux rapports, pas aux fichiers JSONL
+        extrait = resultat["resultats"].get("extrait_sortie")
+        if chronologie is not None:
+            chronologie[resultat["etudiant"]] = {
+                "duree": resultat["duree"],
+                "phases": resultat["temps"],
+            }
+        # Une correction tirée du cache ou copiée ne dit rien du temps des tests
+        if durees is not None and not resultat["cache"] and "doublon_de" not in resultat:
+            durees[resultat["etudiant"]] = resultat["duree"]
+        if historique is not None:
+            historique.ajouter(resultat)
+        # Avec un fichier de sortie, seul l'enregistrement compact reste en mémoire
+        if sinks:
+            resultat = resumer_resultat(resultat)
+            for sink in sinks:
+                ecrire_jsonl(sink, resultat)
+        resultat["sortie"] = sortie
+        resultat["extrait_sortie"] = extrait
+        en_attente[i] = resultat
+        afficher_en_ordre()
+        for j, copie in identiques:
+            terminer(j, copie)
+
+    try:
+        if file_travaux is not None:
+            for i, resultat in distribuer_lot(file_travaux, a_corriger, jobs, cache_dir, moteur, ref):
+                terminer(i, resultat)
+        elif asynchrone and moteur == "pytest":
+            asyncio.run(corriger_lot_async(a_corriger, jobs, cache_dir, terminer, ref))
+        elif jobs > 1 and len(a_corriger) > 1:
+            # Moteur chaud: chaque processus importe pytest une seule fois
+            initialiser = prechauffer_pytest if moteur == "chaud" else None
+            with ProcessPoolExecutor(max_workers=jobs, initializer=initialiser) as executor:
+                futures = {executor.submit(corriger, repo_dir): i for i, repo_dir in a_corriger}
+                for future in as_completed(futures):
+                    terminer(futures[future], future.result())
+        else:
+            if moteur == "chaud":
+                prechauffer_pytest()
+            for i, repo_dir in a_corriger:
+                terminer(i, corriger(repo_dir))
+
+        # Dépôts repris après le dernier dépôt corrigé
+        afficher_en_ordre()
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    return tous_resultats
+
+
+def lire_durees(chemin):
+    """
+    Lit les durées de correction de la dernière exécution, par étudiant.
+
+    Args:
+        chemin: Chemin du fichier JSON des durées
+
+    Returns:
+        dict: Durée en secondes par étudiant (vide si le fichier est absent
+        ou illisible)
+    """
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            durees = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return durees if isinstance(durees, dict) else {}
+
+
+def ecrire_durees(chemin, durees):
+    """
+    Enregistre les durées de correction par étudiant (écriture atomique).
+
+    Args:
+        chemin: Chemin du fichier JSON des durées
+        durees: Durée en secondes par étudiant
+    """
+    chemin = Path(chemin)
+    temporaire = chemin.with_name(f"{chemin.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporaire, "w", encoding="utf-8") as f:
+            json.dump(durees, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temporaire, chemin)
+    except OSError as e:
+        print(f"⚠️ Impossible d'enregistrer les durées: {e}")
+
+
+def ordonner_depots(a_corriger, durees):
+    """
+    Ordonne les dépôts du plus long au plus court à corriger (LPT).
+
+    Lancer les dépôts les plus longs en premier évite qu'un dépôt lent (ex.:
+    timeout) démarre en fin de lot et prolonge seul la correction. Un dépôt
+    jamais corrigé reçoit la durée médiane des autres.
+
+    Args:
+        a_corriger: Liste de (position, chemin du dépôt)
+        durees: Durée de la correction précédente, par étudiant
+
+    Returns:
+        list: a_corriger réordonnée
+    """
+    connues = sorted(durees[repo_dir.name] for _, repo_dir in a_corriger
+                     if repo_dir.name in durees)
+    if not connues:
+        return a_corriger
+    mediane = connues[len(connues) // 2]
+    # sorted est stable: à durée égale, l'ordre des dépôts est conservé
+    return sorted(a_corriger, key=lambda depot: -durees.get(depot[1].name, mediane))
+
+
+def statistiques_classe(etudiants_resultats):
+    """
+    Calcule les statistiques de classe d'une correction batch (numpy).
+
+    Args:
+        etudiants_resultats: Liste des résultats par étudiant
+
+    Returns:
+        dict: Statistiques (voir statistiques.calculer_statistiques), ou
+        None si numpy n'est pas installé
+    """
+    try:
+        from statistiques import calculer_statistiques
+    except ImportError as e:
+        print(f"⚠️ {e.name or 'numpy'} non installé. Installation: pip install numpy")
+        return None
+    return calculer_statistiques(etudiants_resultats, GRILLE)
+
+
+def afficher_tableau_lot(resultats, recents=(), batch_path=None, effacer=False):
+    """
+    Affiche le tableau de synthèse de la classe (mode --watch).
+
+    Args:
+        resultats: Résultats complets ou compacts, par nom d'étudiant
+        recents: Noms des étudiants recorrigés à la dernière mise à jour
+        batch_path: Dossier surveillé, rappelé au bas du tableau (optionnel)
+        effacer: Effacer le terminal avant d'afficher le tableau
+    """
+    codes = list(CONFIG["indicateurs"])
+    lignes = ["\033[2J\033[H" if effacer else "\n",
+              f"{'='*70}\n📋 SYNTHÈSE DE LA CLASSE ({len(resultats)} étudiants)\n{'='*70}\n",
+              f"   {'Étudiant':<34} {'Tests':>7} " + " ".join(f"{code[-1]:>5}" for code in codes)
+              + f" {'Finale':>7}\n"]
+    for nom in sorted(resultats):
+        resultat = resultats[nom]
+        summary = resultat.get("summary") or resultat.get("resultats", {}).get("summary", {})
+        erreur = resultat.get("erreur") or resultat.get("resultats", {}).get("erreur")
+        notes = resultat["notes"]
+        lignes.append(
+            f"{'🔄' if nom in recents else '  '} {nom:<34} "
+            f"{summary.get('passed', 0):>3}/{summary.get('total', 0):<3} "
+            + " ".join(f"{notes[code]['score']:>4.0f}%" for code in codes)
+            + f" {notes['finale']:>6.1f}%" + (" ⚠️" if erreur else "") + "\n"
+        )
+    if resultats:
+        moyenne = sum(r["notes"]["finale"] for r in resultats.values()) / len(resultats)
+        lignes.append(f"   {'Moyenne':<34} {'':>7} {'':>{6 * len(codes)}}{moyenne:>7.1f}%\n")
+    lignes.append(f"\n🕒 Mis à jour à {datetime.now().strftime('%H:%M:%S')}"
+                  f" — {len(recents)} dépôt(s) recorrigé(s)\n")
+    if batch_path is not None:
+        lignes.append(f"👀 Surveillance de {batch_path} (Ctrl-C pour arrêter)\n")
+    sys.stdout.write("".join(lignes))
+    sys.stdout.flush()
+
+
+def surveiller_lot(batch_path, resultats, corriger, ref="HEAD", historique=None, moteur=None):
+    """
+    Surveille le dossier batch et recorrige les dépôts modifiés (--watch).
+
+    Une rafale de modifications (git pull, copie) n'est traitée qu'une fois
+    terminée (voir surveillance.SurveillanceLot). Seuls les dépôts dont
+    l'empreinte des fichiers corrigés a changé sont recorrigés: un
+    événement sans effet sur la correction (journal git, fichier
+    temporaire) ne relance rien. Le tableau de synthèse est réaffiché après
+    chaque mise à jour; Ctrl-C arrête la surveillance.
+
+    Args:
+        batch_path: Dossier contenant les dépôts
+        resultats: Résultats de la correction initiale
+        corriger: Fonction qui corrige une liste de dépôts et retourne leurs
+            résultats (corriger_lot avec les options de la ligne de commande)
+        ref: Référence corrigée dans les dépôts git nus
+        historique: Historique où chaque mise à jour devient une exécution
+            (optionnel)
+        moteur: Moteur d'exécution des tests, noté dans l'historique
+
+    Returns:
+        list: Derniers résultats de chaque étudiant, en ordre alphabétique
+    """
+    derniers = {resultat["etudiant"]: resultat for resultat in resultats}
+    empreintes = {repo_dir.name: empreinte_depot(repo_dir, ref) for repo_dir in lister_depots(batch_path)}
+    effacer = sys.stdout.isatty()
+
+    with SurveillanceLot(batch_path) as surveillance:
+        afficher_tableau_lot(derniers, (), batch_path, effacer)
+        try:
+            while True:
+                modifies = []
+                for repo_dir in sorted(surveillance.attendre()):
+                    if not repo_dir.is_dir():
+                        # Dépôt retiré du dossier batch
+                        empreintes.pop(repo_dir.name, None)
+                        derniers.pop(repo_dir.name, None)
+                        continue
+                    empreinte = empreinte_depot(repo_dir, ref)
+                    if empreinte is None or empreinte != empreintes.get(repo_dir.name):
+                        empreintes[repo_dir.name] = empreinte
+                        modifies.append(repo_dir)
+                if not modifies:
+                    continue
+
+                if historique is not None:
+                    historique.commencer_execution(moteur, ref)
+                for resultat in corriger(modifies):
+                    derniers[resultat["etudiant"]] = resultat
+                afficher_tableau_lot(derniers, {repo_dir.name for repo_dir in modifies},
+                                     batch_path, effacer)
+        except KeyboardInterrupt:
+            print("\n⏹️ Surveillance arrêtée")
+
+    return [derniers[nom] for nom in sorted(derniers)]
+
+
+def afficher_doublons(doublons):
+    """
+    Affiche les groupes de soumissions identiques d'une correction batch.
+
+    Args:
+        doublons: Noms des dépôts identiques, par nom du dépôt corrigé
+    """
+    if not doublons:
+        return
+    print(f"\n{'='*70}")
+    print("👥 SOUMISSIONS IDENTIQUES (corrigées une seule fois)")
+    print('='*70)
+    for original, autres in sorted(doublons.items(), key=lambda groupe: (-len(groupe[1]), groupe[0])):
+        print(f"  {len(autres) + 1:>3} dépôts: {', '.join([original] + autres)}")
+    economises = sum(len(autres) for autres in doublons.values())
+    print(f"  → {economises} correction(s) évitée(s)")
+
+
+def afficher_similarite(groupes, fichier):
+    """
+    Affiche les groupes de scripts quasi identiques d'une correction batch.
+
+    Args:
+        groupes: Groupes retournés par similarite.indexer_depots()
+        fichier: Nom du script comparé
+    """
+    print(f"\n{'='*70}")
+    print(f"🔎 SCRIPTS SIMILAIRES ({fichier})")
+    print('='*70)
+    if not groupes:
+        print("  Aucun script quasi identique")
+        return
+    for groupe in groupes:
+        print(f"  {len(groupe['membres']):>3} dépôts ({groupe['similarite']:.0%}+): "
+              f"{', '.join(groupe['membres'])}")
+
+
+def resumer_temps(chronologie, temps_lot, nb_lents=5):
+    """
+    Agrège les temps par phase de tous les dépôts d'une correction batch.
+
+    Args:
+        chronologie: Durée et temps par phase de chaque dépôt
+        temps_lot: Temps par phase mesurés pour le lot (export, etc.)
+        nb_lents: Nombre de dépôts les plus lents à retenir
+
+    Returns:
+        dict: "phases" (totaux, moyenne et max par phase), "plus_lents",
+        "depots" (détail par dépôt)
+    """
+    phases = {}
+    for temps in [t["phases"] for t in chronologie.values()] + [temps_lot]:
+        for phase, mesure in temps.items():
+            agregat = phases.setdefault(phase, {"mur": 0.0, "cpu": 0.0, "n": 0, "max": 0.0})
+            agregat["mur"] += mesure["mur"]
+            agregat["cpu"] += mesure["cpu"]
+            agregat["n"] += 1
+            agregat["max"] = max(agregat["max"], mesure["mur"])
+
+    plus_lents = sorted(chronologie.items(), key=lambda e: e[1]["duree"], reverse=True)[:nb_lents]
+    return {
+        "phases": arrondir_temps(phases),
+        "plus_lents": [{"etudiant": nom, "duree": t["duree"]} for nom, t in plus_lents],
+        "depots": chronologie,
+    }
+
+
+def afficher_temps(resume):
+    """
+    Affiche le tableau des temps par phase et les dépôts les plus lents.
+
+    Args:
+        resume: Résumé retourné par resumer_temps()
+    """
+    print("\n" + "-"*70)
+    print("⏱️ TEMPS PAR PHASE")
+    print("-"*70)
+    print(f"{'Phase':<20}{'Mur total':>12}{'CPU total':>12}{'Moyenne':>12}{'Max':>12}")
+    for phase, mesure in sorted(resume["phases"].items(), key=lambda e: -e[1]["mur"]):
+        moyenne = mesure["mur"] / mesure["n"] if mesure["n"] else 0
+        print(f"{phase:<20}{mesure['mur']:>11.2f}s{mesure['cpu']:>11.2f}s"
+              f"{moyenne:>11.3f}s{mesure['max']:>11.3f}s")
+
+    if resume["plus_lents"]:
+        print("\nDépôts les plus lents:")
+        for depot in resume["plus_lents"]:
+            print(f"  {depot['etudiant']:<40}{depot['duree']:>8.2f}s")
+
+
 def main():
     """
     Fonction principale du script de correction.
     """
     parser = argparse.ArgumentParser(description="Script de correction pour F1")
     parser.add_argument("repo", help="Chemin vers le dépôt de l'étudiant")
-    parser.add_argument("--export", help="Chemin pour exporter les résultats en Excel")
+    parser.add_argument("--export", help="Chemin pour exporter les résultats (Excel, CSV ou Parquet)")
+    parser.add_argument("--format", choices=["xlsx", "csv", "parquet"],
+                        help="Format d'export (défaut: selon l'extension de --export)")
     parser.add_argument("--batch", help="Traiter tous les dépôts dans le dossier spécifié")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Nombre de dépôts corrigés en parallèle en mode batch (défaut: nombre de CPU)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recorriger tous les dépôts sans utiliser le cache")
+    parser.add_argument("--cache-dir", default=str(CACHE_DOSSIER),
+                        help=f"Dossier du cache des corrections (défaut: {CACHE_DOSSIER})")
+    parser.add_argument("--cache-age-max", type=float, default=CACHE_AGE_MAX_JOURS,
+                        help="Âge maximal d'une entrée du cache, en jours")
+    parser.add_argument("--cache-taille-max", type=float, default=CACHE_TAILLE_MAX_MO,
+                        help="Taille maximale du cache, en Mo")
+    parser.add_argument("--jsonl", help="Fichier JSONL où ajouter un enregistrement par dépôt corrigé")
+    parser.add_argument("--checkpoint",
+                        help="Fichier de reprise (défaut: propre au dossier batch, dans le dossier du cache)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reprendre une correction batch interrompue en sautant les dépôts terminés")
+    parser.add_argument("--statique", action="store_true",
+                        help="Évaluer les jalons directement en Python, sans lancer pytest par dépôt")
+    parser.add_argument("--prechauffe", action="store_true",
+                        help="Exécuter pytest dans des processus préchauffés (fork) plutôt qu'à froid")
+    parser.add_argument("--temps", help="Fichier JSON où écrire les temps par phase et par dépôt")
+    parser.add_argument("--async", dest="asynchrone", action="store_true",
+                        help="Superviser les sous-processus pytest depuis une boucle asyncio (--jobs simultanés)")
+    parser.add_argument("--ref", default="HEAD",
+                        help="Référence corrigée dans les dépôts git nus (défaut: HEAD)")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Corriger chaque dépôt, même identique à un autre dépôt du lot")
+    parser.add_argument("--similarite", nargs="?", const="test_bmp280.py", metavar="FICHIER",
+                        help="Regrouper les dépôts dont le script est quasi identique (défaut: test_bmp280.py)")
+    parser.add_argument("--seuil-similarite", type=float, default=SEUIL_SIMILARITE,
+                        help=f"Similarité minimale d'un regroupement, entre 0 et 1 (défaut: {SEUIL_SIMILARITE})")
+    parser.add_argument("--stats", action="store_true",
+                        help="Afficher les statistiques de classe du lot (nécessite numpy)")
+    parser.add_argument("--stats-json", help="Fichier JSON où écrire les statistiques de classe")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Ne pas afficher le rapport de chaque étudiant en mode batch")
+    parser.add_argument("--markdown", metavar="DOSSIER",
+                        help="Écrire le rapport Markdown de chaque étudiant dans ce dossier")
+    parser.add_argument("--html", metavar="FICHIER",
+                        help="Écrire un rapport HTML de toute la classe")
+    parser.add_argument("--delai-test", type=float, default=DELAI_TEST,
+                        help=f"Délai de chaque test en secondes; les tests terminés avant un "
+                             f"timeout sont conservés (défaut: {DELAI_TEST}, 0 = aucun)")
+    parser.add_argument("--sortie-max", type=int, default=SORTIE_MAX_LIGNES, metavar="LIGNES",
+                        help=f"Lignes de sortie pytest conservées pour le rapport, moitié au début "
+                             f"et moitié à la fin (défaut: {SORTIE_MAX_LIGNES})")
+    parser.add_argument("--watch", action="store_true",
+                        help="Après la correction, surveiller le dossier batch et recorriger les "
+                             "dépôts modifiés (synthèse mise à jour, Ctrl-C pour arrêter)")
+    parser.add_argument("--file-travaux", metavar="FICHIER",
+                        help="Publier les dépôts dans cette file de travaux (SQLite) et les faire "
+                             "corriger par --jobs travailleurs locaux et par les travailleurs "
+                             "d'autres postes (voir file_travaux.py)")
+    parser.add_argument("--travailleur", metavar="FICHIER",
+                        help="Corriger les travaux de cette file jusqu'à ce qu'elle soit vide")
+    parser.add_argument("--historique",
+                        help="Base SQLite où ajouter cette correction (voir historique.py)")
+    parser.add_argument("--durees",
+                        help="Fichier des durées de correction par dépôt, pour lancer les plus longs "
+                             "en premier (défaut: propre au dossier batch, dans le dossier du cache)")
 
     args = parser.parse_args()
+    if args.asynchrone and (args.statique or args.prechauffe):
+        parser.error("--async supervise des sous-processus pytest à froid: "
+                     "incompatible avec --statique et --prechauffe")
+    if args.asynchrone and args.file_travaux:
+        parser.error("--async est incompatible avec --file-travaux (corrigé par les travailleurs)")
+
+    # Hérité par les processus de correction et les sous-processus pytest
+    os.environ[VARIABLE_DELAI] = str(args.delai_test)
+    os.environ[VARIABLE_SORTIE] = str(args.sortie_max)
+
+    moteur = "pytest"
+    if args.statique:
+        moteur = "statique"
+    elif args.prechauffe:
+        moteur = "chaud"
+
+    # Mode travailleur: corriger les travaux d'une file partagée
+    if args.travailleur:
+        cache_dir = None if args.no_cache else Path(args.cache_dir)
+        corriges = travailler(args.travailleur, cache_dir)
+        print(f"✅ {corriges} dépôt(s) corrigé(s) par {nom_travailleur()}")
 
     # Mode batch: traiter plusieurs dépôts
-    if args.batch:
-        tous_resultats = []
+    elif args.batch:
         batch_path = Path(args.batch)
 
-        for repo_dir in batch_path.iterdir():
-            if repo_dir.is_dir() and not repo_dir.name.startswith('.'):
-                print(f"\n{'='*70}")
-                print(f"Traitement de: {repo_dir.name}")
-                print('='*70)
-
-                resultats_tests = executer_tests(repo_dir)
-                notes = calculer_notes(resultats_tests)
-
-                tous_resultats.append({
-                    "etudiant": repo_dir.name,
-                    "resultats": resultats_tests,
-                    "notes": notes
-                })
-
-                afficher_rapport(repo_dir.name, resultats_tests, notes)
+        cache_dir = None
+        if not args.no_cache:
+            cache_dir = Path(args.cache_dir)
+            nettoyer_cache(cache_dir, args.cache_age_max, args.cache_taille_max)
+
+        # Rien n'est écrit dans le dossier corrigé
+        checkpoint = (Path(args.checkpoint) if args.checkpoint
+                      else fichier_lot(args.cache_dir, batch_path, "checkpoint.jsonl"))
+        fichier_durees = (Path(args.durees) if args.durees
+                          else fichier_lot(args.cache_dir, batch_path, "durees.json"))
+        durees = lire_durees(fichier_durees)
+        chronologie = {}
+        temps_lot = {}
+        doublons = None if args.no_dedup else {}
+
+        rapports = []
+        if args.markdown:
+            rapports.append(RapportsMarkdown(GABARITS, args.markdown))
+        if args.html:
+            rapports.append(RapportHTML(GABARITS, args.html))
+
+        historique = None
+        if args.historique:
+            historique = Historique(args.historique)
+            historique.commencer_execution(moteur, args.ref)
+
+        options = dict(jobs=max(0 if args.file_travaux else 1, args.jobs), cache_dir=cache_dir,
+                       jsonl=args.jsonl, moteur=moteur, asynchrone=args.asynchrone, durees=durees,
+                       ref=args.ref, historique=historique, file_travaux=args.file_travaux)
+        try:
+            tous_resultats = corriger_lot(lister_depots(batch_path),
+                                          conserver=bool(args.export or args.stats or args.stats_json
+                                                         or args.watch),
+                                          checkpoint=checkpoint, reprendre=args.resume,
+                                          chronologie=chronologie, doublons=doublons,
+                                          rapports=rapports, silencieux=args.quiet, **options)
+            if args.watch:
+                # Le rapport HTML de classe n'est écrit qu'une fois; les
+                # rapports Markdown suivent chaque dépôt recorrigé
+                recorriger = functools.partial(
+                    corriger_lot, silencieux=True, **options,
+                    rapports=[r for r in rapports if isinstance(r, RapportsMarkdown)])
+                tous_resultats = surveiller_lot(batch_path, tous_resultats, recorriger,
+                                                args.ref, historique, moteur)
+        finally:
+            if historique is not None:
+                historique.fermer()
+            for rapport in rapports:
+                rapport.fermer()
+        if args.markdown:
+            print(f"✅ Rapports Markdown écrits dans: {args.markdown}")
+        if args.html:
+            print(f"✅ Rapport HTML de la classe: {args.html}")
+        ecrire_durees(fichier_durees, durees)
 
         # Exporter si demandé
         if args.export:
-            exporter_excel(tous_resultats, args.export)
+            with mesurer(temps_lot, "export"):
+                exporter_resultats(tous_resultats, args.export, args.format)
+
+        if args.stats or args.stats_json:
+            with mesurer(temps_lot, "statistiques"):
+                statistiques = statistiques_classe(tous_resultats)
+            if statistiques is not None:
+                from statistiques import afficher_statistiques
+                afficher_statistiques(statistiques)
+                if args.stats_json:
+                    with open(args.stats_json, "w", encoding="utf-8") as f:
+                        json.dump(statistiques, f, ensure_ascii=False, indent=2)
+                    print(f"✅ Statistiques exportées vers: {args.stats_json}")
+
+        afficher_doublons(doublons)
+        if args.similarite:
+            with mesurer(temps_lot, "similarite"):
+                groupes = indexer_depots(lister_depots(batch_path), args.similarite,
+                                         args.ref, args.seuil_similarite)
+            afficher_similarite(groupes, args.similarite)
+        resume_temps = resumer_temps(chronologie, temps_lot)
+        afficher_temps(resume_temps)
+        if args.temps:
+            with open(args.temps, "w", encoding="utf-8") as f:
+                json.dump(resume_temps, f, ensure_ascii=False, indent=2)
+            print(f"✅ Temps exportés vers: {args.temps}")
 
     # Mode single: un seul dépôt
     else:
@@ -404,7 +2335,15 @@ def main():
             sys.exit(1)
 
         etudiant = repo_path.name
-        resultats_tests = executer_tests(repo_path)
+        if est_depot_nu(repo_path):
+            try:
+                resultats_tests = executer_statique(repo_path, source=SourceGit(repo_path, args.ref))
+            except ErreurGit as e:
+                resultats_tests = {"erreur": f"Dépôt git illisible: {e}"}
+        else:
+            if moteur == "chaud":
+                prechauffer_pytest()
+            resultats_tests = MOTEURS[moteur](repo_path)
         notes = calculer_notes(resultats_tests)
 
         afficher_rapport(etudiant, resultats_tests, notes)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Lecture des fichiers corrigés directement dans les objets git
+
+Les dépôts des étudiants peuvent être conservés en miroirs nus (bare):
+plutôt que d'extraire une copie de travail pour chaque dépôt, les fichiers
+lus par les jalons (test_bmp280.py, test_neoslider.py, .test_markers/, ...)
+sont demandés en un seul appel à `git cat-file --batch`.
+
+SourceGit offre les mêmes méthodes que grading_engine.FileSource et
+alimente donc le moteur statique sans aucune extraction:
+    source = SourceGit(Path("../miroirs/du-pierre-julien-f1.git"), "main")
+    resultats = grade_repo(Path("../miroirs/du-pierre-julien-f1.git"), source)
+"""
+
+import subprocess
+from pathlib import Path
+
+# Chemins demandés à git pour chaque dépôt (fichiers des jalons et de l'empreinte)
+CHEMINS_GIT = [
+    "test_bmp280.py",
+    "test_neoslider.py",
+    "requirements.txt",
+    ".test_markers",
+    ".test_markers/test_summary.txt",
+    "tests",
+]
+
+
+class ErreurGit(Exception):
+    """Dépôt ou référence git illisible."""
+
+
+def est_depot_nu(chemin):
+    """
+    Indique si un dossier est un dépôt git nu (sans copie de travail).
+
+    Args:
+        chemin: Chemin du dossier
+
+    Returns:
+        bool: True pour un dépôt nu (ex.: miroir etudiant.git)
+    """
+    chemin = Path(chemin)
+    return ((chemin / "HEAD").is_file()
+            and (chemin / "objects").is_dir()
+            and (chemin / "refs").is_dir())
+
+
+def commit_copie_travail(repo_dir):
+    """
+    Identifiant du commit extrait (HEAD) d'une copie de travail.
+
+    Les fichiers de git sont lus directement (HEAD, refs/, packed-refs),
+    sans lancer de processus git.
+
+    Args:
+        repo_dir: Chemin de la copie de travail
+
+    Returns:
+        str: Identifiant du commit, ou None si le dossier n'est pas un dépôt
+        git ou n'a aucun commit
+    """
+    git_dir = Path(repo_dir) / ".git"
+    try:
+        if git_dir.is_file():
+            # Worktree ou sous-module: ".git" contient "gitdir: <chemin>"
+            contenu = git_dir.read_text().strip()
+            if not contenu.startswith("gitdir:"):
+                return None
+            git_dir = Path(repo_dir) / contenu[len("gitdir:"):].strip()
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+
+    if not head.startswith("ref:"):
+        return head or None  # HEAD détachée
+    ref = head[len("ref:"):].strip()
+
+    # Les références d'un worktree sont dans le dépôt commun
+    try:
+        git_dir = git_dir / (git_dir / "commondir").read_text().strip()
+    except OSError:
+        pass
+    try:
+        return (git_dir / ref).read_text().strip()
+    except OSError:
+        pass
+    try:
+        for ligne in (git_dir / "packed-refs").read_text().splitlines():
+            if ligne.endswith(f" {ref}"):
+                return ligne.split()[0]
+    except OSError:
+        pass
+    return None
+
+
+def lire_objets(git_dir, noms):
+    """
+    Lit plusieurs objets git en un seul appel à `git cat-file --batch`.
+
+    Args:
+        git_dir: Chemin du dépôt git
+        noms: Noms d'objets (ex.: "HEAD:test_bmp280.py")
+
+    Returns:
+        dict: (identifiant, type, contenu en octets) par nom, ou None si
+        l'objet n'existe pas
+
+    Raises:
+        ErreurGit: Si git est introuvable, échoue ou produit une sortie
+            tronquée ou inattendue
+    """
+    try:
+        processus = subprocess.run(
+            ["git", "--git-dir", str(git_dir), "cat-file", "--batch"],
+            input="".join(f"{nom}\n" for nom in noms).encode(),
+            capture_output=True,
+            timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise ErreurGit(f"git cat-file impossible: {e}")
+    if processus.returncode != 0:
+        raise ErreurGit(processus.stderr.decode(errors="replace").strip() or "git cat-file a échoué")
+
+    sortie = processus.stdout
+    objets = {}
+    position = 0
+    try:
+        for nom in noms:
+            fin = sortie.index(b"\n", position)
+            entete = sortie[position:fin].decode(errors="replace").split()
+            position = fin + 1
+            # "<nom> missing" (ou "ambiguous") pour un objet introuvable
+            if len(entete) != 3 or entete[-1] in ("missing", "ambiguous"):
+                objets[nom] = None
+                continue
+            identifiant, type_objet, taille = entete[0], entete[1], int(entete[2])
+            contenu = sortie[position:position + taille]
+            if len(contenu) != taille or sortie[position + taille:position + taille + 1] != b"\n":
+                raise ValueError(f"objet {nom} tronqué")
+            objets[nom] = (identifiant, type_objet, contenu)
+            position += taille + 1
+    except ValueError as e:
+        raise ErreurGit(f"Sortie inattendue de git cat-file: {e}")
+    return objets
+
+
+def lister_arbre(contenu, taille_id):
+    """
+    Décode un objet arbre git (format binaire de `cat-file --batch`).
+
+    Args:
+        contenu: Contenu brut de l'arbre
+        taille_id: Taille en octets d'un identifiant (20 en SHA-1, 32 en SHA-256)
+
+    Returns:
+        list: Noms des entrées, dans l'ordre de l'arbre
+
+    Raises:
+        ErreurGit: Si l'arbre est tronqué
+    """
+    noms = []
+    position = 0
+    while position < len(contenu):
+        try:
+            espace = contenu.index(b" ", position)
+            nul = contenu.index(b"\0", espace)
+        except ValueError:
+            raise ErreurGit("Arbre git tronqué")
+        noms.append(contenu[espace + 1:nul].decode(errors="replace"))
+        position = nul + 1 + taille_id
+    if position != len(contenu):
+        raise ErreurGit("Arbre git tronqué")
+    return noms
+
+
+class SourceGit:
+    """
+    Fichiers corrigés d'un dépôt lus à une référence git, sans extraction.
+
+    Tous les objets sont lus à la construction, en un seul appel à git, et
+    les dossiers y sont décodés: un objet illisible lève ErreurGit ici.
+
+    Attributes:
+        commit: Identifiant du commit corrigé
+
+    Args:
+        git_dir: Chemin du dépôt git (nu ou non)
+        ref: Référence à corriger (branche, tag ou commit)
+        chemins: Chemins lus en plus de CHEMINS_GIT (ex.: le script comparé
+            par --similarite)
+
+    Raises:
+        ErreurGit: Si le dépôt, la référence ou un objet est illisible
+    """
+
+    def __init__(self, git_dir, ref="HEAD", chemins=()):
+        self.git_dir = Path(git_dir)
+        self.ref = ref
+        chemins = list(dict.fromkeys([*CHEMINS_GIT, *chemins]))
+        commit = f"{ref}^{{commit}}"
+        objets = lire_objets(self.git_dir, [commit] + [f"{ref}:{chemin}" for chemin in chemins])
+        if objets[commit] is None:
+            raise ErreurGit(f"Référence introuvable: {ref}")
+        self.commit = objets[commit][0]
+        self.objets = {chemin: objets[f"{ref}:{chemin}"] for chemin in chemins}
+        self.dossiers = {
+            chemin: lister_arbre(objet[2], len(objet[0]) // 2)
+            for chemin, objet in self.objets.items()
+            if objet is not None and objet[1] == "tree"
+        }
+
+    def read_text(self, name):
+        """Texte d'un fichier, ou None s'il n'existe pas."""
+        objet = self.objets.get(name)
+        if objet is None or objet[1] != "blob":
+            return None
+        return objet[2].decode(errors="replace")
+
+    def list_dir(self, name):
+        """Noms des entrées d'un dossier ([] si ce n'est pas un dossier), ou None s'il n'existe pas."""
+        objet = self.objets.get(name)
+        if objet is None:
+            return None
+        return self.dossiers.get(name, [])
+
+    def identifiants(self):
+        """
+        Identifiants des objets lus, par chemin.
+
+        Un objet git étant adressé par son contenu, ces identifiants suffisent
+        à l'empreinte du cache (un dossier est couvert par l'identifiant de
+        son arbre).
+
+        Returns:
+            list: (chemin, identifiant) pour chaque chemin existant
+        """
+        return [(chemin, objet[0]) for chemin, objet in self.objets.items() if objet is not None]
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+File de travaux de correction partagée dans une base SQLite
+
+La correction batch (--file-travaux) publie un travail par dépôt dans la
+file; des travailleurs (--travailleur), sur le même poste ou sur d'autres
+postes qui partagent le dossier de la file, prennent les travaux un à un
+et y déposent leurs résultats, que la correction batch reprend dans son
+rapport et ses exports.
+
+Un travail pris est loué pour DUREE_BAIL secondes: si son travailleur
+disparaît (poste éteint, processus tué), le bail expire et un autre
+travailleur le reprend, au plus TENTATIVES_MAX fois.
+
+La base reste en mode de journal DELETE (pas WAL, dont la mémoire
+partagée ne fonctionne pas sur un dossier réseau); chaque prise de travail
+est une transaction IMMEDIATE, sérialisée par le verrou de SQLite.
+
+Usage:
+    python3 correction.py . --batch ../etudiants --file-travaux file.db --jobs 4
+    python3 correction.py . --travailleur /partage/file.db
+    python3 file_travaux.py file.db etat
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+# Durée d'un bail, en secondes: bien au-delà du délai de 60 s d'un dépôt
+DUREE_BAIL = 300
+
+# Prises d'un même travail avant de l'abandonner
+TENTATIVES_MAX = 3
+
+# Attente d'un verrou de la base, en secondes
+DELAI_VERROU = 60
+
+# Attente sans aucun bail en cours avant d'abandonner les travaux restants
+# d'un lot (aucun travailleur ne s'est présenté), en secondes
+ATTENTE_TRAVAILLEURS = DUREE_BAIL
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parametres (
+    cle TEXT PRIMARY KEY,
+    valeur TEXT
+);
+CREATE TABLE IF NOT EXISTS travaux (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    depot TEXT NOT NULL,
+    etat TEXT NOT NULL DEFAULT 'en_attente',
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    travailleur TEXT,
+    bail REAL,
+    ordre INTEGER,
+    resultat TEXT,
+    erreur TEXT
+);
+CREATE INDEX IF NOT EXISTS travaux_etat ON travaux (etat, position);
+CREATE INDEX IF NOT EXISTS travaux_ordre ON travaux (ordre);
+"""
+
+# États d'un travail
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINE = "termine"
+ABANDONNE = "abandonne"
+
+
+class FileTravaux:
+    """
+    File de travaux de correction (base SQLite partagée).
+
+    Les chemins des dépôts sont enregistrés relativement au dossier de la
+    base, pour rester valides sur un poste où le partage est monté ailleurs.
+
+    Args:
+        chemin: Chemin du fichier SQLite (créé au besoin)
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        self.dossier = self.chemin.resolve().parent
+        self.connexion = sqlite3.connect(chemin, timeout=DELAI_VERROU, isolation_level=None)
+        self.connexion.execute("PRAGMA journal_mode=DELETE")
+        self.connexion.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        """Ferme la base."""
+        self.connexion.close()
+
+    def _transaction(self):
+        # Transaction d'écriture: le verrou est pris dès le BEGIN
+        self.connexion.execute("BEGIN IMMEDIATE")
+        return self.connexion
+
+    def _enregistrer_depot(self, depot):
+        # Chemin relatif au dossier de la base si le dépôt s'y trouve
+        depot = Path(depot).resolve()
+        if depot.is_relative_to(self.dossier):
+            return depot.relative_to(self.dossier).as_posix()
+        return str(depot)
+
+    def _chemin_depot(self, depot):
+        return self.dossier / depot
+
+    def publier(self, depots, parametres=None):
+        """
+        Remplace le contenu de la file par un nouveau lot de travaux.
+
+        Args:
+            depots: Liste de (position, chemin du dépôt), dans l'ordre où
+                les travaux doivent être pris
+            parametres: Paramètres de correction communs à tous les
+                travailleurs (moteur, ref, ...), sérialisables en JSON
+        """
+        connexion = self._transaction()
+        try:
+            connexion.execute("DELETE FROM travaux")
+            connexion.execute("DELETE FROM parametres")
+            connexion.executemany(
+                "INSERT INTO parametres VALUES (?, ?)",
+                [(cle, json.dumps(valeur)) for cle, valeur in (parametres or {}).items()]
+            )
+            connexion.executemany(
+                "INSERT INTO travaux (id, position, depot) VALUES (?, ?, ?)",
+                [(rang, position, self._enregistrer_depot(depot))
+                 for rang, (position, depot) in enumerate(depots, start=1)]
+            )
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+
+    def parametres(self):
+        """
+        Paramètres de correction publiés avec le lot.
+
+        Returns:
+            dict: Paramètres par nom
+        """
+        return {cle: json.loads(valeur)
+                for cle, valeur in self.connexion.execute("SELECT cle, valeur FROM parametres")}
+
+    def _abandonner_expires(self, connexion, maintenant):
+        # Un bail expiré sans tentative restante abandonne son travail
+        connexion.execute(
+            "UPDATE travaux SET etat = ?, erreur = ?, ordre = "
+            "(SELECT COALESCE(MAX(ordre), 0) FROM travaux) + 1 "
+            "WHERE etat = ? AND bail < ? AND tentatives >= ?",
+            (ABANDONNE, f"Abandonné après {TENTATIVES_MAX} tentative(s) sans résultat",
+             EN_COURS, maintenant, TENTATIVES_MAX)
+        )
+
+    def expirer(self):
+        """
+        Abandonne les travaux dont le dernier bail possible a expiré.
+
+        prendre() le fait aussi; la correction batch l'appelle pour que ces
+        travaux finissent même si aucun travailleur ne consulte plus la file.
+        """
+        connexion = self._transaction()
+        try:
+            self._abandonner_expires(connexion, time.time())
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+
+    def abandonner(self, erreur):
+        """
+        Abandonne tous les travaux en attente ou en cours.
+
+        Args:
+            erreur: Message enregistré pour chacun de ces travaux
+        """
+        connexion = self._transaction()
+        try:
+            connexion.execute(
+                "UPDATE travaux SET etat = ?, erreur = ?, bail = NULL, "
+                "ordre = (SELECT COALESCE(MAX(ordre), 0) FROM travaux) + id "
+                "WHERE etat IN (?, ?)",
+                (ABANDONNE, erreur, EN_ATTENTE, EN_COURS)
+            )
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+
+    def prendre(self, travailleur, duree_bail=DUREE_BAIL):
+        """
+        Prend le prochain travail en attente, ou dont le bail a expiré.
+
+        Args:
+            travailleur: Nom du travailleur (poste et processus)
+            duree_bail: Durée du bail, en secondes
+
+        Returns:
+            tuple: (identifiant du travail, chemin du dépôt), ou None si
+            aucun travail n'est disponible
+        """
+        maintenant = time.time()
+        connexion = self._transaction()
+        try:
+            self._abandonner_expires(connexion, maintenant)
+            ligne = connexion.execute(
+                "SELECT id, depot FROM travaux "
+                "WHERE etat = ? OR (etat = ? AND bail < ? AND tentatives < ?) "
+                "ORDER BY etat = ?, id LIMIT 1",
+                (EN_ATTENTE, EN_COURS, maintenant, TENTATIVES_MAX, EN_COURS)
+            ).fetchone()
+            if ligne is not None:
+                connexion.execute(
+                    "UPDATE travaux SET etat = ?, travailleur = ?, bail = ?, "
+                    "tentatives = tentatives + 1 WHERE id = ?",
+                    (EN_COURS, travailleur, maintenant + duree_bail, ligne[0])
+                )
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+        if ligne is None:
+            return None
+        return ligne[0], self._chemin_depot(ligne[1])
+
+    def terminer(self, travail, travailleur, resultat):
+        """
+        Dépose le résultat d'un travail.
+
+        Le résultat est ignoré si le travail a été repris par un autre
+        travailleur après l'expiration du bail.
+
+        Args:
+            travail: Identifiant du travail
+            travailleur: Nom du travailleur qui l'a pris
+            resultat: Résultat sérialisable en JSON
+
+        Returns:
+            bool: True si le résultat a été retenu
+        """
+        connexion = self._transaction()
+        try:
+            curseur = connexion.execute(
+                "UPDATE travaux SET etat = ?, resultat = ?, bail = NULL, "
+                "ordre = (SELECT COALESCE(MAX(ordre), 0) FROM travaux) + 1 "
+                "WHERE id = ? AND etat = ? AND travailleur = ?",
+                (TERMINE, json.dumps(resultat, ensure_ascii=False), travail, EN_COURS, travailleur)
+            )
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+        return curseur.rowcount == 1
+
+    def liberer(self, travail, travailleur, erreur):
+        """
+        Rend un travail qui a échoué; il sera repris s'il reste des tentatives.
+
+        Args:
+            travail: Identifiant du travail
+            travailleur: Nom du travailleur qui l'a pris
+            erreur: Message de l'échec
+        """
+        connexion = self._transaction()
+        try:
+            connexion.execute(
+                "UPDATE travaux SET etat = CASE WHEN tentatives >= ? THEN ? ELSE ? END, "
+                "erreur = ?, bail = NULL, travailleur = NULL, "
+                "ordre = CASE WHEN tentatives >= ? "
+                "THEN (SELECT COALESCE(MAX(ordre), 0) FROM travaux) + 1 END "
+                "WHERE id = ? AND etat = ? AND travailleur = ?",
+                (TENTATIVES_MAX, ABANDONNE, EN_ATTENTE, erreur, TENTATIVES_MAX,
+                 travail, EN_COURS, travailleur)
+            )
+            connexion.execute("COMMIT")
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+
+    def etat(self):
+        """
+        Compte les travaux par état.
+
+        Returns:
+            dict: Nombre de travaux par état
+        """
+        return dict(self.connexion.execute("SELECT etat, COUNT(*) FROM travaux GROUP BY etat"))
+
+    def baux(self):
+        """Nombre de travaux en cours dont le bail n'a pas expiré."""
+        return self.connexion.execute(
+            "SELECT COUNT(*) FROM travaux WHERE etat = ? AND bail >= ?", (EN_COURS, time.time())
+        ).fetchone()[0]
+
+    def restants(self):
+        """Nombre de travaux en attente ou en cours."""
+        return self.connexion.execute(
+            "SELECT COUNT(*) FROM travaux WHERE etat IN (?, ?)", (EN_ATTENTE, EN_COURS)
+        ).fetchone()[0]
+
+    def finis(self, apres=0):
+        """
+        Travaux finis (terminés ou abandonnés), dans l'ordre où ils l'ont été.
+
+        Args:
+            apres: Rang de fin déjà lu; seuls les travaux finis ensuite
+                sont retournés
+
+        Returns:
+            list: (rang de fin, position, chemin du dépôt, résultat ou None,
+            erreur)
+        """
+        return [
+            (ordre, position, self._chemin_depot(depot),
+             json.loads(resultat) if resultat is not None else None, erreur)
+            for ordre, position, depot, resultat, erreur in self.connexion.execute(
+                "SELECT ordre, position, depot, resultat, erreur FROM travaux "
+                "WHERE ordre > ? ORDER BY ordre", (apres,))
+        ]
+
+
+def main():
+    """
+    Affiche l'état d'une file de travaux.
+    """
+    parser = argparse.ArgumentParser(description="File de travaux de correction F1")
+    parser.add_argument("base", help="Fichier SQLite de la file")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+    commandes.add_parser("etat", help="Nombre de travaux par état")
+    commandes.add_parser("abandonnes", help="Travaux abandonnés et leur dernière erreur")
+    args = parser.parse_args()
+
+    with FileTravaux(args.base) as file:
+        if args.commande == "etat":
+            etat = file.etat()
+            for nom in (EN_ATTENTE, EN_COURS, TERMINE, ABANDONNE):
+                print(f"{nom:<12} {etat.get(nom, 0):>5}")
+
+        elif args.commande == "abandonnes":
+            for _, _, depot, resultat, erreur in file.finis():
+                if resultat is None:
+                    print(f"❌ {depot}: {erreur}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
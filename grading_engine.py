@@ -0,0 +1,891 @@
+#!/usr/bin/env python3
+"""
+Static grading engine for Formatif F1
+=====================================
+
+Every milestone check in tests/test_milestone_0{1,2,3}.py is a static
+inspection of the student's files (test_bmp280.py, test_neoslider.py and
+.test_markers/). This module holds those checks so they can be evaluated
+either by pytest (the milestone tests are thin wrappers) or directly
+in-process by correction.py, without starting pytest for every repository.
+
+Each student file is read, parsed and walked once into a fact index
+(RepoFacts); the checks only query that index. Files are read from the
+working tree by default, or from any other source with the same two
+methods as FileSource (see depot_git.SourceGit for bare repositories).
+
+Each check declares the inputs it reads (test_bmp280.py, test_neoslider.py
+or .test_markers/). Given the results of a previous grading of the same
+repository, grade_repo() only re-evaluates the checks whose inputs
+changed and keeps the previous outcome of the others; an unchanged script
+is then not even parsed.
+
+Usage:
+    from grading_engine import grade_repo
+    results = grade_repo(Path("../etudiants/du-pierre-julien-f1"))
+    results = grade_repo(Path("../etudiants/du-pierre-julien-f1"), previous=results)
+"""
+
+import ast
+import re
+import time
+import hashlib
+from fnmatch import fnmatchcase
+from functools import cached_property
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+class CheckFailed(Exception):
+    """Raised by a check when the student's work does not meet it."""
+
+
+class CheckSkipped(Exception):
+    """Raised by a check that does not apply to the student's work."""
+
+
+def fail(message):
+    raise CheckFailed(message)
+
+
+def skip(message):
+    raise CheckSkipped(message)
+
+
+# ---------------------------------------------------------------------------
+# Fact index
+# ---------------------------------------------------------------------------
+# PEP 723 inline script metadata block
+PEP723_REGEX = re.compile(
+    r"(?m)^# /// (?P<type>[a-zA-Z0-9-]+)$\s(?P<content>(^#(| .*)$\s)+)^# ///$"
+)
+
+# Facts approximated from the source text when it does not parse:
+# (substring, fact set, entry)
+TEXT_FACTS = (
+    ("import board", "imports", "board"),
+    ("from board", "imports", "board"),
+    ("adafruit_bmp280", "imports", "adafruit_bmp280"),
+    ("adafruit_seesaw", "imports", "adafruit_seesaw"),
+    ("board.I2C()", "calls", "board.I2C"),
+    ("busio.I2C", "calls", "busio.I2C"),
+    ("board.SCL", "reads", "board.SCL"),
+    ("BMP280_I2C", "calls", "adafruit_bmp280.Adafruit_BMP280_I2C"),
+    (".temperature", "attributes", "temperature"),
+    (".pressure", "attributes", "pressure"),
+    (".altitude", "attributes", "altitude"),
+    ("def main(", "functions", "main"),
+)
+
+
+def dotted_name(node):
+    """Return "a.b.c" for a Name/Attribute chain, or None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+class ScriptFacts:
+    """
+    Facts about one student script, computed in a single read, parse and
+    AST walk.
+
+    A script with a syntax error has no AST: its facts are then
+    approximated from the source text (see TEXT_FACTS), so that its other
+    checks still reflect what the student wrote.
+
+    Attributes:
+        path: Path of the script
+        exists: Whether the file exists
+        syntax_error: SyntaxError raised by ast.parse, or None
+        imports: Imported modules and their top-level packages
+            ("board", "adafruit_seesaw.seesaw", "adafruit_seesaw", ...)
+        calls: Dotted names of called functions ("board.I2C", ...)
+        reads: Dotted names of attribute chains read ("board.SCL", ...)
+        attributes: Attribute names read anywhere ("temperature", ...)
+        functions: Names of defined functions
+        try_blocks: Number of try statements
+        except_handlers: Number of except clauses
+        has_main_guard: Whether an `if __name__ == "__main__":` is present
+        module_docstring: Module docstring, or None
+        docstring_count: Number of module, class and function docstrings
+        comment_marks: Number of "#" characters in the source
+        script_metadata: Parsed PEP 723 "script" block ({} if it cannot be
+            parsed), or None
+    """
+
+    def __init__(self, path, content):
+        self.path = path
+        self.exists = content is not None
+        self.syntax_error = None
+        self.imports = set()
+        self.calls = set()
+        self.reads = set()
+        self.attributes = set()
+        self.functions = set()
+        self.try_blocks = 0
+        self.except_handlers = 0
+        self.has_main_guard = False
+        self.module_docstring = None
+        self.docstring_count = 0
+        self.comment_marks = 0
+        self.script_metadata = None
+
+        if not self.exists:
+            return
+
+        self.comment_marks = content.count("#")
+        self.script_metadata = self._parse_metadata(content)
+
+        try:
+            tree = ast.parse(content)
+        except SyntaxError as e:
+            self.syntax_error = e
+            self._approximate(content)
+            return
+        self._walk(tree)
+
+    def mentions(self, word):
+        """Whether an attribute name read or called contains word, ignoring case."""
+        word = word.lower()
+        return any(word in name.lower() for name in self.attributes)
+
+    @staticmethod
+    def _parse_metadata(content):
+        match = next(
+            (m for m in PEP723_REGEX.finditer(content) if m.group("type") == "script"),
+            None,
+        )
+        if match is None:
+            return None
+        toml = "".join(
+            line[2:] if line.startswith("# ") else line[1:]
+            for line in match.group("content").splitlines(keepends=True)
+        )
+        if tomllib is None:
+            return {}
+        try:
+            return tomllib.loads(toml)
+        except tomllib.TOMLDecodeError:
+            return {}
+
+    def _walk(self, tree):
+        self.module_docstring = ast.get_docstring(tree)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.imports.update((alias.name, alias.name.split(".")[0]))
+            elif isinstance(node, ast.ImportFrom):
+                if node.module and not node.level:
+                    self.imports.update((node.module, node.module.split(".")[0]))
+            elif isinstance(node, ast.Call):
+                name = dotted_name(node.func)
+                if name:
+                    self.calls.add(name)
+            elif isinstance(node, ast.Attribute):
+                self.attributes.add(node.attr)
+                name = dotted_name(node)
+                if name:
+                    self.reads.add(name)
+            elif isinstance(node, ast.Try):
+                self.try_blocks += 1
+                self.except_handlers += len(node.handlers)
+            elif isinstance(node, ast.If):
+                test = node.test
+                if (isinstance(test, ast.Compare)
+                        and isinstance(test.left, ast.Name)
+                        and test.left.id == "__name__"
+                        and any(isinstance(c, ast.Constant) and c.value == "__main__"
+                                for c in test.comparators)):
+                    self.has_main_guard = True
+
+            if isinstance(node, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    self.functions.add(node.name)
+                if ast.get_docstring(node) is not None:
+                    self.docstring_count += 1
+
+    def _approximate(self, content):
+        for needle, facts, entry in TEXT_FACTS:
+            if needle in content:
+                getattr(self, facts).add(entry)
+        if "try:" in content and "except" in content:
+            self.try_blocks = self.except_handlers = 1
+        self.has_main_guard = "__name__" in content and "__main__" in content
+        if '"""' in content or "'''" in content:
+            self.docstring_count = 1
+
+
+class MarkerFacts:
+    """
+    Facts about the .test_markers/ directory, listed once.
+
+    Attributes:
+        path: Path of the directory
+        exists: Whether the directory exists
+        names: Entry names, in directory order
+        summary: Lowercased test_summary.txt, or None
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        names = source.list_dir(".test_markers")
+        self.exists = names is not None
+        self.names = names or []
+        self.summary = None
+
+        if "test_summary.txt" in self.names:
+            self.summary = source.read_text(".test_markers/test_summary.txt").lower()
+
+    def matching(self, pattern):
+        """Entry names matching a glob pattern, like Path.glob()."""
+        return [name for name in self.names if fnmatchcase(name, pattern)]
+
+
+class FileSource:
+    """
+    Reads the graded files of a repository from its working tree.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def read_text(self, name):
+        """Text of a file, or None if it does not exist.
+
+        Undecodable bytes are replaced, as in depot_git.SourceGit: a stray
+        latin-1 byte fails the student's checks, not the whole batch.
+        """
+        path = self.root / name
+        return path.read_text(encoding="utf-8", errors="replace") if path.exists() else None
+
+    def list_dir(self, name):
+        """Entry names of a directory ([] if not a directory), or None if missing."""
+        path = self.root / name
+        if not path.exists():
+            return None
+        return [entry.name for entry in path.iterdir()] if path.is_dir() else []
+
+
+class CachedSource:
+    """
+    Wraps a source so that each file or directory is read only once.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._texts = {}
+        self._dirs = {}
+
+    def read_text(self, name):
+        """Text of a file, or None if it does not exist."""
+        if name not in self._texts:
+            self._texts[name] = self.source.read_text(name)
+        return self._texts[name]
+
+    def list_dir(self, name):
+        """Entry names of a directory ([] if not a directory), or None if missing."""
+        if name not in self._dirs:
+            self._dirs[name] = self.source.list_dir(name)
+        return self._dirs[name]
+
+
+class RepoFacts:
+    """
+    Fact index of a student repository, shared by every check.
+
+    Each file is read and analyzed the first time a check asks for it.
+
+    Args:
+        repo_root: Path to the student's repository
+        source: Where the files are read from (default: FileSource(repo_root))
+    """
+
+    def __init__(self, repo_root, source=None):
+        self.root = Path(repo_root)
+        if source is None:
+            source = FileSource(self.root)
+        self.source = source
+
+    @cached_property
+    def bmp280(self):
+        return ScriptFacts(self.root / BMP280, self.source.read_text(BMP280))
+
+    @cached_property
+    def neoslider(self):
+        return ScriptFacts(self.root / NEOSLIDER, self.source.read_text(NEOSLIDER))
+
+    @cached_property
+    def markers(self):
+        return MarkerFacts(self.root / MARKERS, self.source)
+
+
+# ---------------------------------------------------------------------------
+# Check inputs
+# ---------------------------------------------------------------------------
+# Files and directories read by the checks, relative to the repository root
+BMP280 = "test_bmp280.py"
+NEOSLIDER = "test_neoslider.py"
+MARKERS = ".test_markers"
+INPUTS = (BMP280, NEOSLIDER, MARKERS)
+
+# Outcomes kept from a previous grading are only valid for the same checks
+ENGINE_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def input_digests(source):
+    """
+    Digest each check input, as the checks see it.
+
+    A script is digested from its text; .test_markers/ from its entry names
+    and test_summary.txt, the only marker file whose content is read.
+
+    Args:
+        source: Where the files are read from
+
+    Returns:
+        dict: Hexadecimal digest per input (see INPUTS)
+    """
+    digests = {}
+    for name in INPUTS:
+        h = hashlib.sha256()
+        if name == MARKERS:
+            entries = source.list_dir(MARKERS)
+            if entries is not None:
+                h.update(b"dir\0" + "\0".join(sorted(entries)).encode())
+                if "test_summary.txt" in entries:
+                    h.update(b"\0summary\0" + source.read_text(f"{MARKERS}/test_summary.txt").encode())
+        else:
+            text = source.read_text(name)
+            if text is not None:
+                h.update(b"file\0" + text.encode())
+        digests[name] = h.hexdigest()
+    return digests
+
+
+# ---------------------------------------------------------------------------
+# Milestone 1: Environment Setup
+# ---------------------------------------------------------------------------
+def check_bmp280_script_exists(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        fail(
+            f"\n\n"
+            f"Expected: test_bmp280.py file in repository root\n"
+            f"Actual: File not found at {script.path}\n\n"
+            f"Suggestion: Create test_bmp280.py with your BMP280 sensor reading code.\n"
+            f"You can start from modele/test_bmp280.py if you haven't already.\n"
+        )
+
+
+def check_bmp280_script_syntax(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found - skipping syntax check")
+
+    e = script.syntax_error
+    if e is not None:
+        fail(
+            f"\n\n"
+            f"Expected: Valid Python syntax\n"
+            f"Actual: SyntaxError on line {e.lineno}: {e.msg}\n\n"
+            f"Suggestion: Check line {e.lineno} for:\n"
+            f"  - Missing colons after 'if', 'for', 'def', 'class'\n"
+            f"  - Unbalanced parentheses, brackets, or quotes\n"
+            f"  - Incorrect indentation\n"
+            f"\n"
+            f"Run locally: python3 -m py_compile test_bmp280.py\n"
+        )
+
+
+def check_bmp280_imports(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found - skipping import check")
+
+    missing_imports = []
+
+    if "board" not in script.imports:
+        missing_imports.append("board")
+
+    if "adafruit_bmp280" not in script.imports:
+        missing_imports.append("adafruit_bmp280")
+
+    if missing_imports:
+        fail(
+            f"\n\n"
+            f"Expected: Required imports for BMP280 sensor\n"
+            f"Actual: Missing imports: {', '.join(missing_imports)}\n\n"
+            f"Suggestion: Add these imports at the top of test_bmp280.py:\n"
+            f"  import board\n"
+            f"  import adafruit_bmp280\n"
+        )
+
+
+def check_uv_dependencies(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found - skipping UV check")
+
+    has_uv_block = script.script_metadata is not None
+
+    if not has_uv_block:
+        fail(
+            f"\n\n"
+            f"Expected: UV inline script metadata for dependency management\n"
+            f"Actual: No UV script block found\n\n"
+            f"Suggestion: Add this block at the top of your script:\n"
+            f"  # /// script\n"
+            f"  # requires-python = \">=3.9\"\n"
+            f"  # dependencies = [\"adafruit-circuitpython-bmp280\", \"adafruit-blinka\"]\n"
+            f"  # ///\n"
+            f"\n"
+            f"This allows running with: uv run test_bmp280.py\n"
+        )
+
+
+def check_local_tests_executed(facts):
+    markers = facts.markers
+
+    if not markers.exists:
+        fail(
+            f"\n\n"
+            f"Expected: .test_markers/ directory with local test results\n"
+            f"Actual: Directory not found\n\n"
+            f"Suggestion: Run local hardware validation on your Raspberry Pi:\n"
+            f"  python3 validate_pi.py\n"
+            f"\n"
+            f"Then add the markers to git:\n"
+            f"  git add .test_markers/\n"
+            f"  git commit -m \"feat: validation locale executee\"\n"
+            f"  git push\n"
+        )
+
+    # Check for at least one marker file
+    marker_files = markers.matching("*.txt")
+
+    if not marker_files:
+        fail(
+            f"\n\n"
+            f"Expected: At least one marker file in .test_markers/\n"
+            f"Actual: Directory exists but is empty\n\n"
+            f"Suggestion: Run local tests again:\n"
+            f"  python3 validate_pi.py\n"
+            f"Make sure the script completes successfully.\n"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Milestone 2: Basic Functionality
+# ---------------------------------------------------------------------------
+def check_i2c_initialization(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    # Check for I2C initialization patterns
+    has_i2c = any([
+        "board.I2C" in script.calls,
+        "busio.I2C" in script.calls,
+        "board.SCL" in script.reads,
+    ])
+
+    if not has_i2c:
+        fail(
+            f"\n\n"
+            f"Expected: I2C bus initialization\n"
+            f"Actual: No I2C initialization found\n\n"
+            f"Suggestion: Add I2C initialization in your code:\n"
+            f"  import board\n"
+            f"  i2c = board.I2C()  # Uses board.SCL and board.SDA\n"
+            f"\n"
+            f"The BMP280 communicates via I2C protocol.\n"
+        )
+
+
+def check_bmp280_sensor_creation(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    # Check for sensor creation patterns
+    has_sensor = any(
+        name.endswith("BMP280_I2C") or name.startswith("adafruit_bmp280.")
+        for name in script.calls
+    )
+
+    if not has_sensor:
+        fail(
+            f"\n\n"
+            f"Expected: BMP280 sensor object creation\n"
+            f"Actual: No BMP280 sensor initialization found\n\n"
+            f"Suggestion: Create the sensor object:\n"
+            f"  import adafruit_bmp280\n"
+            f"  sensor = adafruit_bmp280.Adafruit_BMP280_I2C(i2c)\n"
+            f"\n"
+            f"If your sensor is at address 0x77 (not 0x76):\n"
+            f"  sensor = adafruit_bmp280.Adafruit_BMP280_I2C(i2c, address=0x77)\n"
+        )
+
+
+def check_temperature_reading(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    has_temp = script.mentions("temperature")
+
+    if not has_temp:
+        fail(
+            f"\n\n"
+            f"Expected: Temperature reading from sensor\n"
+            f"Actual: No temperature reading found\n\n"
+            f"Suggestion: Read temperature like this:\n"
+            f"  temperature = sensor.temperature\n"
+            f"  print(f\"Temperature: {{temperature:.1f}} C\")\n"
+        )
+
+
+def check_pressure_reading(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    has_pressure = script.mentions("pressure")
+
+    if not has_pressure:
+        fail(
+            f"\n\n"
+            f"Expected: Pressure reading from sensor\n"
+            f"Actual: No pressure reading found\n\n"
+            f"Suggestion: Read pressure like this:\n"
+            f"  pressure = sensor.pressure\n"
+            f"  print(f\"Pressure: {{pressure:.1f}} hPa\")\n"
+            f"\n"
+            f"The BMP280 measures atmospheric pressure in hectopascals (hPa).\n"
+        )
+
+
+def check_hardware_markers_present(facts):
+    markers = facts.markers
+
+    if not markers.exists:
+        skip("No .test_markers/ directory - skipping hardware check")
+
+    # Look for BMP280-specific markers
+    bmp_markers = markers.matching("*bmp*") + markers.matching("*i2c*")
+
+    # Also check the general test summary
+    if markers.summary is not None:
+        if "bmp280" in markers.summary or "i2c" in markers.summary:
+            return  # Pass - hardware was validated
+
+    if not bmp_markers:
+        fail(
+            f"\n\n"
+            f"Expected: BMP280/I2C hardware validation markers\n"
+            f"Actual: No hardware-specific markers found\n\n"
+            f"Suggestion: On your Raspberry Pi:\n"
+            f"  1. Connect the BMP280 sensor to I2C pins\n"
+            f"  2. Run: sudo i2cdetect -y 1\n"
+            f"  3. Verify address 0x76 or 0x77 appears\n"
+            f"  4. Run: python3 validate_pi.py\n"
+            f"  5. Commit and push .test_markers/\n"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Milestone 3: Complete Implementation
+# ---------------------------------------------------------------------------
+def check_main_function_exists(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    has_main = "main" in script.functions
+    has_guard = script.has_main_guard
+
+    if not has_main:
+        fail(
+            f"\n\n"
+            f"Expected: A main() function for code organization\n"
+            f"Actual: No main() function found\n\n"
+            f"Suggestion: Organize your code with a main function:\n"
+            f"  def main():\n"
+            f"      i2c = board.I2C()\n"
+            f"      sensor = adafruit_bmp280.Adafruit_BMP280_I2C(i2c)\n"
+            f"      print(f\"Temperature: {{sensor.temperature:.1f}} C\")\n"
+            f"\n"
+            f"  if __name__ == \"__main__\":\n"
+            f"      main()\n"
+        )
+
+    if not has_guard:
+        fail(
+            f"\n\n"
+            f"Expected: __name__ == \"__main__\" guard\n"
+            f"Actual: No __main__ guard found\n\n"
+            f"Suggestion: Add at the end of your script:\n"
+            f"  if __name__ == \"__main__\":\n"
+            f"      main()\n"
+            f"\n"
+            f"This ensures main() only runs when script is executed directly.\n"
+        )
+
+
+def check_error_handling(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    if not script.except_handlers:
+        fail(
+            f"\n\n"
+            f"Expected: Error handling with try/except blocks\n"
+            f"Actual: No error handling found\n\n"
+            f"Suggestion: Add error handling for robustness:\n"
+            f"  try:\n"
+            f"      i2c = board.I2C()\n"
+            f"      sensor = adafruit_bmp280.Adafruit_BMP280_I2C(i2c)\n"
+            f"      print(f\"Temperature: {{sensor.temperature:.1f}} C\")\n"
+            f"  except Exception as e:\n"
+            f"      print(f\"Error reading sensor: {{e}}\")\n"
+            f"      print(\"Check: I2C enabled? Sensor connected? Correct address?\")\n"
+        )
+
+
+def check_altitude_reading(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    has_altitude = "altitude" in script.attributes
+
+    if not has_altitude:
+        # This is optional - just a warning, not a failure
+        skip(
+            "Altitude reading not found - this is optional but recommended"
+        )
+
+
+def check_all_local_tests_passed(facts):
+    markers = facts.markers
+
+    if not markers.exists:
+        fail(
+            f"\n\n"
+            f"Expected: .test_markers/ directory\n"
+            f"Actual: Directory not found\n\n"
+            f"Suggestion: Run validate_pi.py on your Raspberry Pi.\n"
+        )
+
+    if "all_tests_passed.txt" in markers.names:
+        return  # All good!
+
+    # Check which markers we have
+    existing_markers = markers.matching("*.txt")
+
+    if "bmp280_script_verified.txt" in markers.names and "ssh_key_verified.txt" in markers.names:
+        # Core markers exist, close enough
+        return
+
+    fail(
+        f"\n\n"
+        f"Expected: all_tests_passed.txt marker (or core markers)\n"
+        f"Actual: Found markers: {existing_markers}\n\n"
+        f"Suggestion: Ensure all local tests pass:\n"
+        f"  python3 validate_pi.py\n"
+        f"\n"
+        f"If tests fail, fix the issues and run again.\n"
+        f"Then commit and push the .test_markers/ folder.\n"
+    )
+
+
+def check_neoslider_script(facts):
+    script = facts.neoslider
+
+    if not script.exists:
+        skip(
+            "test_neoslider.py not found - this is optional bonus content"
+        )
+
+    e = script.syntax_error
+    if e is not None:
+        fail(
+            f"\n\n"
+            f"Expected: Valid Python syntax in test_neoslider.py\n"
+            f"Actual: SyntaxError on line {e.lineno}\n\n"
+            f"Suggestion: Fix the syntax error and try again.\n"
+        )
+
+    # Check for required imports
+    if "adafruit_seesaw" not in script.imports:
+        fail(
+            f"\n\n"
+            f"Expected: adafruit_seesaw import for NeoSlider\n"
+            f"Actual: Import not found\n\n"
+            f"Suggestion: Add this import:\n"
+            f"  from adafruit_seesaw.seesaw import Seesaw\n"
+            f"  from adafruit_seesaw import neopixel\n"
+        )
+
+
+def check_code_quality(facts):
+    script = facts.bmp280
+
+    if not script.exists:
+        skip("test_bmp280.py not found")
+
+    # Check for docstring or comments
+    has_docstring = script.docstring_count > 0
+    has_comments = script.comment_marks >= 3  # At least 3 comment lines
+
+    if not (has_docstring or has_comments):
+        fail(
+            f"\n\n"
+            f"Expected: Documentation (docstrings or comments)\n"
+            f"Actual: Minimal documentation found\n\n"
+            f"Suggestion: Add documentation to explain your code:\n"
+            f"  \"\"\"Script to read BMP280 temperature and pressure.\"\"\"\n"
+            f"\n"
+            f"  # Initialize I2C bus\n"
+            f"  i2c = board.I2C()\n"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Check registry, in pytest collection order, with the inputs of each check
+# ---------------------------------------------------------------------------
+CHECKS = [
+    ("tests/test_milestone_01.py", "test_bmp280_script_exists", check_bmp280_script_exists, (BMP280,)),
+    ("tests/test_milestone_01.py", "test_bmp280_script_syntax", check_bmp280_script_syntax, (BMP280,)),
+    ("tests/test_milestone_01.py", "test_bmp280_imports", check_bmp280_imports, (BMP280,)),
+    ("tests/test_milestone_01.py", "test_uv_dependencies", check_uv_dependencies, (BMP280,)),
+    ("tests/test_milestone_01.py", "test_local_tests_executed", check_local_tests_executed, (MARKERS,)),
+    ("tests/test_milestone_02.py", "test_i2c_initialization", check_i2c_initialization, (BMP280,)),
+    ("tests/test_milestone_02.py", "test_bmp280_sensor_creation", check_bmp280_sensor_creation, (BMP280,)),
+    ("tests/test_milestone_02.py", "test_temperature_reading", check_temperature_reading, (BMP280,)),
+    ("tests/test_milestone_02.py", "test_pressure_reading", check_pressure_reading, (BMP280,)),
+    ("tests/test_milestone_02.py", "test_hardware_markers_present", check_hardware_markers_present, (MARKERS,)),
+    ("tests/test_milestone_03.py", "test_main_function_exists", check_main_function_exists, (BMP280,)),
+    ("tests/test_milestone_03.py", "test_error_handling", check_error_handling, (BMP280,)),
+    ("tests/test_milestone_03.py", "test_altitude_reading", check_altitude_reading, (BMP280,)),
+    ("tests/test_milestone_03.py", "test_all_local_tests_passed", check_all_local_tests_passed, (MARKERS,)),
+    ("tests/test_milestone_03.py", "test_neoslider_script", check_neoslider_script, (NEOSLIDER,)),
+    ("tests/test_milestone_03.py", "test_code_quality", check_code_quality, (BMP280,)),
+]
+
+
+def run_check(check, facts):
+    """
+    Evaluate a single check against a repository's fact index.
+
+    Returns:
+        tuple: (outcome, message) where outcome is "passed", "failed" or "skipped"
+    """
+    try:
+        check(facts)
+    except CheckFailed as e:
+        return "failed", str(e)
+    except CheckSkipped as e:
+        return "skipped", str(e)
+    return "passed", ""
+
+
+def assert_check(check, facts):
+    """
+    Evaluate a check inside a pytest test, translating its outcome.
+    """
+    import pytest
+
+    __tracebackhide__ = True
+
+    # Outside the except blocks, so pytest reports no chained traceback
+    outcome, message = run_check(check, facts)
+    if outcome == "failed":
+        pytest.fail(message)
+    elif outcome == "skipped":
+        pytest.skip(message)
+
+
+def grade_repo(repo_root, source=None, previous=None):
+    """
+    Evaluate every milestone check on a repository, in-process.
+
+    Args:
+        repo_root: Path to the student's repository
+        source: Where the files are read from (default: the working tree)
+        previous: Results of a previous grade_repo() on the same repository;
+            a check whose inputs have the same digests keeps its previous
+            outcome instead of being evaluated again (optional)
+
+    Returns:
+        dict: Results in the same shape as the pytest report read by
+        correction.py ("summary" and "tests" with "name" and "outcome"),
+        plus the digests of the inputs ("inputs") and the engine version
+        ("engine") for the next regrade; reused outcomes are marked
+        "reused"
+    """
+    start = time.perf_counter()
+    if source is None:
+        source = FileSource(repo_root)
+    source = CachedSource(source)
+    digests = input_digests(source)
+    facts = RepoFacts(repo_root, source)
+
+    # Previous outcomes are comparable only from the same engine
+    previous_digests = {}
+    previous_tests = {}
+    if previous and previous.get("engine") == ENGINE_VERSION:
+        previous_digests = previous.get("inputs", {})
+        previous_tests = {t["name"]: t for t in previous.get("tests", [])}
+
+    summary = {"total": 0, "passed": 0, "failed": 0, "skipped": 0}
+    tests = []
+
+    for test_file, name, check, inputs in CHECKS:
+        check_start = time.perf_counter()
+        prior = previous_tests.get(name)
+        reused = prior is not None and all(
+            previous_digests.get(input_name) == digests[input_name] for input_name in inputs
+        )
+        if reused:
+            outcome, message = prior["outcome"], prior.get("message", "")
+        else:
+            outcome, message = run_check(check, facts)
+        summary["total"] += 1
+        summary[outcome] += 1
+        test = {
+            "nodeid": f"{test_file}::{name}",
+            "name": name,
+            "outcome": outcome,
+            "message": message,
+            "duration": time.perf_counter() - check_start,
+        }
+        if reused:
+            test["reused"] = True
+        tests.append(test)
+
+    summary["duration"] = time.perf_counter() - start
+    return {"summary": summary, "tests": tests, "inputs": digests, "engine": ENGINE_VERSION}
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Grille d'évaluation déclarative compilée en tables de correspondance
+
+Chaque indicateur de CONFIG (correction.py) déclare ses critères: un
+critère rapporte ses points si l'un de ses tests est réussi. La grille est
+compilée une seule fois:
+
+- chaque test reçoit un bit;
+- chaque critère devient un masque (les bits de ses tests) et ses points.
+
+Noter un étudiant revient alors à construire le masque de ses tests
+réussis, puis, par indicateur, à faire le produit scalaire des points des
+critères par leur satisfaction (masque & critère). Le niveau et la
+rétroaction ne dépendent que du score: ils sont calculés une fois par score
+rencontré. Pour une classe entière, noter_matrice() fait le même calcul par
+produits matriciels (numpy).
+"""
+
+
+class GrilleCompilee:
+    """
+    Grille d'évaluation compilée.
+
+    Args:
+        indicateurs: Indicateurs de CONFIG, avec "ponderation" (en %) et
+            "criteres" (liste de {"points": ..., "tests": [...]})
+        determiner_niveau: Fonction score → niveau
+        generer_retroaction: Fonction (indicateur, score) → message
+    """
+
+    def __init__(self, indicateurs, determiner_niveau, generer_retroaction):
+        self.codes = list(indicateurs)
+        self.ponderations = [indicateurs[code]["ponderation"] / 100 for code in self.codes]
+        self.determiner_niveau = determiner_niveau
+        self.generer_retroaction = generer_retroaction
+        # Bit de chaque test
+        self.bits = {}
+        # Par indicateur: (masque, points) de chaque critère
+        self.poids = []
+        # Critères à plat: (position de l'indicateur, points, tests)
+        self.criteres = []
+
+        for position, code in enumerate(self.codes):
+            criteres = indicateurs[code]["criteres"]
+            poids = []
+            for critere in criteres:
+                masque = 0
+                for test in critere["tests"]:
+                    masque |= self.bits.setdefault(test, 1 << len(self.bits))
+                poids.append((masque, critere["points"]))
+            self.poids.append(poids)
+            self.criteres.extend((position, critere["points"], critere["tests"]) for critere in criteres)
+
+        # Par indicateur: note (score, niveau, rétroaction) de chaque score rencontré
+        self.notes = [{} for _ in self.codes]
+
+    def _note(self, position, score):
+        # Note complète d'un score, calculée à sa première rencontre
+        notes = self.notes[position]
+        if score not in notes:
+            notes[score] = {
+                "score": score,
+                "niveau": self.determiner_niveau(score),
+                "retroaction": self.generer_retroaction(self.codes[position], score),
+            }
+        return notes[score]
+
+    def masque(self, test_status):
+        """
+        Construit le masque des tests réussis.
+
+        Args:
+            test_status: Issue par nom de test
+
+        Returns:
+            int: Masque de bits des tests réussis connus de la grille
+        """
+        masque = 0
+        for nom, issue in test_status.items():
+            if issue == "passed":
+                masque |= self.bits.get(nom, 0)
+        return masque
+
+    def noter(self, masque):
+        """
+        Note un étudiant à partir du masque de ses tests réussis.
+
+        Args:
+            masque: Masque retourné par masque()
+
+        Returns:
+            dict: Notes par indicateur et note finale (voir calculer_notes)
+        """
+        notes = {}
+        finale = 0
+        for position, (code, ponderation, poids) in enumerate(zip(self.codes, self.ponderations, self.poids)):
+            score = sum(points for critere, points in poids if masque & critere)
+            notes[code] = dict(self._note(position, score))
+            finale += score * ponderation
+        notes["finale"] = finale
+        return notes
+
+    def noter_matrice(self, noms_tests, reussites):
+        """
+        Note une classe entière par produits matriciels (numpy).
+
+        Args:
+            noms_tests: Noms des colonnes de reussites
+            reussites: Tableau étudiants × tests, vrai si le test est réussi
+
+        Returns:
+            numpy.ndarray: Scores étudiants × (indicateurs..., finale)
+        """
+        import numpy as np
+
+        # Incidence tests × critères, puis points critères × indicateurs
+        colonnes = {nom: i for i, nom in enumerate(noms_tests)}
+        incidence = np.zeros((len(noms_tests), len(self.criteres)))
+        points = np.zeros((len(self.criteres), len(self.codes)))
+        for j, (position, valeur, tests) in enumerate(self.criteres):
+            points[j, position] = valeur
+            for test in tests:
+                if test in colonnes:
+                    incidence[colonnes[test], j] = 1
+
+        satisfaits = (np.asarray(reussites, dtype=np.float64) @ incidence) > 0
+        scores = satisfaits.astype(np.float64) @ points
+        return np.column_stack([scores, scores @ np.array(self.ponderations)])
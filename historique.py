@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Historique des corrections dans une base SQLite
+
+Chaque correction batch (--historique) ajoute une exécution avec, pour
+chaque dépôt, le commit corrigé, le moteur qui l'a évalué, la note et
+l'issue et la durée de chaque test. La base permet ensuite de suivre les
+étudiants d'une exécution à l'autre.
+
+Usage:
+    python3 correction.py . --batch ../etudiants --historique historique.db
+    python3 historique.py historique.db executions
+    python3 historique.py historique.db regressions
+    python3 historique.py historique.db taux --executions 10
+"""
+
+import sys
+import sqlite3
+import argparse
+from datetime import datetime
+
+# Dépôts accumulés avant chaque insertion groupée
+TAILLE_LOT = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    moteur TEXT,
+    ref TEXT
+);
+CREATE TABLE IF NOT EXISTS depots (
+    execution_id INTEGER NOT NULL REFERENCES executions (id),
+    etudiant TEXT NOT NULL,
+    commit_id TEXT,
+    note REAL,
+    reussis INTEGER,
+    echoues INTEGER,
+    ignores INTEGER,
+    duree REAL,
+    cache INTEGER,
+    erreur TEXT,
+    moteur TEXT,
+    PRIMARY KEY (execution_id, etudiant)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tests (
+    execution_id INTEGER NOT NULL,
+    etudiant TEXT NOT NULL,
+    test TEXT NOT NULL,
+    issue TEXT NOT NULL,
+    duree REAL,
+    PRIMARY KEY (execution_id, etudiant, test)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS depots_etudiant ON depots (etudiant, execution_id);
+CREATE INDEX IF NOT EXISTS depots_commit ON depots (commit_id);
+"""
+
+
+class Historique:
+    """
+    Base SQLite des corrections (mode WAL, insertions groupées).
+
+    Args:
+        chemin: Chemin du fichier SQLite (créé au besoin)
+    """
+
+    def __init__(self, chemin):
+        self.connexion = sqlite3.connect(chemin)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.executescript(SCHEMA)
+        # Base créée avant l'ajout du moteur de chaque dépôt
+        colonnes = {ligne[1] for ligne in self.connexion.execute("PRAGMA table_info(depots)")}
+        if "moteur" not in colonnes:
+            with self.connexion:
+                self.connexion.execute("ALTER TABLE depots ADD COLUMN moteur TEXT")
+        self.execution = None
+        self._depots = []
+        self._tests = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def commencer_execution(self, moteur=None, ref=None):
+        """
+        Ajoute une exécution; les dépôts ajoutés ensuite lui appartiennent.
+
+        Args:
+            moteur: Moteur d'exécution des tests demandé (les dépôts git nus
+                sont toujours évalués par le moteur statique, noté par dépôt)
+            ref: Référence corrigée dans les dépôts git nus
+
+        Returns:
+            int: Identifiant de l'exécution
+        """
+        with self.connexion:
+            curseur = self.connexion.execute(
+                "INSERT INTO executions (date, moteur, ref) VALUES (?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), moteur, ref)
+            )
+        self.execution = curseur.lastrowid
+        return self.execution
+
+    def ajouter(self, resultat):
+        """
+        Ajoute la correction d'un dépôt à l'exécution courante.
+
+        Les insertions sont groupées par TAILLE_LOT dépôts.
+
+        Args:
+            resultat: Résultat complet (corriger_depot) ou compact
+                (resumer_resultat) d'un étudiant
+        """
+        resultats_tests = resultat.get("resultats", resultat)
+        summary = resultats_tests.get("summary", {})
+        tests = resultats_tests.get("tests", [])
+        erreur = resultats_tests.get("erreur", resultat.get("erreur"))
+
+        self._depots.append((
+            self.execution, resultat["etudiant"], resultat.get("commit"),
+            resultat["notes"].get("finale"),
+            summary.get("passed"), summary.get("failed"), summary.get("skipped"),
+            resultat.get("duree"), int(bool(resultat.get("cache"))), erreur,
+            resultat.get("moteur")
+        ))
+        if isinstance(tests, dict):
+            # Enregistrement compact: issue seulement
+            self._tests.extend(
+                (self.execution, resultat["etudiant"], nom, issue, None)
+                for nom, issue in tests.items()
+            )
+        else:
+            self._tests.extend(
+                (self.execution, resultat["etudiant"], t["name"], t["outcome"], t.get("duration"))
+                for t in tests
+            )
+
+        if len(self._depots) >= TAILLE_LOT:
+            self.vider()
+
+    def vider(self):
+        """Insère les dépôts accumulés en une seule transaction."""
+        if not self._depots:
+            return
+        with self.connexion:
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO depots (execution_id, etudiant, commit_id, note, reussis, "
+                "echoues, ignores, duree, cache, erreur, moteur) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._depots
+            )
+            self.connexion.executemany(
+                "INSERT OR REPLACE INTO tests VALUES (?, ?, ?, ?, ?)",
+                self._tests
+            )
+        self._depots = []
+        self._tests = []
+
+    def fermer(self):
+        """Insère les dépôts restants et ferme la base."""
+        self.vider()
+        self.connexion.close()
+
+    def executions(self, limite=20):
+        """
+        Liste les dernières exécutions.
+
+        Args:
+            limite: Nombre maximal d'exécutions
+
+        Returns:
+            list: (id, date, moteur, ref, nombre de dépôts, note moyenne)
+        """
+        self.vider()
+        return self.connexion.execute("""
+            SELECT e.id, e.date, e.moteur, e.ref, COUNT(d.etudiant), AVG(d.note)
+            FROM executions e LEFT JOIN depots d ON d.execution_id = e.id
+            GROUP BY e.id ORDER BY e.id DESC LIMIT ?
+        """, (limite,)).fetchall()
+
+    def derniere_execution(self):
+        """Identifiant de la dernière exécution ayant des dépôts, ou None."""
+        self.vider()
+        return self.connexion.execute("SELECT MAX(execution_id) FROM depots").fetchone()[0]
+
+    def regressions(self, execution=None):
+        """
+        Trouve les étudiants qui ont régressé depuis leur correction précédente.
+
+        Un étudiant régresse si sa note baisse ou si un test réussi lors de
+        sa correction précédente ne l'est plus.
+
+        Args:
+            execution: Exécution examinée (défaut: la dernière)
+
+        Returns:
+            list: Dictionnaires etudiant, execution_precedente, note_avant,
+            note_apres, commit_avant, commit_apres et tests (tests régressés)
+        """
+        self.vider()
+        if execution is None:
+            execution = self.derniere_execution()
+        paires = self.connexion.execute("""
+            SELECT d.etudiant, p.execution_id, p.note, d.note, p.commit_id, d.commit_id
+            FROM depots d
+            JOIN depots p ON p.etudiant = d.etudiant AND p.execution_id = (
+                SELECT MAX(execution_id) FROM depots
+                WHERE etudiant = d.etudiant AND execution_id < d.execution_id
+            )
+            WHERE d.execution_id = ?
+            ORDER BY d.etudiant
+        """, (execution,)).fetchall()
+
+        regressions = []
+        for etudiant, precedente, note_avant, note_apres, commit_avant, commit_apres in paires:
+            tests = [ligne[0] for ligne in self.connexion.execute("""
+                SELECT t.test FROM tests t
+                JOIN tests a ON a.execution_id = ? AND a.etudiant = t.etudiant AND a.test = t.test
+                WHERE t.execution_id = ? AND t.etudiant = ?
+                  AND a.issue = 'passed' AND t.issue != 'passed'
+                ORDER BY t.test
+            """, (precedente, execution, etudiant))]
+            baisse = (note_avant is not None and note_apres is not None
+                      and note_apres < note_avant)
+            if tests or baisse:
+                regressions.append({
+                    "etudiant": etudiant,
+                    "execution_precedente": precedente,
+                    "note_avant": note_avant,
+                    "note_apres": note_apres,
+                    "commit_avant": commit_avant,
+                    "commit_apres": commit_apres,
+                    "tests": tests,
+                })
+        return regressions
+
+    def taux_reussite(self, executions=1):
+        """
+        Calcule le taux de réussite de chaque test.
+
+        Args:
+            executions: Nombre de dernières exécutions prises en compte
+
+        Returns:
+            list: (test, tests réussis, tests exécutés, taux en %), du test le
+            moins réussi au plus réussi
+        """
+        self.vider()
+        premiere = self.connexion.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM executions ORDER BY id DESC LIMIT ?)",
+            (executions,)
+        ).fetchone()[0]
+        return self.connexion.execute("""
+            SELECT test, SUM(issue = 'passed'), COUNT(*),
+                   100.0 * SUM(issue = 'passed') / COUNT(*) AS taux
+            FROM tests WHERE execution_id >= ?
+            GROUP BY test ORDER BY taux, test
+        """, (premiere or 0,)).fetchall()
+
+
+def main():
+    """
+    Interroge l'historique des corrections.
+    """
+    parser = argparse.ArgumentParser(description="Historique des corrections F1")
+    parser.add_argument("base", help="Fichier SQLite de l'historique")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+    commandes.add_parser("executions", help="Lister les dernières exécutions")
+    regressions = commandes.add_parser("regressions",
+                                       help="Étudiants ayant régressé depuis leur correction précédente")
+    regressions.add_argument("--execution", type=int, help="Exécution examinée (défaut: la dernière)")
+    taux = commandes.add_parser("taux", help="Taux de réussite par test")
+    taux.add_argument("--executions", type=int, default=1,
+                      help="Nombre de dernières exécutions prises en compte (défaut: 1)")
+    args = parser.parse_args()
+
+    with Historique(args.base) as historique:
+        if args.commande == "executions":
+            for id_execution, date, moteur, ref, nb_depots, moyenne in historique.executions():
+                moyenne = f"{moyenne:.1f}%" if moyenne is not None else "-"
+                print(f"#{id_execution:<5} {date}  {moteur or '-':<9} {ref or '-':<10} "
+                      f"{nb_depots:>4} dépôts  moyenne {moyenne}")
+
+        elif args.commande == "regressions":
+            regressions = historique.regressions(args.execution)
+            if not regressions:
+                print("✅ Aucune régression")
+            for r in regressions:
+                print(f"📉 {r['etudiant']}: {r['note_avant']:.1f}% → {r['note_apres']:.1f}% "
+                      f"(exécution #{r['execution_precedente']})")
+                for test in r["tests"]:
+                    print(f"   ❌ {test}")
+
+        elif args.commande == "taux":
+            for test, reussis, total, pourcentage in historique.taux_reussite(args.executions):
+                print(f"{test:<45} {reussis:>5}/{total:<5} {pourcentage:5.1f}%")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
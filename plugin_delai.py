@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Plugin pytest de délai par test pour correction.py
+
+Chaque phase d'un test (setup, call, teardown) dispose d'un délai; au-delà,
+la phase est interrompue et le test échoue, et la session passe au test
+suivant. Un test bloqué ne coûte donc que son délai, plutôt que toute
+l'exécution du dépôt.
+
+Le délai est donné par --delai-test ou, par défaut, par la variable
+d'environnement CORRECTION_DELAI_TEST (0 ou absente = pas de délai):
+    python3 -m pytest tests -p plugin_delai --delai-test=10
+
+L'interruption utilise SIGALRM: Unix seulement, dans le fil principal.
+L'exception levée dérive de l'échec de pytest (BaseException), pour qu'un
+« except Exception » du code testé ne l'intercepte pas, et l'alarme est
+relancée tant que la phase ne s'est pas arrêtée (« except: » nu).
+"""
+
+import os
+import signal
+import contextlib
+
+import pytest
+
+# Variable d'environnement du délai par défaut, en secondes
+VARIABLE_DELAI = "CORRECTION_DELAI_TEST"
+
+# Intervalle de relance de l'alarme après le délai, en secondes: une phase
+# qui intercepte l'interruption est interrompue de nouveau
+RELANCE = 1.0
+
+
+class DelaiDepasse(pytest.fail.Exception):
+    """Une phase de test a dépassé son délai."""
+
+
+class LimiteDuree:
+    """
+    Plugin pytest qui interrompt une phase de test trop longue.
+
+    Args:
+        delai: Délai par phase, en secondes
+        relance: Intervalle de relance de l'alarme une fois le délai
+            dépassé, en secondes
+    """
+
+    def __init__(self, delai, relance=RELANCE):
+        self.delai = delai
+        self.relance = relance
+
+    def _alarme(self, signum, frame):
+        raise DelaiDepasse(f"Délai de {self.delai:g} s dépassé")
+
+    @contextlib.contextmanager
+    def _limiter(self):
+        precedent = signal.signal(signal.SIGALRM, self._alarme)
+        # Puis toutes les relance secondes, jusqu'à la fin de la phase
+        signal.setitimer(signal.ITIMER_REAL, self.delai, self.relance)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, precedent)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        with self._limiter():
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        with self._limiter():
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        with self._limiter():
+            yield
+
+
+def delai_defaut():
+    """Délai par test de l'environnement (CORRECTION_DELAI_TEST), 0 si absent."""
+    try:
+        return float(os.environ.get(VARIABLE_DELAI, 0))
+    except ValueError:
+        return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Hooks du plugin (chargé avec -p plugin_delai)
+# ---------------------------------------------------------------------------
+def pytest_addoption(parser):
+    parser.addoption(
+        "--delai-test",
+        type=float,
+        default=delai_defaut(),
+        help=f"Délai par phase de test en secondes (défaut: ${VARIABLE_DELAI}, 0 = aucun)",
+    )
+
+
+def pytest_configure(config):
+    delai = config.getoption("delai_test")
+    if delai and delai > 0 and hasattr(signal, "setitimer"):
+        config.pluginmanager.register(LimiteDuree(delai), "limite-duree")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Plugin pytest de collecte des résultats pour correction.py
+
+Le plugin retient l'issue et la durée de chaque test pendant l'exécution
+et produit un rapport dans le même format que celui lu par correction.py
+("summary" et "tests" avec "name" et "outcome").
+
+Utilisé en sous-processus, il écrit chaque test terminé dans un fichier
+JSONL hors du dépôt corrigé:
+    python3 -m pytest tests -p plugin_resultats --resultats-fichier=/tmp/r.jsonl
+"""
+
+import json
+import time
+
+
+class CollecteurResultats:
+    """
+    Plugin pytest qui collecte l'issue de chaque test.
+
+    Args:
+        fichier: Chemin d'un fichier JSONL où écrire chaque test dès qu'il
+            est terminé, puis le résumé (None = collecte en mémoire seulement)
+    """
+
+    def __init__(self, fichier=None):
+        self.debut = time.time()
+        self.tests = {}
+        self.fichier = open(fichier, "a", encoding="utf-8") if fichier else None
+
+    def _ecrire(self, enregistrement):
+        if self.fichier is not None:
+            self.fichier.write(json.dumps(enregistrement) + "\n")
+            self.fichier.flush()
+
+    def _enregistrer(self, nodeid, issue, duree, message=""):
+        test = self.tests.setdefault(nodeid, {
+            "nodeid": nodeid,
+            "name": nodeid.split("::")[-1],
+            "outcome": "passed",
+            "duration": 0.0,
+            "message": "",
+        })
+        test["duration"] += duree
+        # La première phase non réussie (setup, call, teardown) l'emporte
+        if test["outcome"] == "passed" and issue != "passed":
+            test["outcome"] = issue
+            test["message"] = message
+        return test
+
+    def pytest_runtest_logreport(self, report):
+        message = report.longreprtext if report.outcome != "passed" else ""
+        test = self._enregistrer(report.nodeid, report.outcome, report.duration, message)
+        if report.when == "teardown":
+            self._ecrire(test)
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self._ecrire(self._enregistrer(report.nodeid, "failed", 0.0, report.longreprtext))
+
+    def pytest_sessionfinish(self, session):
+        if self.fichier is not None:
+            self._ecrire({"summary": self.rapport()["summary"]})
+            self.fichier.close()
+            self.fichier = None
+
+    def rapport(self):
+        """
+        Retourne le rapport des tests collectés.
+
+        Returns:
+            dict: {"summary": {...}, "tests": [...]}
+        """
+        return {"summary": resumer_tests(self.tests.values(), time.time() - self.debut),
+                "tests": list(self.tests.values())}
+
+
+def resumer_tests(tests, duree=0):
+    """
+    Compte les tests par issue.
+
+    Args:
+        tests: Tests avec leur "outcome"
+        duree: Durée totale en secondes
+
+    Returns:
+        dict: total, passed, failed, skipped et duration
+    """
+    summary = {"total": 0, "passed": 0, "failed": 0, "skipped": 0}
+    for test in tests:
+        summary["total"] += 1
+        summary[test["outcome"] if test["outcome"] in summary else "failed"] += 1
+    summary["duration"] = duree
+    return summary
+
+
+def lire_resultats(chemin):
+    """
+    Relit le fichier JSONL écrit par le plugin.
+
+    Args:
+        chemin: Chemin du fichier de résultats
+
+    Returns:
+        dict: Rapport {"summary": ..., "tests": [...]}, ou None si le
+        fichier est absent ou ne contient aucun test
+    """
+    tests = {}
+    summary = None
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            for ligne in f:
+                try:
+                    enregistrement = json.loads(ligne)
+                except ValueError:
+                    continue  # Ligne incomplète (processus interrompu)
+                if "summary" in enregistrement:
+                    summary = enregistrement["summary"]
+                else:
+                    tests[enregistrement["nodeid"]] = enregistrement
+    except OSError:
+        return None
+
+    if summary is None:
+        if not tests:
+            return None
+        summary = resumer_tests(tests.values())
+    return {"summary": summary, "tests": list(tests.values())}
+
+
+# ---------------------------------------------------------------------------
+# Hooks du plugin (chargé avec -p plugin_resultats)
+# ---------------------------------------------------------------------------
+def pytest_addoption(parser):
+    parser.addoption(
+        "--resultats-fichier",
+        help="Fichier JSONL où écrire l'issue de chaque test (correction.py)",
+    )
+
+
+def pytest_configure(config):
+    chemin = config.getoption("resultats_fichier")
+    if chemin:
+        config.pluginmanager.register(CollecteurResultats(chemin), "collecteur-resultats")
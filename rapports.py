@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Rendu des rapports de correction (texte, Markdown, HTML)
+
+Les parties fixes des rapports (titre, cours, critères des indicateurs)
+sont assemblées une seule fois à partir de CONFIG en gabarits; rendre le
+rapport d'un étudiant ne fait plus qu'un format() qui produit tout le
+texte d'un bloc, écrit ensuite en une seule fois.
+
+Les mêmes données alimentent trois sorties:
+- texte: le rapport affiché par correction.py;
+- Markdown: un fichier par étudiant (--markdown DOSSIER);
+- HTML: un seul rapport de classe statique (--html FICHIER), écrit au fur
+  et à mesure des dépôts corrigés.
+"""
+
+import html
+from datetime import datetime
+from pathlib import Path
+
+LIGNE = "=" * 70
+TIRET = "-" * 70
+
+
+def _echapper(texte):
+    """Protège les accolades d'un texte fixe inséré dans un gabarit format()."""
+    return str(texte).replace("{", "{{").replace("}", "}}")
+
+
+class GabaritsRapport:
+    """
+    Gabarits des rapports, compilés à partir de CONFIG.
+
+    Les champs variables d'un indicateur i sont {s<i>} (score), {n<i>}
+    (niveau) et {r<i>} (rétroaction).
+
+    Args:
+        config: Configuration du cours (CONFIG)
+    """
+
+    def __init__(self, config):
+        self.codes = list(config["indicateurs"])
+        titre = _echapper(config["titre"])
+
+        indicateurs = "".join(
+            f"\n{_echapper(code)} — {_echapper(ind['critere'])}\n"
+            f"  Critères de performance: {_echapper(', '.join(ind['critères_performance']))}\n"
+            f"  Score: {{s{i}:.0f}}%\n"
+            f"  Niveau: {{n{i}}}%\n"
+            f"  Rétroaction: {{r{i}}}\n"
+            for i, (code, ind) in enumerate(config["indicateurs"].items())
+        )
+        self.texte_gabarit = (
+            f"\n{LIGNE}\n"
+            f"📊 RAPPORT DE CORRECTION — {titre}\n"
+            f"{LIGNE}\n"
+            "Étudiant: {etudiant}\n"
+            "Date: {date}\n"
+            f"Cours: {_echapper(config['cours'])}\n"
+            f"Type: {_echapper(config['type'])}\n"
+            f"\n{TIRET}\n"
+            "RÉSUMÉ DES TESTS\n"
+            f"{TIRET}\n"
+            "Tests exécutés: {total}\n"
+            "✅ Réussis: {passed}\n"
+            "❌ Échoués: {failed}\n"
+            "{extrait}"
+            f"\n{TIRET}\n"
+            "ÉVALUATION PAR INDICATEUR\n"
+            f"{TIRET}\n"
+            f"{indicateurs}"
+            f"\n{TIRET}\n"
+            "NOTE FINALE\n"
+            f"{TIRET}\n"
+            "📈 Score global: {finale:.1f}%\n"
+            f"\n{LIGNE}\n"
+            "💡 RAPPEL IMPORTANT\n"
+            f"{LIGNE}\n"
+            "Cette évaluation est FORMATIVE et NON NOTÉE.\n"
+            "Son but est de vous donner une rétroaction pour vous améliorer.\n"
+            "\nSi vous avez des échecs:\n"
+            "1. Lisez attentivement la rétroaction ci-dessus\n"
+            "2. Consultez le guide de dépannage\n"
+            "3. Corrigez votre code\n"
+            "4. Pussez et relancez les tests\n"
+            "\nN'hésitez pas à demander de l'aide à l'enseignant!\n"
+            f"{LIGNE}\n\n"
+        )
+
+        indicateurs_md = "".join(
+            f"| {_echapper(code)} — {_echapper(ind['critere'])} | {{s{i}:.0f}}% | {{n{i}}}% | {{r{i}}} |\n"
+            for i, (code, ind) in enumerate(config["indicateurs"].items())
+        )
+        self.markdown_gabarit = (
+            f"# Rapport de correction — {titre}\n\n"
+            "- **Étudiant:** {etudiant}\n"
+            "- **Date:** {date}\n"
+            f"- **Cours:** {_echapper(config['cours'])}\n"
+            f"- **Type:** {_echapper(config['type'])}\n\n"
+            "## Résumé des tests\n\n"
+            "{total} tests exécutés: ✅ {passed} réussis, ❌ {failed} échoués\n\n"
+            "{tests}"
+            "{extrait}"
+            "## Évaluation par indicateur\n\n"
+            "| Indicateur | Score | Niveau | Rétroaction |\n"
+            "|---|---|---|---|\n"
+            f"{indicateurs_md}\n"
+            "**Note finale: {finale:.1f}%**\n\n"
+            "> Cette évaluation est formative et non notée.\n"
+        )
+
+        self.html_titre = html.escape(config["titre"])
+        self.html_entetes = "".join(f"<th>{html.escape(code)}</th>" for code in self.codes)
+
+    def _champs(self, etudiant, summary, notes):
+        champs = {
+            "etudiant": etudiant,
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "total": summary.get("total", 0),
+            "passed": summary.get("passed", 0),
+            "failed": summary.get("failed", 0),
+            "finale": notes["finale"],
+        }
+        for i, code in enumerate(self.codes):
+            champs[f"s{i}"] = notes[code]["score"]
+            champs[f"n{i}"] = notes[code]["niveau"]
+            champs[f"r{i}"] = notes[code]["retroaction"]
+        return champs
+
+    def texte(self, etudiant, summary, notes, extrait=None):
+        """
+        Rend le rapport texte d'un étudiant.
+
+        Args:
+            etudiant: Nom de l'étudiant (ou ID)
+            summary: Résumé des tests ("total", "passed", "failed")
+            notes: Notes calculées
+            extrait: Extrait de la sortie de pytest (optionnel)
+
+        Returns:
+            str: Rapport complet
+        """
+        if extrait:
+            extrait = "\nSortie de pytest (extrait):\n" + "".join(
+                f"  {ligne}\n" for ligne in extrait.split("\n"))
+        return self.texte_gabarit.format(extrait=extrait or "", **self._champs(etudiant, summary, notes))
+
+    def markdown(self, etudiant, summary, notes, issues=None, extrait=None):
+        """
+        Rend le rapport Markdown d'un étudiant.
+
+        Args:
+            etudiant: Nom de l'étudiant (ou ID)
+            summary: Résumé des tests ("total", "passed", "failed")
+            notes: Notes calculées
+            issues: Issue par nom de test (optionnel)
+            extrait: Extrait de la sortie de pytest (optionnel)
+
+        Returns:
+            str: Rapport complet
+        """
+        if extrait:
+            extrait = f"<details><summary>Sortie de pytest (extrait)</summary>\n\n```\n{extrait}\n```\n\n</details>\n\n"
+        tests = ""
+        if issues:
+            symboles = {"passed": "✅", "failed": "❌", "skipped": "⏭️"}
+            tests = "| Test | Issue |\n|---|---|\n" + "".join(
+                f"| `{nom}` | {symboles.get(issue, issue)} |\n" for nom, issue in issues.items()
+            ) + "\n"
+        return self.markdown_gabarit.format(tests=tests, extrait=extrait or "",
+                                            **self._champs(etudiant, summary, notes))
+
+
+class RapportsMarkdown:
+    """
+    Écrit un rapport Markdown par étudiant dans un dossier.
+
+    Args:
+        gabarits: GabaritsRapport
+        dossier: Dossier de sortie (créé au besoin)
+    """
+
+    def __init__(self, gabarits, dossier):
+        self.gabarits = gabarits
+        self.dossier = Path(dossier)
+        self.dossier.mkdir(parents=True, exist_ok=True)
+
+    def ajouter(self, etudiant, summary, notes, issues=None, extrait=None):
+        """Écrit le rapport d'un étudiant (<dossier>/<etudiant>.md)."""
+        (self.dossier / f"{etudiant}.md").write_text(
+            self.gabarits.markdown(etudiant, summary, notes, issues, extrait), encoding="utf-8")
+
+    def fermer(self):
+        """Rien à finaliser: chaque rapport est écrit dès qu'il est ajouté."""
+
+
+class RapportHTML:
+    """
+    Rapport HTML statique de toute la classe, écrit au fur et à mesure.
+
+    Chaque étudiant ajouté devient une ligne du tableau (avec le détail de
+    ses tests); les moyennes sont ajoutées à la fermeture.
+
+    Args:
+        gabarits: GabaritsRapport
+        chemin: Fichier HTML de sortie
+    """
+
+    def __init__(self, gabarits, chemin):
+        self.gabarits = gabarits
+        self.chemin = chemin
+        self.nb_etudiants = 0
+        self.sommes = [0.0] * (len(gabarits.codes) + 1)
+        self.fichier = open(chemin, "w", encoding="utf-8")
+        self.fichier.write(
+            "<!DOCTYPE html>\n<html lang=\"fr\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>Rapport de classe — {gabarits.html_titre}</title>\n"
+            "<style>\n"
+            "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}"
+            "th,td{border:1px solid #ccc;padding:.3em .6em;text-align:left;vertical-align:top}"
+            ".passed{color:#080}.failed{color:#b00}.skipped{color:#888}"
+            "details{font-size:.9em}pre{white-space:pre-wrap;max-width:60em}\n"
+            "</style>\n</head>\n<body>\n"
+            f"<h1>Rapport de classe — {gabarits.html_titre}</h1>\n"
+            f"<p>Généré le {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>\n"
+            "<table>\n<thead><tr><th>Étudiant</th>"
+            f"{gabarits.html_entetes}<th>Note finale</th><th>Tests</th></tr></thead>\n<tbody>\n"
+        )
+
+    def ajouter(self, etudiant, summary, notes, issues=None, extrait=None):
+        """Ajoute la ligne d'un étudiant au rapport."""
+        scores = [notes[code]["score"] for code in self.gabarits.codes] + [notes["finale"]]
+        self.nb_etudiants += 1
+        self.sommes = [somme + score for somme, score in zip(self.sommes, scores)]
+
+        cellules = "".join(
+            f"<td title=\"{html.escape(notes[code]['retroaction'])}\">{notes[code]['score']:.0f}%</td>"
+            for code in self.gabarits.codes
+        )
+        details = ""
+        if issues:
+            details = "<details><summary>{}/{} réussis</summary><ul>{}</ul></details>".format(
+                summary.get("passed", 0), summary.get("total", 0),
+                "".join(f"<li class=\"{html.escape(issue)}\">{html.escape(nom)}: {html.escape(issue)}</li>"
+                        for nom, issue in issues.items()))
+        if extrait:
+            details += f"<details><summary>Sortie de pytest (extrait)</summary><pre>{html.escape(extrait)}</pre></details>"
+        self.fichier.write(
+            f"<tr><td>{html.escape(etudiant)}</td>{cellules}"
+            f"<td><strong>{notes['finale']:.1f}%</strong></td><td>{details}</td></tr>\n"
+        )
+
+    def fermer(self):
+        """Ajoute les moyennes de la classe et ferme le fichier."""
+        if self.fichier is None:
+            return
+        if self.nb_etudiants:
+            moyennes = "".join(f"<td>{somme / self.nb_etudiants:.1f}%</td>" for somme in self.sommes)
+            self.fichier.write(f"</tbody>\n<tfoot><tr><th>Moyenne ({self.nb_etudiants})</th>"
+                               f"{moyennes}<td></td></tr></tfoot>\n")
+        else:
+            self.fichier.write("</tbody>\n")
+        self.fichier.write("</table>\n</body>\n</html>\n")
+        self.fichier.close()
+        self.fichier = None
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Index de similarité des scripts des étudiants (MinHash + LSH)
+
+Chaque script est réduit à une suite de jetons tirée de son AST, où les
+noms choisis par l'étudiant (variables, fonctions, paramètres) et les
+valeurs littérales sont normalisés: renommer une variable ou changer un
+message ne change pas les jetons. Les k-grammes de jetons sont résumés
+par une signature MinHash, et le hachage sensible à la localité (LSH) ne
+compare que les scripts qui partagent au moins une bande de signature,
+plutôt que toutes les paires.
+
+Usage:
+    python3 correction.py . --batch ../etudiants --similarite
+    python3 correction.py . --batch ../etudiants --similarite test_neoslider.py --seuil-similarite 0.9
+"""
+
+import re
+import ast
+import random
+import hashlib
+
+from depot_git import ErreurGit, SourceGit, est_depot_nu
+
+# Longueur des k-grammes de jetons
+TAILLE_KGRAMME = 5
+
+# Signature MinHash: BANDES × LIGNES valeurs. Avec 16 bandes de 8 lignes,
+# deux scripts deviennent candidats à partir d'environ 70 % de similarité.
+BANDES = 16
+LIGNES = 8
+
+# Seuil de similarité (Jaccard estimé) d'un regroupement
+SEUIL_SIMILARITE = 0.8
+
+# Une fonction de hachage par valeur de la signature: les k-grammes étant
+# déjà hachés uniformément (blake2b), un masque XOR aléatoire suffit à les
+# réordonner et coûte trois fois moins qu'une permutation (a·x + b) mod P.
+# Masques fixes: les signatures restent comparables d'une exécution à l'autre.
+_aleatoire = random.Random(413)
+MASQUES = [_aleatoire.getrandbits(64) for _ in range(BANDES * LIGNES)]
+
+
+def jetons_normalises(source):
+    """
+    Réduit un script Python à une suite de jetons normalisés.
+
+    Les identifiants locaux deviennent "_", les littéraux leur type; les
+    types de nœuds, les attributs et les modules importés sont conservés.
+    Un script invalide est découpé en mots et symboles.
+
+    Args:
+        source: Code source du script
+
+    Returns:
+        list: Jetons
+    """
+    try:
+        arbre = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return re.findall(r"\w+|[^\w\s]", source)
+
+    jetons = []
+    pile = [arbre]
+    while pile:
+        noeud = pile.pop()
+        jetons.append(type(noeud).__name__)
+        if isinstance(noeud, ast.Attribute):
+            jetons.append("." + noeud.attr)
+        elif isinstance(noeud, ast.alias):
+            jetons.append(noeud.name)
+        elif isinstance(noeud, (ast.Import, ast.ImportFrom)) and getattr(noeud, "module", None):
+            jetons.append(noeud.module)
+        elif isinstance(noeud, ast.Constant):
+            jetons.append(type(noeud.value).__name__)
+        # Parcours en profondeur, dans l'ordre du source
+        pile.extend(reversed(list(ast.iter_child_nodes(noeud))))
+    return jetons
+
+
+def kgrammes(jetons, k=TAILLE_KGRAMME):
+    """
+    Hache les k-grammes de jetons en entiers de 64 bits.
+
+    Args:
+        jetons: Suite de jetons
+        k: Longueur des k-grammes
+
+    Returns:
+        set: Empreintes des k-grammes
+    """
+    if len(jetons) < k:
+        k = max(len(jetons), 1)
+    return {
+        int.from_bytes(hashlib.blake2b("\0".join(jetons[i:i + k]).encode(), digest_size=8).digest(), "big")
+        for i in range(max(len(jetons) - k + 1, 0))
+    }
+
+
+def signature_minhash(ensemble):
+    """
+    Calcule la signature MinHash d'un ensemble de k-grammes.
+
+    Args:
+        ensemble: Empreintes des k-grammes (non vide)
+
+    Returns:
+        tuple: BANDES × LIGNES valeurs minimales
+    """
+    return tuple(min(x ^ masque for x in ensemble) for masque in MASQUES)
+
+
+def similarite_estimee(signature_a, signature_b):
+    """Similarité de Jaccard estimée: part des valeurs égales des deux signatures."""
+    return sum(x == y for x, y in zip(signature_a, signature_b)) / len(signature_a)
+
+
+class IndexSimilarite:
+    """
+    Index LSH des signatures MinHash des scripts d'une classe.
+
+    Les scripts de même signature (copies, même après renommage) ne sont
+    indexés qu'une fois: un grand groupe de copies du gabarit ne produit
+    donc pas un nombre quadratique de paires.
+
+    Args:
+        seuil: Similarité estimée minimale de deux scripts regroupés
+    """
+
+    def __init__(self, seuil=SEUIL_SIMILARITE):
+        self.seuil = seuil
+        self.noms = {}
+        self.seaux = {}
+
+    def ajouter(self, nom, source):
+        """
+        Indexe le script d'un étudiant.
+
+        Args:
+            nom: Nom de l'étudiant
+            source: Code source du script (None ou vide = ignoré)
+        """
+        if not source or not source.strip():
+            return
+        ensemble = kgrammes(jetons_normalises(source))
+        if not ensemble:
+            return
+        signature = signature_minhash(ensemble)
+        if signature in self.noms:
+            self.noms[signature].append(nom)
+            return
+        self.noms[signature] = [nom]
+        for bande in range(BANDES):
+            cle = (bande, signature[bande * LIGNES:(bande + 1) * LIGNES])
+            self.seaux.setdefault(cle, []).append(signature)
+
+    def paires(self):
+        """
+        Paires de signatures similaires, parmi les candidats du LSH.
+
+        Returns:
+            dict: Similarité estimée par paire de signatures
+        """
+        paires = {}
+        for signatures in self.seaux.values():
+            for i, signature_a in enumerate(signatures):
+                for signature_b in signatures[i + 1:]:
+                    paire = (signature_a, signature_b)
+                    if paire not in paires:
+                        paires[paire] = similarite_estimee(signature_a, signature_b)
+        return {paire: sim for paire, sim in paires.items() if sim >= self.seuil}
+
+    def regroupements(self):
+        """
+        Regroupe les scripts similaires (composantes connexes des paires).
+
+        Returns:
+            list: Groupes {"membres": [...], "similarite": plus faible
+            similarité des paires retenues}, du plus grand au plus petit
+        """
+        parents = {signature: signature for signature in self.noms}
+
+        def racine(signature):
+            while parents[signature] != signature:
+                parents[signature] = parents[parents[signature]]
+                signature = parents[signature]
+            return signature
+
+        paires = self.paires()
+        for signature_a, signature_b in paires:
+            parents[racine(signature_a)] = racine(signature_b)
+
+        membres = {}
+        minimums = {}
+        for signature, noms in self.noms.items():
+            cle = racine(signature)
+            membres.setdefault(cle, []).extend(noms)
+            if len(noms) > 1:
+                minimums.setdefault(cle, 1.0)
+        for (signature_a, _), sim in paires.items():
+            cle = racine(signature_a)
+            minimums[cle] = min(sim, minimums.get(cle, sim))
+
+        groupes = [{"membres": sorted(membres[cle]), "similarite": similarite}
+                   for cle, similarite in minimums.items()]
+        groupes.sort(key=lambda groupe: (-len(groupe["membres"]), groupe["membres"]))
+        return groupes
+
+
+def lire_script(repo_dir, fichier, ref="HEAD"):
+    """
+    Lit un script d'un dépôt, nu ou non.
+
+    Args:
+        repo_dir: Chemin vers le dépôt de l'étudiant
+        fichier: Nom du script (ex.: "test_bmp280.py")
+        ref: Référence lue dans un dépôt git nu
+
+    Returns:
+        str: Code source, ou None si le script est absent ou illisible
+    """
+    if est_depot_nu(repo_dir):
+        try:
+            return SourceGit(repo_dir, ref, chemins=[fichier]).read_text(fichier)
+        except ErreurGit:
+            return None
+    try:
+        return (repo_dir / fichier).read_text(errors="replace")
+    except OSError:
+        return None
+
+
+def indexer_depots(depots, fichier="test_bmp280.py", ref="HEAD", seuil=SEUIL_SIMILARITE):
+    """
+    Indexe le même script de chaque dépôt et regroupe les quasi-doublons.
+
+    Args:
+        depots: Liste des chemins de dépôts
+        fichier: Nom du script comparé
+        ref: Référence lue dans les dépôts git nus
+        seuil: Similarité estimée minimale de deux scripts regroupés
+
+    Returns:
+        list: Groupes (voir IndexSimilarite.regroupements)
+    """
+    index = IndexSimilarite(seuil)
+    for repo_dir in depots:
+        index.ajouter(repo_dir.name, lire_script(repo_dir, fichier, ref))
+    return index.regroupements()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Statistiques de classe sur les résultats d'une correction batch
+
+Tous les résultats sont chargés dans des tableaux NumPy (étudiants × tests
+et étudiants × indicateurs); les taux de réussite, les distributions des
+scores, les histogrammes de niveaux et les corrélations entre tests sont
+calculés par opérations vectorisées plutôt qu'étudiant par étudiant.
+
+Nécessite numpy (pip install numpy).
+
+Usage:
+    python3 correction.py . --batch ../etudiants --stats
+    python3 correction.py . --batch ../etudiants --stats --stats-json classe.json
+"""
+
+import numpy as np
+
+# Niveaux des grilles permanentes (voir correction.determiner_niveau)
+NIVEAUX = [0, 35, 60, 85, 100]
+
+# Corrélation minimale (en valeur absolue) d'une paire de tests rapportée
+CORRELATION_MIN = 0.5
+
+
+def charger_tableaux(etudiants_resultats, colonnes):
+    """
+    Charge les résultats dans des tableaux NumPy.
+
+    Args:
+        etudiants_resultats: Résultats complets ou compacts des étudiants
+        colonnes: Clés des notes lues comme scores (indicateurs, "finale")
+
+    Returns:
+        tuple: (noms des tests, issues étudiants × tests en int8 avec
+        1 = réussi, 0 = échoué et -1 = ignoré ou absent, scores
+        étudiants × colonnes en float64)
+    """
+    issues_par_etudiant = []
+    noms_tests = {}
+    for resultat in etudiants_resultats:
+        if "tests" in resultat:
+            issues = resultat["tests"]
+        else:
+            issues = {t["name"]: t["outcome"] for t in resultat.get("resultats", {}).get("tests", [])}
+        issues_par_etudiant.append(issues)
+        for nom in issues:
+            noms_tests.setdefault(nom, len(noms_tests))
+
+    codes = {"passed": 1, "failed": 0, "error": 0}
+    tests = np.full((len(issues_par_etudiant), len(noms_tests)), -1, dtype=np.int8)
+    for ligne, issues in enumerate(issues_par_etudiant):
+        for nom, issue in issues.items():
+            tests[ligne, noms_tests[nom]] = codes.get(issue, -1)
+
+    scores = np.array([
+        [resultat["notes"][code] if code == "finale" else resultat["notes"][code]["score"]
+         for code in colonnes]
+        for resultat in etudiants_resultats
+    ], dtype=np.float64).reshape(-1, len(colonnes))
+
+    return list(noms_tests), tests, scores
+
+
+def calculer_statistiques(etudiants_resultats, grille=None):
+    """
+    Calcule les statistiques de classe.
+
+    Args:
+        etudiants_resultats: Résultats complets ou compacts des étudiants
+        grille: GrilleCompilee; ses indicateurs donnent les colonnes de
+            scores, et les scores de toute la classe sont recalculés d'un
+            seul produit matriciel plutôt que lus dans les notes de chaque
+            étudiant (défaut: indicateurs des notes du premier étudiant)
+
+    Returns:
+        dict: "etudiants", "tests" (taux de réussite par test),
+        "indicateurs" (distribution et histogramme des niveaux par
+        indicateur) et "correlations" (paires de tests corrélées)
+    """
+    if grille is not None:
+        codes = list(grille.codes)
+    else:
+        codes = [code for code in (etudiants_resultats[0]["notes"] if etudiants_resultats else ())
+                 if code != "finale"]
+    colonnes_scores = codes + ["finale"]
+    noms_tests, tests, scores = charger_tableaux(etudiants_resultats, colonnes_scores)
+    nb_etudiants = len(tests)
+    if grille is not None:
+        scores = grille.noter_matrice(noms_tests, tests == 1)
+
+    # Taux de réussite: parmi les étudiants où le test a été exécuté
+    reussis = (tests == 1).sum(axis=0)
+    executes = (tests >= 0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        taux = np.where(executes > 0, 100.0 * reussis / executes, np.nan)
+
+    # Distribution des scores et histogramme des niveaux, par indicateur
+    indicateurs = {}
+    if nb_etudiants:
+        quartiles = np.percentile(scores, [25, 50, 75], axis=0)
+        moyennes = scores.mean(axis=0)
+        ecarts = scores.std(axis=0)
+        minimums = scores.min(axis=0)
+        maximums = scores.max(axis=0)
+        # Même découpage que determiner_niveau: [0, 35), [35, 60), ..., [100, ∞)
+        niveaux = np.digitize(scores, NIVEAUX[1:])
+        for colonne, indicateur in enumerate(colonnes_scores):
+            histogramme = np.bincount(niveaux[:, colonne], minlength=len(NIVEAUX))
+            indicateurs[indicateur] = {
+                "moyenne": float(moyennes[colonne]),
+                "ecart_type": float(ecarts[colonne]),
+                "min": float(minimums[colonne]),
+                "q1": float(quartiles[0, colonne]),
+                "mediane": float(quartiles[1, colonne]),
+                "q3": float(quartiles[2, colonne]),
+                "max": float(maximums[colonne]),
+                "niveaux": {str(niveau): int(n) for niveau, n in zip(NIVEAUX, histogramme)},
+            }
+
+    # Corrélation (phi) entre les réussites des tests, pour chaque paire
+    # parmi les étudiants où les deux tests ont été exécutés (comme le taux
+    # de réussite); une paire sans variation n'a pas de corrélation définie
+    correlations = []
+    if nb_etudiants > 1 and noms_tests:
+        execute = (tests >= 0).astype(np.float64)
+        reussite = (tests == 1).astype(np.float64)
+        # Par paire (i, j): étudiants communs, réussites de i et de j parmi
+        # eux, et réussites conjointes
+        communs = execute.T @ execute
+        reussis_i = reussite.T @ execute
+        reussis_j = reussis_i.T
+        conjoints = reussite.T @ reussite
+        with np.errstate(invalid="ignore", divide="ignore"):
+            matrice = ((communs * conjoints - reussis_i * reussis_j)
+                       / np.sqrt((communs * reussis_i - reussis_i ** 2)
+                                 * (communs * reussis_j - reussis_j ** 2)))
+        lignes, colonnes = np.triu_indices(len(noms_tests), k=1)
+        valeurs = matrice[lignes, colonnes]
+        retenues = np.isfinite(valeurs) & (np.abs(valeurs) >= CORRELATION_MIN)
+        for ligne, colonne, valeur in zip(lignes[retenues], colonnes[retenues], valeurs[retenues]):
+            correlations.append({
+                "tests": [noms_tests[ligne], noms_tests[colonne]],
+                "correlation": round(float(valeur), 3),
+            })
+        correlations.sort(key=lambda paire: -abs(paire["correlation"]))
+
+    return {
+        "etudiants": nb_etudiants,
+        "tests": [
+            {"test": nom, "reussis": int(r), "executes": int(e),
+             "taux": None if np.isnan(t) else round(float(t), 1)}
+            for nom, r, e, t in zip(noms_tests, reussis, executes, taux)
+        ],
+        "indicateurs": indicateurs,
+        "correlations": correlations,
+    }
+
+
+def afficher_statistiques(statistiques, nb_correlations=10):
+    """
+    Affiche un rapport compact des statistiques de classe.
+
+    Args:
+        statistiques: Statistiques retournées par calculer_statistiques()
+        nb_correlations: Nombre maximal de paires de tests affichées
+    """
+    print(f"\n{'='*70}")
+    print(f"📈 STATISTIQUES DE CLASSE ({statistiques['etudiants']} étudiants)")
+    print('='*70)
+
+    print(f"  {'Test':<40} {'Réussis':>9} {'Taux':>7}")
+    for test in sorted(statistiques["tests"], key=lambda t: (t["taux"] is None, t["taux"])):
+        taux = "-" if test["taux"] is None else f"{test['taux']:.1f}%"
+        print(f"  {test['test']:<40} {test['reussis']:>4}/{test['executes']:<4} {taux:>7}")
+
+    print(f"\n  {'Indicateur':<12} {'Moy.':>6} {'É.-t.':>6} {'Min':>6} {'Q1':>6} {'Méd.':>6} "
+          f"{'Q3':>6} {'Max':>6}   Niveaux " + "/".join(str(n) for n in NIVEAUX))
+    for indicateur, d in statistiques["indicateurs"].items():
+        niveaux = "/".join(str(n) for n in d["niveaux"].values())
+        print(f"  {indicateur:<12} {d['moyenne']:>6.1f} {d['ecart_type']:>6.1f} {d['min']:>6.1f} "
+              f"{d['q1']:>6.1f} {d['mediane']:>6.1f} {d['q3']:>6.1f} {d['max']:>6.1f}   {niveaux}")
+
+    if statistiques["correlations"]:
+        print(f"\n  Tests corrélés (|r| ≥ {CORRELATION_MIN}):")
+        for paire in statistiques["correlations"][:nb_correlations]:
+            print(f"  {paire['correlation']:>+6.2f}  {paire['tests'][0]} ↔ {paire['tests'][1]}")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Surveillance des dépôts d'un dossier batch (mode --watch de correction.py)
+
+Les dossiers des dépôts sont surveillés avec inotify (Linux, par ctypes,
+sans dépendance): chaque écriture, création, suppression ou renommage
+signale son dépôt. Une rafale d'événements (git pull, copie d'un dossier)
+n'est rapportée qu'une fois le calme revenu, pour que chaque dépôt ne soit
+recorrigé qu'une fois par rafale.
+
+Sans inotify (autre système), les dossiers sont sondés périodiquement.
+
+Usage:
+    python3 correction.py . --batch ../etudiants --watch
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from pathlib import Path
+
+# Secondes sans événement avant de rapporter une rafale, et attente
+# maximale d'une rafale qui ne s'arrête pas
+DELAI_CALME = 2.0
+DELAI_CALME_MAX = 15.0
+
+# Intervalle de sondage sans inotify, en secondes
+DELAI_SONDAGE = 1.0
+
+# Dossiers non surveillés: internes de git (objets, journaux) et caches.
+# Les références d'un dépôt nu (refs/, packed-refs) restent surveillées.
+DOSSIERS_IGNORES = {".git", "objects", "logs", "__pycache__", ".pytest_cache"}
+
+# Constantes de <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+EVENEMENTS = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+_ENTETE = struct.Struct("iIII")
+
+
+class Inotify:
+    """
+    Interface minimale d'inotify par ctypes.
+
+    Raises:
+        OSError: inotify indisponible (autre système que Linux)
+    """
+
+    def __init__(self):
+        nom = ctypes.util.find_library("c")
+        try:
+            self._libc = ctypes.CDLL(nom, use_errno=True)
+            self._libc.inotify_init1
+        except (OSError, AttributeError, TypeError) as e:
+            raise OSError(f"inotify indisponible: {e}") from e
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            erreur = ctypes.get_errno()
+            raise OSError(erreur, os.strerror(erreur))
+
+    def ajouter(self, chemin, masque=EVENEMENTS):
+        """
+        Surveille un dossier.
+
+        Args:
+            chemin: Dossier surveillé
+            masque: Événements rapportés
+
+        Returns:
+            int: Descripteur de surveillance
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(chemin), masque | IN_ONLYDIR)
+        if wd < 0:
+            erreur = ctypes.get_errno()
+            raise OSError(erreur, os.strerror(erreur), str(chemin))
+        return wd
+
+    def lire(self, delai=None):
+        """
+        Lit les événements disponibles.
+
+        Args:
+            delai: Attente maximale du premier événement, en secondes
+                (None = sans limite)
+
+        Returns:
+            list: (descripteur, masque, nom) de chaque événement
+        """
+        pret, _, _ = select.select([self.fd], [], [], delai)
+        evenements = []
+        while pret:
+            try:
+                donnees = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            position = 0
+            while position < len(donnees):
+                wd, masque, _, longueur = _ENTETE.unpack_from(donnees, position)
+                position += _ENTETE.size
+                nom = donnees[position:position + longueur].rstrip(b"\0")
+                position += longueur
+                evenements.append((wd, masque, os.fsdecode(nom)))
+        return evenements
+
+    def fermer(self):
+        """Ferme le descripteur inotify (retire toutes les surveillances)."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class SurveillanceLot:
+    """
+    Surveille les dépôts d'un dossier batch.
+
+    Args:
+        batch_path: Dossier contenant les dépôts
+        calme: Secondes sans événement avant de rapporter une rafale
+        calme_max: Attente maximale d'une rafale continue, en secondes
+    """
+
+    def __init__(self, batch_path, calme=DELAI_CALME, calme_max=DELAI_CALME_MAX):
+        self.batch_path = Path(batch_path)
+        self.calme = calme
+        self.calme_max = calme_max
+        # Descripteur → (dossier, dépôt); dépôt None pour le dossier batch
+        self.dossiers = {}
+        try:
+            self.inotify = Inotify()
+        except OSError:
+            self.inotify = None
+
+        if self.inotify is not None:
+            self.mode = "inotify"
+            wd = self.inotify.ajouter(self.batch_path, IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE)
+            self.dossiers[wd] = (self.batch_path, None)
+            for repo_dir in self._depots():
+                self._surveiller(repo_dir, repo_dir.name)
+        else:
+            self.mode = "sondage"
+            self.etats = self._sonder()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def fermer(self):
+        """Arrête la surveillance."""
+        if self.inotify is not None:
+            self.inotify.fermer()
+
+    def _depots(self):
+        return [chemin for chemin in self.batch_path.iterdir()
+                if chemin.is_dir() and not chemin.name.startswith('.')]
+
+    def _parcourir(self, dossier):
+        for racine, sous_dossiers, fichiers in os.walk(dossier):
+            sous_dossiers[:] = [d for d in sous_dossiers if d not in DOSSIERS_IGNORES]
+            yield racine, fichiers
+
+    def _surveiller(self, dossier, depot):
+        # Surveille un dossier et ses sous-dossiers (inotify n'est pas récursif)
+        for racine, _ in self._parcourir(dossier):
+            try:
+                self.dossiers[self.inotify.ajouter(racine)] = (racine, depot)
+            except OSError as e:
+                # Dossier disparu entre-temps: son dépôt est signalé de toute façon
+                if e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                    raise
+
+    def _evenements(self, delai):
+        # Dépôts signalés par les événements reçus dans le délai
+        depots = set()
+        for wd, masque, nom in self.inotify.lire(delai):
+            if masque & IN_Q_OVERFLOW:
+                # Événements perdus: tout dépôt a pu changer
+                depots.update(repo_dir.name for repo_dir in self._depots())
+                continue
+            if masque & IN_IGNORED:
+                self.dossiers.pop(wd, None)
+                continue
+            if wd not in self.dossiers:
+                continue
+            dossier, depot = self.dossiers[wd]
+            if depot is None:
+                # Dossier batch: dépôt ajouté, renommé ou supprimé
+                if not nom or nom.startswith('.'):
+                    continue
+                depot = nom
+                if masque & (IN_CREATE | IN_MOVED_TO) and masque & IN_ISDIR:
+                    self._surveiller(self.batch_path / nom, nom)
+            elif masque & IN_ISDIR and masque & (IN_CREATE | IN_MOVED_TO) and nom not in DOSSIERS_IGNORES:
+                # Nouveau sous-dossier (ex.: tests/ créé par un pull)
+                self._surveiller(os.path.join(dossier, nom), depot)
+            depots.add(depot)
+        return depots
+
+    def _sonder(self):
+        # État de chaque dépôt: nombre de fichiers et date de modification la plus récente
+        etats = {}
+        for repo_dir in self._depots():
+            nb_fichiers = 0
+            recent = 0
+            for racine, fichiers in self._parcourir(repo_dir):
+                for chemin in [racine] + [os.path.join(racine, f) for f in fichiers]:
+                    try:
+                        recent = max(recent, os.stat(chemin).st_mtime_ns)
+                    except OSError:
+                        continue
+                    nb_fichiers += 1
+            etats[repo_dir.name] = (nb_fichiers, recent)
+        return etats
+
+    def _sondage(self, delai):
+        # Dépôts dont l'état a changé depuis le dernier sondage
+        while True:
+            time.sleep(DELAI_SONDAGE if delai is None else min(delai, DELAI_SONDAGE))
+            etats = self._sonder()
+            depots = {nom for nom in etats.keys() | self.etats.keys()
+                      if etats.get(nom) != self.etats.get(nom)}
+            self.etats = etats
+            if depots or delai is not None:
+                return depots
+
+    def attendre(self):
+        """
+        Attend des modifications, puis le calme de leur rafale.
+
+        Returns:
+            set: Chemins des dépôts modifiés, ajoutés ou supprimés
+        """
+        lire = self._evenements if self.inotify is not None else self._sondage
+        depots = set()
+        debut = None
+        while True:
+            delai = None
+            if depots:
+                delai = min(self.calme, debut + self.calme_max - time.monotonic())
+                if delai <= 0:
+                    break
+            nouveaux = lire(delai)
+            if nouveaux:
+                if not depots:
+                    debut = time.monotonic()
+                depots |= nouveaux
+            elif depots:
+                break
+        return {self.batch_path / nom for nom in depots}
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the milestone tests.
+
+The student's files are read and analyzed once per pytest session; every
+milestone test queries the same fact index.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from grading_engine import RepoFacts
+
+
+# ---------------------------------------------------------------------------
+# Helper: Get repository root
+# ---------------------------------------------------------------------------
+def get_repo_root():
+    """Find the repository root by looking for .github folder."""
+    current = Path(__file__).parent.parent
+    if (current / ".github").exists():
+        return current
+    # Fallback to parent
+    return current
+
+
+REPO_ROOT = get_repo_root()
+
+
+@pytest.fixture(scope="session")
+def repo_facts():
+    """Fact index of the student's repository, built once per session."""
+    return RepoFacts(REPO_ROOT)
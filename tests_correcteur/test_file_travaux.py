@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared work queue (file_travaux.py)
+===================================
+
+These tests check the lease handling of the SQLite work queue with several
+workers on the same database: a job whose lease expires is taken again by
+another worker, a result from an expired lease is rejected, and a job is
+abandoned once its last attempt expires. For the lease tests, the queue's
+clock is replaced by a counter, so that leases expire without waiting.
+
+The last test runs real worker processes (correction.py --travailleur) on
+one queue and checks that every job is graded exactly once.
+
+These are tests of the grader itself: they live outside tests/, which
+student repositories copy and correction.py runs on every repository.
+"""
+
+import re
+import sys
+import types
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import correction
+import file_travaux
+from file_travaux import ABANDONNE, TENTATIVES_MAX, TERMINE, FileTravaux
+
+CORRECTION = Path(__file__).resolve().parent.parent / "correction.py"
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    """Clock of the queue, advanced by hand (seconds)."""
+    maintenant = [1000.0]
+    monkeypatch.setattr(file_travaux, "time", types.SimpleNamespace(time=lambda: maintenant[0]))
+    return maintenant
+
+
+@pytest.fixture
+def file_publiee(tmp_path):
+    """Queue database holding a single published job, and its repository."""
+    base = tmp_path / "file.db"
+    depot = tmp_path / "alice"
+    depot.mkdir()
+    with FileTravaux(base) as file:
+        file.publier([(0, depot)], {"moteur": "statique"})
+    return base, depot
+
+
+# ---------------------------------------------------------------------------
+# Test: An expired lease is taken again by another worker
+# ---------------------------------------------------------------------------
+def test_expired_lease_is_taken_again(horloge, file_publiee):
+    """
+    A job stays with its worker during the lease, then goes to the next
+    worker once the lease has expired; only the current holder's result
+    is kept.
+    """
+    base, depot = file_publiee
+    premier, second = FileTravaux(base), FileTravaux(base)
+    try:
+        travail, chemin = premier.prendre("premier", duree_bail=10)
+        assert chemin.resolve() == depot.resolve()
+        assert second.prendre("second", duree_bail=10) is None
+
+        horloge[0] += 11
+        assert second.prendre("second", duree_bail=10) == (travail, chemin)
+
+        # The first worker's lease has expired: its late result is rejected
+        assert not premier.terminer(travail, "premier", {"etudiant": "alice"})
+        assert second.terminer(travail, "second", {"etudiant": "alice"})
+        assert second.etat() == {TERMINE: 1}
+        assert second.restants() == 0
+        [(_, position, _, resultat, _)] = second.finis()
+        assert (position, resultat) == (0, {"etudiant": "alice"})
+    finally:
+        premier.fermer()
+        second.fermer()
+
+
+# ---------------------------------------------------------------------------
+# Test: A job is abandoned after its last attempt expires
+# ---------------------------------------------------------------------------
+def test_job_abandoned_after_max_attempts(horloge, file_publiee):
+    """
+    Each worker takes the job in turn and lets its lease expire; after
+    TENTATIVES_MAX attempts the job is abandoned instead of leased again.
+    """
+    base, _ = file_publiee
+    travailleurs = [FileTravaux(base) for _ in range(TENTATIVES_MAX + 1)]
+    try:
+        for rang, file in enumerate(travailleurs[:TENTATIVES_MAX], start=1):
+            assert file.prendre(f"travailleur-{rang}", duree_bail=10) is not None
+            horloge[0] += 11
+
+        dernier = travailleurs[TENTATIVES_MAX]
+        assert dernier.prendre("travailleur-final", duree_bail=10) is None
+        assert dernier.etat() == {ABANDONNE: 1}
+        assert dernier.restants() == 0
+        [(_, _, _, resultat, erreur)] = dernier.finis()
+        assert resultat is None
+        assert f"{TENTATIVES_MAX} tentative(s)" in erreur
+
+        # The last worker's result arrives too late to be kept
+        assert not travailleurs[-2].terminer(1, f"travailleur-{TENTATIVES_MAX}", {"etudiant": "alice"})
+    finally:
+        for file in travailleurs:
+            file.fermer()
+
+
+# ---------------------------------------------------------------------------
+# Test: The coordinator finishes a batch that no worker takes
+# ---------------------------------------------------------------------------
+def test_coordinator_abandons_without_workers(horloge, file_publiee):
+    """
+    An expired last lease is abandoned by FileTravaux.expirer() without any
+    worker; with no local worker and no lease in progress, distribuer_lot
+    abandons the remaining jobs and reports them with the published engine.
+    """
+    base, depot = file_publiee
+    with FileTravaux(base) as file:
+        for rang in range(TENTATIVES_MAX):
+            assert file.prendre(f"travailleur-{rang}", duree_bail=10) is not None
+            horloge[0] += 11
+        file.expirer()
+        assert file.etat() == {ABANDONNE: 1}
+
+    [(position, resultat)] = list(correction.distribuer_lot(
+        base, [(0, depot)], 0, None, moteur="statique", attente=0.01, attente_max=0))
+    assert position == 0
+    assert resultat["moteur"] == "statique"
+    assert "Aucun travailleur actif" in resultat["resultats"]["erreur"]
+    assert f"Traitement de: {depot.name}" in resultat["sortie"]
+
+
+# ---------------------------------------------------------------------------
+# Test: Several worker processes share one queue
+# ---------------------------------------------------------------------------
+def test_worker_processes_finish_each_job_once(tmp_path):
+    """
+    Two worker processes drain the same queue; every job ends up finished
+    exactly once, and the workers' counts add up to the number of jobs.
+    """
+    base = tmp_path / "file.db"
+    depots = []
+    for rang in range(8):
+        depot = tmp_path / f"etudiant-{rang}"
+        depot.mkdir()
+        depots.append((rang, depot))
+    with FileTravaux(base) as file:
+        file.publier(depots, {"moteur": "statique"})
+
+    commande = [sys.executable, str(CORRECTION), ".", "--travailleur", str(base), "--no-cache"]
+    travailleurs = [
+        subprocess.Popen(commande, cwd=tmp_path, stdout=subprocess.PIPE,
+                         stderr=subprocess.DEVNULL, text=True)
+        for _ in range(2)
+    ]
+    corriges = 0
+    for travailleur in travailleurs:
+        sortie, _ = travailleur.communicate(timeout=120)
+        assert travailleur.returncode == 0
+        corriges += int(re.search(r"(\d+) dépôt\(s\) corrigé\(s\)", sortie).group(1))
+
+    with FileTravaux(base) as file:
+        assert file.etat() == {TERMINE: len(depots)}
+        finis = file.finis()
+    assert sorted(position for _, position, _, _, _ in finis) == [rang for rang, _ in depots]
+    assert all(resultat["etudiant"] == chemin.name for _, _, chemin, resultat, _ in finis)
+    assert corriges == len(depots)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Fact index of the static grading engine (grading_engine.py)
+===========================================================
+
+The milestone checks query the facts of one AST walk of each script:
+names that only appear in comments or strings do not count, and a
+script with a syntax error is indexed from its source text instead.
+"""
+
+from grading_engine import ScriptFacts
+
+SCRIPT = '''# /// script
+# dependencies = ["adafruit-circuitpython-bmp280"]
+# ///
+"""Read the BMP280."""
+import board
+import adafruit_bmp280
+from adafruit_seesaw.seesaw import Seesaw
+
+
+def main():
+    try:
+        sensor = adafruit_bmp280.Adafruit_BMP280_I2C(board.I2C())
+        print(sensor.temperature, sensor.pressure)
+    except OSError:
+        print("busio.I2C? sensor.altitude?")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+# ---------------------------------------------------------------------------
+# Test: Facts come from the AST of a valid script
+# ---------------------------------------------------------------------------
+def test_facts_from_ast(tmp_path):
+    """Imports, calls, attributes and structure are indexed from the AST."""
+    facts = ScriptFacts(tmp_path / "test_bmp280.py", SCRIPT)
+
+    assert facts.syntax_error is None
+    assert {"board", "adafruit_bmp280", "adafruit_seesaw"} <= facts.imports
+    assert {"board.I2C", "adafruit_bmp280.Adafruit_BMP280_I2C"} <= facts.calls
+    assert facts.mentions("temperature") and facts.mentions("pressure")
+    assert facts.functions == {"main"}
+    assert facts.has_main_guard
+    assert (facts.try_blocks, facts.except_handlers) == (1, 1)
+    assert facts.module_docstring == "Read the BMP280."
+    assert facts.script_metadata == {"dependencies": ["adafruit-circuitpython-bmp280"]}
+
+    # Only mentioned in a string
+    assert "busio.I2C" not in facts.calls
+    assert "altitude" not in facts.attributes
+
+
+# ---------------------------------------------------------------------------
+# Test: A script with a syntax error is indexed from its text
+# ---------------------------------------------------------------------------
+def test_facts_approximated_without_ast(tmp_path):
+    """The facts of an unparsable script are approximated from substrings."""
+    facts = ScriptFacts(tmp_path / "test_bmp280.py", SCRIPT + "def broken(:\n")
+
+    assert facts.syntax_error is not None
+    assert {"board", "adafruit_bmp280"} <= facts.imports
+    assert "board.I2C" in facts.calls
+    assert facts.has_main_guard
+    assert facts.except_handlers